@@ -0,0 +1,174 @@
+"""Data and resource caching for the Streamlit app.
+
+Streamlit reruns the whole script on every interaction. This module keeps
+the expensive parts out of the rerun:
+
+- ``get_app_connection`` opens one SQLite connection per server process
+  (``st.cache_resource``) and runs ``initialize_schema`` only then.
+- The ``load_*`` functions cache query results per argument set
+  (``st.cache_data``) for ``APP_CACHE_TTL_SECONDS``.
+- Every cached loader also takes the current ``data_version()``, which
+  comes from ``PRAGMA data_version`` on the shared connection. SQLite
+  changes that value whenever another connection commits, so a pipeline
+  run (prices, features, predictions...) in another process invalidates
+  every cached result on the next rerun.
+- Commits on the connection itself do not change its ``data_version``, so
+  the app writes (stored backtests, jobs) through a second connection,
+  ``get_app_write_connection``; its commits invalidate the caches like
+  any other writer's.
+
+The shared connections are used from Streamlit's script threads, so all
+access goes through ``_LOCK``.
+
+``get_job_pool`` keeps the background job worker (``src.app.job_runner``)
+alive for the lifetime of the server; ``read_job`` is deliberately not
+cached because the app polls it.
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+import streamlit as st
+
+from src.app.job_runner import fail_interrupted_jobs, get_job, start_job_pool, submit_job
+from src.config import APP_CACHE_TTL_SECONDS
+from src.database.db_utils import get_connection, initialize_schema
+from src.models.backtest_cache import cached_backtest_model, missing_summaries, query_backtest_summaries
+from src.models.matrix_backtest import run_matrix_backtest
+from src.models.rolling_metrics import query_rolling_metrics
+
+_LOCK = threading.Lock()
+
+
+@st.cache_resource
+def get_app_connection():
+    """Shared connection for the app, with the schema initialized once."""
+    conn = get_connection(check_same_thread=False)
+    initialize_schema(conn)
+    return conn
+
+
+@st.cache_resource
+def get_app_write_connection():
+    """Connection for the app's own writes, kept apart so ``data_version`` sees them."""
+    get_app_connection()
+    return get_connection(check_same_thread=False)
+
+
+def data_version() -> int:
+    """Counter that changes whenever another connection commits to the database."""
+    with _LOCK:
+        return get_app_connection().execute("PRAGMA data_version").fetchone()[0]
+
+
+@st.cache_resource
+def get_job_pool():
+    """Persistent job worker; jobs left over by a previous server are marked failed."""
+    with _LOCK:
+        fail_interrupted_jobs(get_app_write_connection())
+    return start_job_pool()
+
+
+def start_job(stages: Optional[List[str]] = None) -> int:
+    """Queue a pipeline job on the shared worker and return its id."""
+    pool = get_job_pool()
+    with _LOCK:
+        return submit_job(pool, stages, conn=get_app_write_connection())
+
+
+def read_job(job_id: Optional[int] = None) -> Optional[Dict]:
+    """Current state of a job (default: the most recent one)."""
+    with _LOCK:
+        return get_job(get_app_connection(), job_id)
+
+
+def _read_sql(query: str, params: Optional[list] = None) -> pd.DataFrame:
+    with _LOCK:
+        return pd.read_sql_query(query, get_app_connection(), params=params or [])
+
+
+@st.cache_data(ttl=APP_CACHE_TTL_SECONDS, show_spinner=False)
+def load_tickers(version: int) -> list:
+    """All tickers in the symbol catalog."""
+    return _read_sql("SELECT ticker FROM symbols ORDER BY ticker")["ticker"].tolist()
+
+
+@st.cache_data(ttl=APP_CACHE_TTL_SECONDS, show_spinner=False)
+def load_prediction_coverage(version: int) -> pd.DataFrame:
+    """Row count and date bounds of the predictions of every (ticker, model)."""
+    return _read_sql("""
+        SELECT s.ticker, c.model_name, c.n_rows, c.min_date, c.max_date
+        FROM prediction_coverage c
+        JOIN symbols s ON c.symbol_id = s.id
+        WHERE c.n_rows > 0
+        ORDER BY s.ticker, c.model_name
+    """)
+
+
+@st.cache_data(ttl=APP_CACHE_TTL_SECONDS, show_spinner=False)
+def load_price_coverage(version: int) -> pd.DataFrame:
+    """Row count and date bounds of the prices of every ticker."""
+    return _read_sql("""
+        SELECT s.ticker, c.n_rows, c.min_date, c.max_date
+        FROM price_coverage c
+        JOIN symbols s ON c.symbol_id = s.id
+        ORDER BY s.ticker
+    """)
+
+
+@st.cache_data(ttl=APP_CACHE_TTL_SECONDS, show_spinner=False)
+def load_prices(ticker: str, start_date: str, end_date: str, version: int) -> pd.DataFrame:
+    """Adjusted close prices of ``ticker`` in the date range."""
+    df = _read_sql("""
+        SELECT date, adjusted_close FROM prices p
+        JOIN symbols s ON p.symbol_id = s.id
+        WHERE s.ticker = ? AND date >= ? AND date <= ?
+        ORDER BY date
+    """, [ticker, start_date, end_date])
+    df["date"] = pd.to_datetime(df["date"])
+    return df
+
+
+@st.cache_data(ttl=APP_CACHE_TTL_SECONDS, show_spinner=False)
+def load_backtest(ticker: str, model_name: str, start_date: str, end_date: str, version: int) -> Dict:
+    """Single-pair backtest, served from the ``backtests`` table when possible (else computed and stored)."""
+    with _LOCK:
+        return cached_backtest_model(ticker, model_name, start_date, end_date, conn=get_app_write_connection())
+
+
+@st.cache_data(ttl=APP_CACHE_TTL_SECONDS, show_spinner=False)
+def load_model_comparison(ticker: str, start_date: str, end_date: str, version: int) -> pd.DataFrame:
+    """Matrix backtest of every model of ``ticker``."""
+    with _LOCK:
+        return run_matrix_backtest([ticker], start_date=start_date, end_date=end_date, conn=get_app_connection())
+
+
+@st.cache_data(ttl=APP_CACHE_TTL_SECONDS, show_spinner=False)
+def load_rolling_metrics(ticker: str, model_name: str, start_date: str, end_date: str, version: int) -> pd.DataFrame:
+    """Stored rolling metrics of one strategy."""
+    with _LOCK:
+        return query_rolling_metrics(ticker, model_name, start_date, end_date, conn=get_app_connection())
+
+
+@st.cache_data(ttl=APP_CACHE_TTL_SECONDS, show_spinner=False)
+def load_summary_page(
+    search: str,
+    model_names: tuple,
+    sort_by: str,
+    descending: bool,
+    page_size: int,
+    page: int,
+    version: int
+) -> Tuple[int, pd.DataFrame]:
+    """Total count and one page (1-based) of stored full-range backtest summaries."""
+    with _LOCK:
+        return query_backtest_summaries(get_app_connection(), search or None, list(model_names) or None,
+                                        sort_by, descending, page_size, (page - 1) * page_size)
+
+
+@st.cache_data(ttl=APP_CACHE_TTL_SECONDS, show_spinner=False)
+def load_missing_summary_count(version: int) -> int:
+    """Number of pairs with predictions but no stored full-range backtest."""
+    with _LOCK:
+        return len(missing_summaries(get_app_connection()))
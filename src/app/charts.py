@@ -0,0 +1,113 @@
+"""Vega-Lite charts for the app's client-side charting mode.
+
+With ``APP_CHART_MODE = "client"`` the app does not render matplotlib
+figures on the server. It sends each series, downsampled to
+``APP_CHART_POINTS`` with LTTB and stored as float32, to the browser
+together with a Vega-Lite spec for ``st.vega_lite_chart``. The browser
+draws the chart, and zooming (mouse wheel) and panning (drag) on the x axis
+happen there without a Streamlit rerun.
+
+Charts use the pixel theme: ``PIXEL_COLORS`` for series, background, grid
+and text, square point markers and step lines. Every function returns the
+``(data, spec)`` pair to pass to ``st.vega_lite_chart``.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.visualization.downsampling import APP_CHART_POINTS, downsample
+from src.visualization.style_pixel_theme import PIXEL_COLORS
+
+CHART_HEIGHT = 360
+FONT = "JetBrains Mono, Space Mono, monospace"
+
+
+def long_frame(dates, series: Dict[str, np.ndarray], n_out: int = APP_CHART_POINTS) -> pd.DataFrame:
+    """
+    Downsample each series and stack them into ``date``, ``series``, ``value`` rows.
+
+    Series are downsampled independently, so each keeps its own extremes.
+    """
+    dates = pd.to_datetime(np.asarray(dates)).to_numpy()
+    frames = []
+    for name, values in series.items():
+        x, y = downsample(dates, np.asarray(values, dtype=float), n_out, threshold=n_out)
+        frames.append(pd.DataFrame({"date": x, "series": name, "value": y.astype(np.float32)}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def line_chart_spec(title: str, y_title: str, names: List[str], colors: List[str]) -> Dict:
+    """Pixel-styled step-line spec over a ``long_frame``, with x-axis zoom and pan."""
+    return {
+        "height": CHART_HEIGHT,
+        "title": title,
+        "background": PIXEL_COLORS["background"],
+        "params": [{"name": "zoom", "select": {"type": "interval", "encodings": ["x"]}, "bind": "scales"}],
+        "mark": {
+            "type": "line",
+            "interpolate": "step",
+            "strokeWidth": 2,
+            "point": {"shape": "square", "size": 12, "filled": True},
+        },
+        "encoding": {
+            "x": {"field": "date", "type": "temporal", "title": "date"},
+            "y": {"field": "value", "type": "quantitative", "title": y_title, "scale": {"zero": False}},
+            "color": {
+                "field": "series",
+                "type": "nominal",
+                "title": None,
+                "scale": {"domain": names, "range": colors},
+                "legend": {"orient": "top-left"},
+            },
+            "tooltip": [
+                {"field": "date", "type": "temporal"},
+                {"field": "series", "type": "nominal"},
+                {"field": "value", "type": "quantitative", "format": ",.4~f"},
+            ],
+        },
+        "config": {
+            "view": {"stroke": PIXEL_COLORS["grid"], "strokeWidth": 2},
+            "axis": {
+                "gridColor": PIXEL_COLORS["grid"],
+                "domainColor": PIXEL_COLORS["grid"],
+                "tickColor": PIXEL_COLORS["grid"],
+                "labelColor": PIXEL_COLORS["text"],
+                "titleColor": PIXEL_COLORS["text"],
+                "labelFont": FONT,
+                "titleFont": FONT,
+            },
+            "legend": {"labelColor": PIXEL_COLORS["text"], "labelFont": FONT},
+            "title": {"color": PIXEL_COLORS["text"], "font": FONT, "fontWeight": "normal"},
+        },
+    }
+
+
+def price_chart(dates, prices, ticker: str) -> Tuple[pd.DataFrame, Dict]:
+    """Adjusted close of one ticker."""
+    data = long_frame(dates, {"price": prices})
+    return data, line_chart_spec(ticker, "price", ["price"], [PIXEL_COLORS["price"]])
+
+
+def performance_chart(dates, portfolio_value, buy_hold_value) -> Tuple[pd.DataFrame, Dict]:
+    """Strategy value against buy-and-hold, colored like ``plot_backtest_performance``."""
+    names = ["strategy", "buy & hold"]
+    data = long_frame(dates, dict(zip(names, [portfolio_value, buy_hold_value])))
+    return data, line_chart_spec("cumulative returns", "portfolio value", names,
+                                 [PIXEL_COLORS["up"], PIXEL_COLORS["price"]])
+
+
+def rolling_chart(rolling: pd.DataFrame, metric: str = "rolling_sharpe") -> Tuple[pd.DataFrame, Dict]:
+    """One line of ``metric`` per window length of a ``query_rolling_metrics`` frame."""
+    windows = sorted(rolling["window_days"].unique())
+    names = [f"{window}d" for window in windows]
+    series = {
+        name: rolling.loc[rolling["window_days"] == window].sort_values("date")
+        for name, window in zip(names, windows)
+    }
+    frames = [long_frame(group["date"], {name: group[metric]}) for name, group in series.items()]
+    palette = [PIXEL_COLORS["up"], PIXEL_COLORS["price"], PIXEL_COLORS["flat"], PIXEL_COLORS["down"]]
+    colors = [palette[i % len(palette)] for i in range(len(names))]
+    return pd.concat(frames, ignore_index=True), line_chart_spec(metric.replace("_", " "), metric.split("_")[-1],
+                                                                 names, colors)
@@ -0,0 +1,356 @@
+"""Background pipeline jobs for the Streamlit app.
+
+The app used to run the pipeline scripts with blocking ``subprocess.run``
+calls, so every step cold-started Python (and TensorFlow) and the page only
+updated between steps. Jobs now run in a single-worker process pool that
+lives as long as the app server:
+
+- ``start_job_pool`` starts the worker and imports the heavy modules in it
+  right away, so the first job does not pay for them and later jobs reuse
+  them.
+- ``submit_job`` records a job in the ``jobs`` table and queues it.
+- ``run_job`` (in the worker) runs the requested ``PIPELINE_STAGES`` in
+  order against the job's database. Each stage reports rows processed,
+  epochs and its own progress through a ``JobReporter``, which writes them
+  to the job's row.
+- The app only reads the row (``get_job``), so polling never blocks on the
+  job.
+"""
+
+import json
+import logging
+import multiprocessing
+import sqlite3
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.config import DB_PATH, DEFAULT_TICKERS, LSTM_EPOCHS, TEST_END_DATE, TEST_START_DATE, TRAIN_END_DATE
+from src.database.db_utils import get_connection, initialize_schema
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("queued", "running")
+REPORT_INTERVAL_SECONDS = 0.5
+WARM_IMPORTS = [
+    "src.data_acquisition.sample_data",
+    "src.models.train_baseline_models",
+    "src.models.generate_predictions",
+    "src.models.train_lstm",
+]
+
+
+class JobReporter:
+    """Writes a running job's progress to its ``jobs`` row.
+
+    Updates within a stage are merged and written at most once per
+    ``REPORT_INTERVAL_SECONDS``; stage boundaries and ``close`` write
+    immediately.
+    """
+
+    def __init__(self, job_id: int, n_stages: int, db_path: Path = DB_PATH):
+        self.job_id = job_id
+        self.n_stages = n_stages
+        self.conn = get_connection(db_path)
+        self.stage_index = 0
+        self.rows = 0
+        self._last_write = 0.0
+        self._pending = {}
+
+    def start_stage(self, index: int, name: str) -> None:
+        self.stage_index = index
+        self._write(force=True, stage=name, stage_index=index, epoch=None,
+                    progress=index / self.n_stages, message=None)
+
+    def update(
+        self,
+        progress: Optional[float] = None,
+        rows: Optional[int] = None,
+        epoch: Optional[int] = None,
+        message: Optional[str] = None
+    ) -> None:
+        """
+        Report progress of the current stage.
+
+        Args:
+            progress: Fraction of the current stage done (0 to 1)
+            rows: Rows processed so far in the current stage
+            epoch: Training epoch just finished
+            message: Short status text
+        """
+        fields = {}
+        if progress is not None:
+            fields["progress"] = (self.stage_index + min(max(progress, 0.0), 1.0)) / self.n_stages
+        if rows is not None:
+            fields["rows_processed"] = self.rows + rows
+        if epoch is not None:
+            fields["epoch"] = epoch
+        if message is not None:
+            fields["message"] = message
+        self._write(**fields)
+
+    def finish_stage(self, rows: int = 0) -> None:
+        self.rows += rows
+        self._write(force=True, progress=(self.stage_index + 1) / self.n_stages, rows_processed=self.rows)
+
+    def _write(self, force: bool = False, **fields) -> None:
+        self._pending.update(fields)
+        if force or time.monotonic() - self._last_write >= REPORT_INTERVAL_SECONDS:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the updates held back by the throttle."""
+        if not self._pending:
+            return
+        assignments = ", ".join(f"{column} = ?" for column in self._pending)
+        self.conn.execute(
+            f"UPDATE jobs SET {assignments}, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+            list(self._pending.values()) + [self.job_id]
+        )
+        self.conn.commit()
+        self._pending = {}
+        self._last_write = time.monotonic()
+
+    def close(self) -> None:
+        self.flush()
+        self.conn.close()
+
+
+def sample_data_stage(reporter: JobReporter, db_path: Path = DB_PATH) -> int:
+    """Create the sample prices, features and targets."""
+    from src.data_acquisition.sample_data import create_sample_data
+
+    return create_sample_data(
+        progress=lambda rows: reporter.update(rows=rows, message=f"{rows} price rows"), db_path=db_path
+    )
+
+
+def train_baseline_stage(reporter: JobReporter, db_path: Path = DB_PATH) -> int:
+    """Train the baseline models on one tabular dataset."""
+    from src.models.build_datasets import build_tabular_dataset
+    from src.models.train_baseline_models import (
+        train_hist_gradient_boosting, train_logistic_regression, train_random_forest
+    )
+
+    X_train, y_train, X_test, y_test = build_tabular_dataset(train_split_date=TRAIN_END_DATE, db_path=db_path)
+    trainers = [
+        ("logistic_regression", train_logistic_regression),
+        ("random_forest", train_random_forest),
+        ("hist_gradient_boosting", train_hist_gradient_boosting),
+    ]
+    for i, (name, train) in enumerate(trainers):
+        reporter.update(progress=i / len(trainers), rows=len(X_train), message=f"training {name}")
+        train(X_train, y_train, X_test, y_test)
+    return len(X_train)
+
+
+def train_lstm_stage(reporter: JobReporter, db_path: Path = DB_PATH) -> int:
+    """Train the LSTM (which also writes its inference artifacts), reporting every epoch."""
+    from tensorflow import keras
+
+    from src.models.sequence_dataset import build_sequence_dataset
+    from src.models.train_lstm import train_lstm
+
+    class EpochProgress(keras.callbacks.Callback):
+        def on_epoch_end(self, epoch, logs=None):
+            val_loss = (logs or {}).get("val_loss", float("nan"))
+            reporter.update(progress=(epoch + 1) / LSTM_EPOCHS, epoch=epoch + 1,
+                            message=f"epoch {epoch + 1}/{LSTM_EPOCHS}, val_loss {val_loss:.4f}")
+
+    X_train, y_train, X_test, y_test = build_sequence_dataset(train_split_date=TRAIN_END_DATE, db_path=db_path)
+    reporter.update(rows=len(X_train), message="training LSTM")
+    train_lstm(X_train, y_train, X_test, y_test, callbacks=[EpochProgress()])
+    return len(X_train)
+
+
+def generate_predictions_stage(reporter: JobReporter, db_path: Path = DB_PATH) -> int:
+    """Score the test period of every sample ticker with every model."""
+    from src.models.backends import load_model
+    from src.models.generate_predictions import generate_baseline_predictions, generate_lstm_predictions
+
+    conn = get_connection(db_path)
+    initialize_schema(conn)
+    conn.close()
+
+    # The incremental model is scored like the baselines once train_incremental has saved it.
+    baseline_names = ["logistic_regression", "random_forest", "hist_gradient_boosting", "sgd_logistic_regression"]
+    models = {name: load_model(name, backend="sklearn") for name in baseline_names}
+    lstm = load_model("lstm_model")
+
+    tickers = DEFAULT_TICKERS[:3]
+    rows = 0
+    for i, ticker in enumerate(tickers):
+        for name in baseline_names:
+            if models[name] is not None:
+                rows += generate_baseline_predictions(ticker, name, TEST_START_DATE, TEST_END_DATE,
+                                                      model=models[name], db_path=db_path)
+        rows += generate_lstm_predictions(ticker, TEST_START_DATE, TEST_END_DATE, model=lstm, db_path=db_path)
+        reporter.update(progress=(i + 1) / len(tickers), rows=rows, message=f"scored {ticker}")
+    return rows
+
+
+def backtest_summaries_stage(reporter: JobReporter, db_path: Path = DB_PATH) -> int:
+    """Store the full-range backtests that the dashboard lists."""
+    from src.models.backtest_cache import fill_backtest_cache
+
+    conn = get_connection(db_path)
+    try:
+        return fill_backtest_cache(conn=conn, progress=lambda done, total: reporter.update(
+            progress=done / total, rows=done, message=f"{done}/{total} pairs"
+        ))
+    finally:
+        conn.close()
+
+
+# name -> (label shown in the app, stage function of (reporter, db_path) returning rows processed)
+PIPELINE_STAGES: Dict[str, Tuple[str, Callable[[JobReporter, Path], int]]] = {
+    "sample_data": ("Creating sample data", sample_data_stage),
+    "train_baseline": ("Training baseline models", train_baseline_stage),
+    "train_lstm": ("Training LSTM model", train_lstm_stage),
+    "generate_predictions": ("Generating predictions", generate_predictions_stage),
+    "backtest_summaries": ("Backtesting all pairs", backtest_summaries_stage),
+}
+DEFAULT_PIPELINE = list(PIPELINE_STAGES)
+
+
+def create_job(conn: sqlite3.Connection, stages: List[str]) -> int:
+    """Insert a queued job and return its id."""
+    unknown = [stage for stage in stages if stage not in PIPELINE_STAGES]
+    if unknown:
+        raise ValueError(f"Unknown stages: {unknown}. Use any of {DEFAULT_PIPELINE}")
+    cursor = conn.execute("INSERT INTO jobs (stages) VALUES (?)", (json.dumps(stages),))
+    conn.commit()
+    return cursor.lastrowid
+
+
+def get_job(conn: sqlite3.Connection, job_id: Optional[int] = None) -> Optional[Dict]:
+    """The job ``job_id`` (default: the most recent one) as a dictionary."""
+    if job_id is None:
+        row = conn.execute("SELECT * FROM jobs ORDER BY id DESC LIMIT 1").fetchone()
+    else:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    if row is None:
+        return None
+    job = dict(row)
+    job["stages"] = json.loads(job["stages"])
+    return job
+
+
+def fail_interrupted_jobs(conn: sqlite3.Connection) -> int:
+    """Mark jobs left queued or running by a previous server as failed."""
+    cursor = conn.execute(f"""
+        UPDATE jobs SET status = 'failed', error = 'Interrupted: the app server stopped',
+            finished_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+        WHERE status IN ({','.join('?' * len(ACTIVE_STATUSES))})
+    """, ACTIVE_STATUSES)
+    conn.commit()
+    return cursor.rowcount
+
+
+def run_job(job_id: int, db_path: Path = DB_PATH) -> str:
+    """
+    Run a queued job's stages in this process and return its final status.
+
+    The stages read and write ``db_path``, the database holding the job. A
+    failing stage stops the job; its traceback is stored in ``error``.
+    """
+    conn = get_connection(db_path)
+    stages = json.loads(conn.execute("SELECT stages FROM jobs WHERE id = ?", (job_id,)).fetchone()[0])
+    conn.execute("""
+        UPDATE jobs SET status = 'running', started_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    """, (job_id,))
+    conn.commit()
+
+    reporter = JobReporter(job_id, len(stages), db_path)
+    status, error = "succeeded", None
+    try:
+        for i, name in enumerate(stages):
+            label, stage = PIPELINE_STAGES[name]
+            logger.info(f"Job {job_id}: {label} ({i + 1}/{len(stages)})")
+            reporter.start_stage(i, name)
+            reporter.finish_stage(stage(reporter, db_path) or 0)
+    except Exception:
+        status, error = "failed", traceback.format_exc()
+        logger.error(f"Job {job_id} failed:\n{error}")
+    finally:
+        reporter.close()
+
+    conn.execute("""
+        UPDATE jobs SET status = ?, error = ?, finished_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    """, (status, error, job_id))
+    conn.commit()
+    conn.close()
+    return status
+
+
+def warm_imports(modules: List[str] = WARM_IMPORTS) -> List[str]:
+    """Import ``modules`` in this process and return the ones that loaded."""
+    import importlib
+
+    loaded = []
+    for module in modules:
+        try:
+            importlib.import_module(module)
+            loaded.append(module)
+        except ImportError as e:
+            logger.warning(f"Could not preload {module}: {e}")
+    return loaded
+
+
+def start_job_pool(warm: bool = True) -> ProcessPoolExecutor:
+    """
+    Start the persistent single-worker pool that runs jobs.
+
+    The worker is spawned (not forked) because the app server is
+    multi-threaded; with ``warm`` it preloads ``WARM_IMPORTS`` as its first
+    task.
+    """
+    pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    if warm:
+        pool.submit(warm_imports)
+    return pool
+
+
+def submit_job(
+    pool: ProcessPoolExecutor,
+    stages: Optional[List[str]] = None,
+    conn: Optional[sqlite3.Connection] = None,
+    db_path: Path = DB_PATH
+) -> int:
+    """Record a job for ``stages`` (default: the whole pipeline), queue it and return its id."""
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection(db_path)
+        initialize_schema(conn)
+    job_id = create_job(conn, stages or DEFAULT_PIPELINE)
+    if own_conn:
+        conn.close()
+    pool.submit(run_job, job_id, db_path)
+    logger.info(f"Submitted job {job_id}")
+    return job_id
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stages", nargs="+", choices=DEFAULT_PIPELINE, default=DEFAULT_PIPELINE)
+    args = parser.parse_args()
+
+    pool = start_job_pool()
+    job_id = submit_job(pool, args.stages)
+    conn = get_connection()
+    while (job := get_job(conn, job_id))["status"] in ACTIVE_STATUSES:
+        print(f"{job['status']}: stage {job['stage']} {job['progress']:.0%}, "
+              f"{job['rows_processed']} rows, {job['message'] or ''}")
+        time.sleep(2)
+    print(f"Job {job_id} {job['status']}")
+    if job["error"]:
+        print(job["error"])
+    conn.close()
+    pool.shutdown()
@@ -0,0 +1,102 @@
+"""Dashboard of stored backtest metrics for every ticker and model.
+
+The table is one SQL page of the full-range backtests in the ``backtests``
+table (filtered, sorted and paginated by ``query_backtest_summaries``), so
+only ``page size`` rows ever leave the database. Equity curves are loaded
+only for the rows selected in the table.
+"""
+
+import math
+import sys
+from pathlib import Path
+
+import streamlit as st
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from src.app.cache import (
+    data_version, load_backtest, load_missing_summary_count, load_prediction_coverage, load_summary_page,
+    read_job, start_job
+)
+from src.app.charts import performance_chart
+from src.app.job_runner import ACTIVE_STATUSES
+from src.app.widgets import show_job_progress, show_job_result
+from src.models.backtest_cache import SUMMARY_SORT_COLUMNS
+
+PAGE_SIZES = [25, 50, 100]
+
+st.set_page_config(page_title="stockly dashboard", layout="wide", initial_sidebar_state="collapsed")
+st.markdown("#### all tickers & models")
+
+version = data_version()
+
+active_job = read_job()
+if active_job is not None and active_job["status"] in ACTIVE_STATUSES:
+    show_job_progress(active_job["id"])
+else:
+    missing = load_missing_summary_count(version)
+    if missing:
+        st.caption(f"{missing} (ticker, model) pairs have predictions but no stored backtest")
+        if st.button("backtest missing pairs"):
+            st.session_state["summary_job_id"] = start_job(["backtest_summaries"])
+            st.rerun()
+    if "summary_job_id" in st.session_state:
+        show_job_result(st.session_state["summary_job_id"])
+
+models = sorted(load_prediction_coverage(version)["model_name"].unique())
+
+col1, col2, col3, col4, col5 = st.columns([2, 3, 2, 1, 1])
+with col1:
+    search = st.text_input("ticker", placeholder="prefix", key="dashboard_search").strip()
+with col2:
+    model_filter = st.multiselect("models", models, key="dashboard_models")
+with col3:
+    sort_by = st.selectbox("sort by", SUMMARY_SORT_COLUMNS, index=SUMMARY_SORT_COLUMNS.index("sharpe_ratio"),
+                           key="dashboard_sort")
+with col4:
+    descending = st.toggle("descending", value=True, key="dashboard_descending")
+with col5:
+    page_size = st.selectbox("rows", PAGE_SIZES, key="dashboard_page_size")
+
+query = (search, tuple(model_filter), sort_by, descending, page_size)
+if st.session_state.get("dashboard_query") != query:
+    st.session_state["dashboard_query"] = query
+    st.session_state["dashboard_page"] = 1
+
+page = st.session_state.get("dashboard_page", 1)
+total, rows = load_summary_page(*query, page, version)
+n_pages = max(1, math.ceil(total / page_size))
+if page > n_pages:
+    page = st.session_state["dashboard_page"] = n_pages
+    total, rows = load_summary_page(*query, page, version)
+
+if total == 0:
+    st.info("no stored backtests match, run `python -m src.models.backtest_cache --fill`")
+    st.stop()
+
+selection = st.dataframe(
+    rows,
+    use_container_width=True,
+    hide_index=True,
+    on_select="rerun",
+    selection_mode="multi-row",
+    key=f"dashboard_table_{hash(query)}_{page}",
+)
+
+col1, col2 = st.columns([1, 5])
+with col1:
+    st.number_input("page", min_value=1, max_value=n_pages, step=1, key="dashboard_page")
+with col2:
+    st.write("")
+    st.caption(f"rows {(page - 1) * page_size + 1}-{(page - 1) * page_size + len(rows)} of {total:,}, "
+               f"select rows to show their equity curves")
+
+for position in selection.selection.rows:
+    ticker, model_name = rows.iloc[position][["ticker", "model_name"]]
+    st.markdown(f"##### {ticker} · {model_name}")
+    results = load_backtest(ticker, model_name, None, None, version)
+    if not results:
+        st.warning("no predictions found")
+        continue
+    data, spec = performance_chart(results["dates"], results["portfolio_value"], results["buy_hold_value"])
+    st.vega_lite_chart(data, spec, use_container_width=True, theme=None)
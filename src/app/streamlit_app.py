@@ -10,8 +10,15 @@ from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
-from src.database.db_utils import get_connection, initialize_schema
-from src.models.time_series_backtest import backtest_model
+from src.app.cache import (
+    data_version, read_job, start_job, load_backtest, load_model_comparison, load_prediction_coverage,
+    load_price_coverage, load_prices, load_rolling_metrics, load_tickers
+)
+from src.app.job_runner import ACTIVE_STATUSES
+from src.app.widgets import show_job_progress, show_job_result
+from src.app.charts import performance_chart, price_chart, rolling_chart
+from src.config import APP_CHART_MODE
+from src.visualization.downsampling import APP_CHART_POINTS, downsample_for_axes, downsample_frame
 from src.visualization.plot_price_and_signals import plot_price_with_signals
 from src.visualization.plot_performance import plot_backtest_performance
 from src.visualization.style_pixel_theme import PIXEL_COLORS
@@ -256,61 +263,30 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-conn = get_connection()
+version = data_version()
 try:
-    initialize_schema(conn)
-    symbols_df = pd.read_sql_query("SELECT ticker FROM symbols ORDER BY ticker", conn)
-    tickers = symbols_df["ticker"].tolist() if not symbols_df.empty else []
+    tickers = load_tickers(version)
 except Exception as e:
     tickers = []
 
-has_predictions = False
 try:
-    total_preds = pd.read_sql_query("SELECT COUNT(*) as cnt FROM predictions", conn)
-    pred_count = total_preds.iloc[0]['cnt']
-    
-    if pred_count > 0:
-        predictions_check = pd.read_sql_query("""
-            SELECT DISTINCT s.ticker, p.model_name 
-            FROM predictions p
-            JOIN symbols s ON p.symbol_id = s.id
-        """, conn)
-        has_predictions = not predictions_check.empty
+    has_predictions = not load_prediction_coverage(version).empty
 except Exception:
     has_predictions = False
-finally:
-    if conn:
-        conn.close()
+
+active_job = read_job()
+if active_job is not None and active_job["status"] not in ACTIVE_STATUSES:
+    active_job = None
 
 if not tickers:
     st.info("No tickers found. Creating sample data...")
-    with st.spinner("Initializing database and creating sample data..."):
-        try:
-            from src.database.db_utils import initialize_schema, get_connection
-            conn2 = get_connection()
-            initialize_schema(conn2)
-            import subprocess
-            import sys
-            result = subprocess.run(
-                [sys.executable, "create_sample_data.py"], 
-                capture_output=True, 
-                text=True, 
-                cwd=Path(__file__).parent.parent.parent,
-                timeout=120
-            )
-            if result.returncode == 0:
-                st.success("Sample data created! Please refresh the page.")
-                st.rerun()
-            else:
-                st.error(f"Error creating sample data: {result.stderr}")
-                st.code(result.stdout)
-            conn2.close()
-        except subprocess.TimeoutExpired:
-            st.error("Sample data creation timed out. Please try again.")
-        except Exception as e:
-            st.error(f"Error: {e}")
-            import traceback
-            st.code(traceback.format_exc())
+    if active_job is None and "sample_job_id" not in st.session_state:
+        st.session_state["sample_job_id"] = start_job(["sample_data"])
+        active_job = read_job(st.session_state["sample_job_id"])
+    if active_job is not None:
+        show_job_progress(active_job["id"])
+    elif "sample_job_id" in st.session_state:
+        show_job_result(st.session_state["sample_job_id"])
     st.stop()
 
 if not has_predictions and tickers:
@@ -318,59 +294,13 @@ if not has_predictions and tickers:
     
     col1, col2 = st.columns(2)
     with col1:
-        if st.button("Generate Predictions Now", type="primary", use_container_width=True):
-            with st.spinner("Training models and generating predictions... This may take a few minutes."):
-                try:
-                    import subprocess
-                    import sys
-                    from pathlib import Path
-                    import os
-                    
-                    progress_bar = st.progress(0)
-                    status_text = st.empty()
-                    
-                    steps = [
-                        ("Creating sample data...", ["create_sample_data.py"]),
-                        ("Training baseline models...", ["src/models/train_baseline_models.py"]),
-                        ("Training LSTM model...", ["src/models/train_lstm.py"]),
-                        ("Generating predictions...", ["src/models/generate_predictions.py"])
-                    ]
-                    
-                    project_root = Path(__file__).parent.parent.parent
-                    env = os.environ.copy()
-                    env['PYTHONPATH'] = str(project_root)
-                    
-                    for i, (step_name, script) in enumerate(steps):
-                        status_text.text(f"Step {i+1}/{len(steps)}: {step_name}")
-                        progress_bar.progress((i + 1) / len(steps))
-                        
-                        result = subprocess.run(
-                            [sys.executable] + script,
-                            capture_output=True,
-                            text=True,
-                            cwd=project_root,
-                            timeout=600,
-                            env=env
-                        )
-                        if result.returncode != 0:
-                            st.error(f"Error in {step_name}")
-                            st.code(result.stderr)
-                            st.code(result.stdout)
-                            st.stop()
-                        else:
-                            st.success(f"{step_name} completed")
-                    
-                    progress_bar.progress(1.0)
-                    status_text.text("Complete!")
-                    st.success("All predictions generated! Refreshing...")
-                    st.rerun()
-                    
-                except subprocess.TimeoutExpired:
-                    st.error("Process timed out. Please try again.")
-                except Exception as e:
-                    st.error(f"Error: {e}")
-                    import traceback
-                    st.code(traceback.format_exc())
+        if active_job is not None:
+            show_job_progress(active_job["id"])
+        elif st.button("Generate Predictions Now", type="primary", use_container_width=True):
+            st.session_state["pipeline_job_id"] = start_job()
+            st.rerun()
+        elif "pipeline_job_id" in st.session_state:
+            show_job_result(st.session_state["pipeline_job_id"])
     
     st.markdown("""
     **Or run manually in terminal:**
@@ -382,51 +312,42 @@ if not has_predictions and tickers:
     ```
     """)
 
-col1, col2, col3 = st.columns([2, 2, 1])
+col1, col2, col3, col4 = st.columns([2, 2, 2, 1])
 
 with col1:
     selected_ticker = st.selectbox("ticker", tickers, key="ticker_select")
 
 with col2:
-    date_range = st.date_input("date range", value=(date(2022, 7, 31), date(2022, 8, 11)), key="date_range")
+    coverage = load_prediction_coverage(version)
+    ticker_models = coverage.loc[coverage["ticker"] == selected_ticker, "model_name"].tolist() or ["lstm_model"]
+    default_model = ticker_models.index("lstm_model") if "lstm_model" in ticker_models else 0
+    selected_model = st.selectbox("model", ticker_models, index=default_model, key="model_select")
 
 with col3:
+    date_range = st.date_input("date range", value=(date(2022, 7, 31), date(2022, 8, 11)), key="date_range")
+
+with col4:
     st.write("")
     st.write("")
     run_button = st.button("analyze", type="primary", use_container_width=True)
 
 if run_button and len(date_range) == 2:
     start_date, end_date = date_range[0], date_range[1]
-    model_name = "lstm_model"
+    model_name = selected_model
     
     
     try:
         with st.spinner("running analysis..."):
-            results = backtest_model(
+            results = load_backtest(
                 selected_ticker,
                 model_name,
                 start_date.strftime("%Y-%m-%d"),
-                end_date.strftime("%Y-%m-%d")
+                end_date.strftime("%Y-%m-%d"),
+                version
             )
             
             if not results:
-                st.error("No results returned from backtest_model")
-                st.info("Checking database directly...")
-                conn_debug = get_connection()
-                try:
-                    debug_df = pd.read_sql_query("""
-                        SELECT COUNT(*) as cnt FROM predictions p
-                        JOIN symbols s ON p.symbol_id = s.id
-                        WHERE s.ticker = ? AND p.model_name = ?
-                        AND p.date >= ? AND p.date <= ?
-                    """, conn_debug, params=[selected_ticker, model_name, 
-                                             start_date.strftime("%Y-%m-%d"), 
-                                             end_date.strftime("%Y-%m-%d")])
-                    st.write(f"Found {debug_df.iloc[0]['cnt']} predictions in database for this query")
-                except Exception as e2:
-                    st.error(f"Debug query error: {e2}")
-                finally:
-                    conn_debug.close()
+                st.error("No results returned from the backtest")
         
         if results:
             metrics_col1, metrics_col2, metrics_col3, metrics_col4 = st.columns(4)
@@ -443,84 +364,115 @@ if run_button and len(date_range) == 2:
             st.markdown("<br>", unsafe_allow_html=True)
             
             dates = pd.to_datetime(results["dates"])
-            conn_prices = get_connection()
-            try:
-                prices_df = pd.read_sql_query("""
-                    SELECT date, adjusted_close FROM prices p
-                    JOIN symbols s ON p.symbol_id = s.id
-                    WHERE s.ticker = ? AND date >= ? AND date <= ?
-                    ORDER BY date
-                """, conn_prices, params=[selected_ticker, start_date, end_date])
-            finally:
-                conn_prices.close()
+            prices_df = load_prices(
+                selected_ticker,
+                start_date.strftime("%Y-%m-%d"),
+                end_date.strftime("%Y-%m-%d"),
+                version
+            )
             
             chart_col1, chart_col2 = st.columns(2)
             
             with chart_col1:
                 st.markdown("#### price & signals")
-                fig1, ax1 = plt.subplots(figsize=(10, 6))
-                ax1.set_facecolor("#ffffff")
-                fig1.patch.set_facecolor("#ffffff")
-                
-                if not prices_df.empty:
-                    prices_df["date"] = pd.to_datetime(prices_df["date"])
-                    ax1.plot(prices_df["date"], prices_df["adjusted_close"], 
-                            color="#000000", linewidth=2, marker="s", markersize=3)
+                if APP_CHART_MODE == "client":
+                    if not prices_df.empty:
+                        data, spec = price_chart(prices_df["date"], prices_df["adjusted_close"], selected_ticker)
+                        st.vega_lite_chart(data, spec, use_container_width=True, theme=None)
+                else:
+                    fig1, ax1 = plt.subplots(figsize=(10, 6))
                     ax1.set_facecolor("#ffffff")
-                    ax1.tick_params(colors="#000000")
-                    ax1.set_xlabel("date", color="#000000", fontfamily="JetBrains Mono")
-                    ax1.set_ylabel("price", color="#000000", fontfamily="JetBrains Mono")
-                    ax1.set_title(f"{selected_ticker}", color="#000000", fontfamily="JetBrains Mono", fontweight=200)
-                    ax1.grid(True, color="#cccccc", linestyle="-", linewidth=0.5)
-                    plt.tight_layout()
-                    st.pyplot(fig1)
+                    fig1.patch.set_facecolor("#ffffff")
+                
+                    if not prices_df.empty:
+                        ax1.plot(*downsample_for_axes(ax1, prices_df["date"], prices_df["adjusted_close"]),
+                                color="#000000", linewidth=2, marker="s", markersize=3)
+                        ax1.set_facecolor("#ffffff")
+                        ax1.tick_params(colors="#000000")
+                        ax1.set_xlabel("date", color="#000000", fontfamily="JetBrains Mono")
+                        ax1.set_ylabel("price", color="#000000", fontfamily="JetBrains Mono")
+                        ax1.set_title(f"{selected_ticker}", color="#000000", fontfamily="JetBrains Mono", fontweight=200)
+                        ax1.grid(True, color="#cccccc", linestyle="-", linewidth=0.5)
+                        plt.tight_layout()
+                        st.pyplot(fig1)
             
             with chart_col2:
                 st.markdown("#### performance")
-                fig2, ax2 = plt.subplots(figsize=(10, 6))
-                ax2.set_facecolor("#ffffff")
-                fig2.patch.set_facecolor("#ffffff")
+                if APP_CHART_MODE == "client":
+                    data, spec = performance_chart(dates, results["portfolio_value"], results["buy_hold_value"])
+                    st.vega_lite_chart(data, spec, use_container_width=True, theme=None)
+                else:
+                    fig2, ax2 = plt.subplots(figsize=(10, 6))
+                    ax2.set_facecolor("#ffffff")
+                    fig2.patch.set_facecolor("#ffffff")
                 
-                ax2.plot(dates, results["portfolio_value"], 
-                        color="#000000", linewidth=2, marker="s", markersize=3, label="strategy")
-                ax2.plot(dates, results["buy_hold_value"], 
-                        color="#666666", linewidth=2, marker="s", markersize=3, label="buy & hold")
-                ax2.set_facecolor("#ffffff")
-                ax2.tick_params(colors="#000000")
-                ax2.set_xlabel("date", color="#000000", fontfamily="JetBrains Mono")
-                ax2.set_ylabel("portfolio value", color="#000000", fontfamily="JetBrains Mono")
-                ax2.set_title("cumulative returns", color="#000000", fontfamily="JetBrains Mono", fontweight=200)
-                ax2.legend(facecolor="#ffffff", edgecolor="#cccccc", prop={"family": "JetBrains Mono"})
-                ax2.grid(True, color="#cccccc", linestyle="-", linewidth=0.5)
-                plt.tight_layout()
-                st.pyplot(fig2)
+                    ax2.plot(*downsample_for_axes(ax2, dates, results["portfolio_value"]),
+                            color="#000000", linewidth=2, marker="s", markersize=3, label="strategy")
+                    ax2.plot(*downsample_for_axes(ax2, dates, results["buy_hold_value"]),
+                            color="#666666", linewidth=2, marker="s", markersize=3, label="buy & hold")
+                    ax2.set_facecolor("#ffffff")
+                    ax2.tick_params(colors="#000000")
+                    ax2.set_xlabel("date", color="#000000", fontfamily="JetBrains Mono")
+                    ax2.set_ylabel("portfolio value", color="#000000", fontfamily="JetBrains Mono")
+                    ax2.set_title("cumulative returns", color="#000000", fontfamily="JetBrains Mono", fontweight=200)
+                    ax2.legend(facecolor="#ffffff", edgecolor="#cccccc", prop={"family": "JetBrains Mono"})
+                    ax2.grid(True, color="#cccccc", linestyle="-", linewidth=0.5)
+                    plt.tight_layout()
+                    st.pyplot(fig2)
+            
+            st.markdown("#### all models")
+            comparison = load_model_comparison(
+                selected_ticker,
+                start_date.strftime("%Y-%m-%d"),
+                end_date.strftime("%Y-%m-%d"),
+                version
+            )
+            st.dataframe(
+                comparison.drop(columns=["ticker"]).sort_values("sharpe_ratio", ascending=False),
+                use_container_width=True,
+                hide_index=True
+            )
+            
+            rolling = load_rolling_metrics(
+                selected_ticker,
+                model_name,
+                start_date.strftime("%Y-%m-%d"),
+                end_date.strftime("%Y-%m-%d"),
+                version
+            )
+            if not rolling.empty:
+                st.markdown("#### rolling sharpe")
+                if APP_CHART_MODE == "client":
+                    data, spec = rolling_chart(rolling)
+                    st.vega_lite_chart(data, spec, use_container_width=True, theme=None)
+                else:
+                    rolling_sharpe = rolling.pivot(index="date", columns="window_days", values="rolling_sharpe")
+                    st.line_chart(downsample_frame(rolling_sharpe, APP_CHART_POINTS))
+            else:
+                st.caption("no stored rolling metrics, run `python -m src.models.rolling_metrics`")
         else:
             st.warning("no results found for this ticker and date range")
-            st.info("""
+            st.info(f"""
             **Possible reasons:**
             - Predictions don't exist for this ticker (run `python src/models/generate_predictions.py`)
             - Date range doesn't match available predictions
-            - Model 'lstm_model' not found in predictions table
+            - Model '{model_name}' not found in predictions table
             
             Check available predictions:
             """)
-            conn_check2 = get_connection()
             try:
-                available = pd.read_sql_query("""
-                    SELECT DISTINCT s.ticker, p.model_name, 
-                           MIN(p.date) as min_date, MAX(p.date) as max_date
-                    FROM predictions p
-                    JOIN symbols s ON p.symbol_id = s.id
-                    GROUP BY s.ticker, p.model_name
-                """, conn_check2)
+                available = load_prediction_coverage(version)
                 if not available.empty:
                     st.dataframe(available, use_container_width=True)
                 else:
                     st.write("No predictions found in database.")
+                price_range = load_price_coverage(version)
+                price_range = price_range[price_range["ticker"] == selected_ticker]
+                if not price_range.empty:
+                    st.write(f"Prices for {selected_ticker}: {price_range.iloc[0]['min_date']} "
+                             f"to {price_range.iloc[0]['max_date']} ({price_range.iloc[0]['n_rows']} rows)")
             except Exception as e2:
                 st.write(f"Error checking predictions: {e2}")
-            finally:
-                conn_check2.close()
     
     except Exception as e:
         st.error(f"error: {str(e)}")
@@ -528,5 +480,3 @@ if run_button and len(date_range) == 2:
         st.code(traceback.format_exc())
         st.info("ensure models are trained and predictions are generated")
 
-conn.close()
-
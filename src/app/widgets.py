@@ -0,0 +1,36 @@
+"""Streamlit widgets shared by the app's pages."""
+
+import streamlit as st
+
+from src.app.cache import read_job
+from src.app.job_runner import ACTIVE_STATUSES, PIPELINE_STAGES
+from src.config import APP_JOB_POLL_SECONDS
+
+
+@st.fragment(run_every=APP_JOB_POLL_SECONDS)
+def show_job_progress(job_id: int):
+    """Poll a background job and rerun the whole app once it finishes."""
+    job = read_job(job_id)
+    if job is None:
+        return
+    stages = job["stages"]
+    if job["status"] in ACTIVE_STATUSES:
+        stage = job["stage"] or stages[0]
+        label = PIPELINE_STAGES[stage][0]
+        details = [f"{job['rows_processed']:,} rows"]
+        if job["message"]:
+            details.append(job["message"])
+        elif job["epoch"]:
+            details.append(f"epoch {job['epoch']}")
+        st.progress(job["progress"], text=f"Step {job['stage_index'] + 1}/{len(stages)}: {label}... "
+                                           f"({', '.join(details)})")
+    else:
+        st.rerun()
+
+
+def show_job_result(job_id: int):
+    """Show the error of a failed job."""
+    job = read_job(job_id)
+    if job is not None and job["status"] == "failed":
+        st.error(f"Job {job_id} failed in stage {job['stage']}")
+        st.code(job["error"] or "")
@@ -0,0 +1,78 @@
+"""Compare the random forest and histogram gradient boosting baselines.
+
+Reports training time, inference throughput, pickled artifact size and test
+accuracy on the tabular dataset. ``--scale`` tiles the training rows (with
+small noise) to approximate a larger universe.
+"""
+
+import argparse
+import io
+import logging
+import time
+from typing import Sequence
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score
+
+from src.config import RANDOM_SEED, TRAIN_END_DATE
+from src.models.build_datasets import build_tabular_dataset
+from src.models.train_baseline_models import BASELINE_MODEL_FACTORIES
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def scale_dataset(X: pd.DataFrame, y: pd.Series, scale: int, seed: int = RANDOM_SEED):
+    """Tile rows ``scale`` times with 1% multiplicative noise."""
+    if scale <= 1:
+        return X, y
+    rng = np.random.default_rng(seed)
+    X_big = np.tile(X.to_numpy(), (scale, 1))
+    X_big *= 1 + 0.01 * rng.standard_normal(X_big.shape)
+    return pd.DataFrame(X_big, columns=X.columns), pd.Series(np.tile(y.to_numpy(), scale), name=y.name)
+
+
+def compare_models(
+    model_names: Sequence[str] = ("random_forest", "hist_gradient_boosting"),
+    scale: int = 1
+) -> pd.DataFrame:
+    """Train and score each model on the same split and collect the metrics."""
+    X_train, y_train, X_test, y_test = build_tabular_dataset(train_split_date=TRAIN_END_DATE)
+    X_train, y_train = scale_dataset(X_train, y_train, scale)
+
+    rows = []
+    for name in model_names:
+        model = BASELINE_MODEL_FACTORIES[name]()
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        train_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        y_pred = model.predict(X_test)
+        model.predict_proba(X_test)
+        predict_seconds = time.perf_counter() - start
+
+        buffer = io.BytesIO()
+        joblib.dump(model, buffer)
+
+        rows.append({
+            "model": name,
+            "train_rows": len(X_train),
+            "train_seconds": train_seconds,
+            "predict_rows_per_s": len(X_test) / predict_seconds,
+            "artifact_kb": buffer.getbuffer().nbytes / 1024,
+            "train_matrix_kb": X_train.memory_usage(index=False).sum() / 1024,
+            "test_accuracy": accuracy_score(y_test, y_pred)
+        })
+        logger.info(f"{name}: trained in {train_seconds:.2f}s, accuracy {rows[-1]['test_accuracy']:.4f}")
+
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args()
+
+    print(compare_models(scale=args.scale).to_string(index=False))
@@ -0,0 +1,72 @@
+"""Compare float64 and float32 feature matrices for the baseline models.
+
+Reports the feature matrix size, training time, inference throughput and
+test accuracy for each dtype, so the memory saved and the speedup of the
+``MODEL_DTYPE`` policy can be checked on the local database. ``--scale``
+tiles the training rows (with small noise) to approximate a larger universe.
+"""
+
+import argparse
+import logging
+import time
+from typing import List
+
+import pandas as pd
+from sklearn.metrics import accuracy_score
+
+from src.benchmarks.baseline_models import scale_dataset
+from src.config import TRAIN_END_DATE
+from src.models.build_datasets import build_tabular_dataset
+from src.models.train_baseline_models import BASELINE_MODEL_FACTORIES
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DTYPES = ["float64", "float32"]
+
+
+def compare_dtypes(
+    model_names: List[str] = list(BASELINE_MODEL_FACTORIES),
+    scale: int = 1
+) -> pd.DataFrame:
+    """Train and score each model once per dtype on the same split."""
+    rows = []
+    for dtype in DTYPES:
+        X_train, y_train, X_test, y_test = build_tabular_dataset(train_split_date=TRAIN_END_DATE, dtype=dtype)
+        X_train, y_train = scale_dataset(X_train, y_train, scale)
+        X_train = X_train.astype(dtype)
+
+        for name in model_names:
+            model = BASELINE_MODEL_FACTORIES[name]()
+            start = time.perf_counter()
+            model.fit(X_train, y_train)
+            train_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            y_pred = model.predict(X_test)
+            predict_seconds = time.perf_counter() - start
+
+            rows.append({
+                "model": name,
+                "dtype": dtype,
+                "train_matrix_kb": X_train.memory_usage(index=False).sum() / 1024,
+                "train_seconds": train_seconds,
+                "predict_rows_per_s": len(X_test) / predict_seconds,
+                "test_accuracy": accuracy_score(y_test, y_pred)
+            })
+            logger.info(f"{name} ({dtype}): trained in {train_seconds:.2f}s")
+
+    results = pd.DataFrame(rows)
+    baseline = results[results["dtype"] == "float64"].set_index("model")
+    results["memory_ratio"] = results["train_matrix_kb"] / results["model"].map(baseline["train_matrix_kb"])
+    results["train_speedup"] = results["model"].map(baseline["train_seconds"]) / results["train_seconds"]
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--models", nargs="+", default=list(BASELINE_MODEL_FACTORIES))
+    args = parser.parse_args()
+
+    print(compare_dtypes(args.models, scale=args.scale).to_string(index=False))
@@ -0,0 +1,85 @@
+"""Benchmark the cold-start import cost of each pipeline entry point."""
+
+import argparse
+import json
+import logging
+import subprocess
+import sys
+from typing import Dict, List
+
+import pandas as pd
+
+from src.config import PROJECT_ROOT
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ENTRY_POINTS = [
+    "src.database.db_utils",
+    "src.models.backends",
+    "src.models.generate_predictions",
+    "src.models.time_series_backtest",
+    "src.models.train_baseline_models",
+    "src.models.train_lstm",
+]
+
+HEAVY_MODULES = ["tensorflow", "keras", "sklearn", "matplotlib"]
+
+_PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "loaded": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+def measure_import(module: str) -> Dict:
+    """Import ``module`` in a fresh interpreter and return time, peak RSS and heavy deps."""
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        capture_output=True,
+        text=True,
+        cwd=PROJECT_ROOT
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def benchmark_imports(modules: List[str] = ENTRY_POINTS, repeat: int = 3) -> pd.DataFrame:
+    """
+    Measure cold import time of each module.
+
+    Args:
+        modules: Dotted module names to import
+        repeat: Fresh-interpreter runs per module; the fastest is reported
+
+    Returns:
+        DataFrame with one row per module
+    """
+    rows = []
+    for module in modules:
+        runs = [measure_import(module) for _ in range(repeat)]
+        best = min(runs, key=lambda run: run["seconds"])
+        rows.append({
+            "module": module,
+            "import_seconds": best["seconds"],
+            "max_rss_mb": best["max_rss_mb"],
+            "heavy_modules": ",".join(best["loaded"]) or "-"
+        })
+        logger.info(f"{module}: {best['seconds']:.3f}s, {best['max_rss_mb']:.0f} MB, loads [{rows[-1]['heavy_modules']}]")
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(benchmark_imports(args.modules, args.repeat).to_string(index=False))
@@ -0,0 +1,111 @@
+"""Compare LSTM inference backends against the float32 Keras model.
+
+Reports single-window latency, batch throughput, artifact size and agreement
+with Keras (direction agreement and max probability difference) for every
+LSTM backend that has a saved artifact.
+"""
+
+import argparse
+import logging
+import time
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config import LSTM_LOOKBACK_WINDOW, MODELS_DIR, RANDOM_SEED
+from src.models.backends import load_model
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+LSTM_BACKENDS = ["keras", "numpy", "tflite_float16", "tflite_int8"]
+
+
+def load_windows(ticker: Optional[str], n_samples: int) -> np.ndarray:
+    """Use real test windows when the database has them, random windows otherwise."""
+    from src.models.sequence_dataset import build_sequence_dataset
+
+    try:
+        _, _, X_test, _ = build_sequence_dataset(ticker, lookback=LSTM_LOOKBACK_WINDOW)
+    except Exception as e:
+        logger.warning(f"Falling back to random windows: {e}")
+        X_test = np.empty((0, LSTM_LOOKBACK_WINDOW, 14))
+
+    if len(X_test) == 0:
+        X_test = np.random.default_rng(RANDOM_SEED).normal(size=(n_samples, LSTM_LOOKBACK_WINDOW, 14))
+
+    reps = int(np.ceil(n_samples / len(X_test)))
+    return np.tile(X_test, (reps, 1, 1))[:n_samples].astype(np.float32)
+
+
+def _best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def benchmark_backends(
+    X: np.ndarray,
+    backends: List[str] = LSTM_BACKENDS,
+    batch_size: int = 1024,
+    repeat: int = 5
+) -> pd.DataFrame:
+    """
+    Benchmark each backend on the same windows.
+
+    Args:
+        X: Windows of shape (n_samples, lookback, n_features)
+        backends: Backend names to compare; the first must be the reference
+        batch_size: Batch size for the throughput run
+        repeat: Timing repetitions; the fastest run is reported
+
+    Returns:
+        DataFrame with one row per backend
+    """
+    rows = []
+    reference = None
+
+    for name in backends:
+        model = load_model("lstm_model", backend=name)
+        if model is None:
+            continue
+
+        predict = model.model.predict
+        kwargs = {"verbose": 0, "batch_size": batch_size} if name == "keras" else {"batch_size": batch_size}
+        probabilities = predict(X, **kwargs)
+        if reference is None:
+            reference = probabilities
+
+        single = X[:1]
+        latency = _best_of(lambda: predict(single, **kwargs), repeat * 4)
+        batch_seconds = _best_of(lambda: predict(X, **kwargs), repeat)
+
+        rows.append({
+            "backend": name,
+            "size_kb": model.path.stat().st_size / 1024,
+            "latency_ms": latency * 1000,
+            "throughput_per_s": len(X) / batch_seconds,
+            "direction_agreement": float((probabilities.argmax(axis=1) == reference.argmax(axis=1)).mean()),
+            "max_prob_diff": float(np.abs(probabilities - reference).max())
+        })
+        logger.info(f"{name}: {rows[-1]['latency_ms']:.2f} ms/window, {rows[-1]['throughput_per_s']:.0f} windows/s")
+
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ticker", default=None)
+    parser.add_argument("--samples", type=int, default=4096)
+    parser.add_argument("--batch-size", type=int, default=1024)
+    args = parser.parse_args()
+
+    if not (MODELS_DIR / "lstm_model.h5").exists():
+        raise SystemExit("Train the LSTM first: python src/models/train_lstm.py")
+
+    windows = load_windows(args.ticker, args.samples)
+    print(benchmark_backends(windows, batch_size=args.batch_size).to_string(index=False))
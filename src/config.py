@@ -15,6 +15,11 @@ REPORTS_DIR = PROJECT_ROOT / "reports"
 
 RANDOM_SEED = 42
 
+# Floating-point dtype for feature matrices, from the SQL query through the
+# dataset builders, shared-memory caches and inference. Use "float64" to
+# reproduce full-precision results.
+MODEL_DTYPE = "float32"
+
 DEFAULT_TICKERS = ["AAPL", "MSFT", "GOOGL", "AMZN", "TSLA"]
 
 TRAIN_START_DATE = "2020-01-01"
@@ -29,4 +34,30 @@ LSTM_LOOKBACK_WINDOW = 30
 LSTM_BATCH_SIZE = 32
 LSTM_EPOCHS = 50
 LSTM_HIDDEN_UNITS = 64
+LSTM_LEARNING_RATE = 0.001
+
+LOGREG_C = 1.0
+RF_N_ESTIMATORS = 100
+RF_MAX_DEPTH = 10
+HGB_MAX_ITER = 200
+HGB_LEARNING_RATE = 0.05
+HGB_MAX_LEAF_NODES = 31
+HGB_MAX_BINS = 255
+
+# Window lengths (trading days) of the stored rolling performance metrics.
+ROLLING_WINDOWS = [20, 60, 120]
+
+# Lifetime of cached query results in the Streamlit app. Results are also
+# invalidated as soon as another process commits to the database.
+APP_CACHE_TTL_SECONDS = 600
+
+# How often the app polls a running background pipeline job.
+APP_JOB_POLL_SECONDS = 1.0
+
+# Line charts with more points than this are downsampled to about one point
+# per pixel column of the axes before plotting.
+PLOT_DOWNSAMPLE_THRESHOLD = 2000
 
+# "client": the app sends downsampled series to the browser and draws them
+# with Vega-Lite (zoom and pan without reruns); "server": matplotlib images.
+APP_CHART_MODE = "client"
@@ -0,0 +1,82 @@
+"""Create random-walk sample stock data for testing."""
+
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.database.db_utils import get_connection, initialize_schema, get_or_create_symbol, insert_prices
+from src.data_preprocessing.calculate_technical_features import compute_and_store_features
+from src.data_preprocessing.create_targets import compute_and_store_targets
+from src.config import DB_PATH, DEFAULT_TICKERS, RANDOM_SEED
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def create_sample_data(
+    tickers: Optional[List[str]] = None,
+    n_days: int = 1000,
+    start_date: str = "2020-01-01",
+    seed: int = RANDOM_SEED,
+    progress: Optional[Callable[[int], None]] = None,
+    db_path: Path = DB_PATH
+) -> int:
+    """
+    Insert sample prices for ``tickers`` and compute their features and targets.
+
+    Args:
+        tickers: Tickers to create (default: the first three ``DEFAULT_TICKERS``)
+        n_days: Number of calendar days per ticker
+        start_date: First date
+        seed: Random seed; the default reproduces the original sample database
+        progress: Called with the running number of price rows inserted
+        db_path: Database to write to
+
+    Returns:
+        Number of price rows inserted
+    """
+    tickers = tickers or DEFAULT_TICKERS[:3]
+    rng = np.random.RandomState(seed)
+
+    conn = get_connection(db_path)
+    initialize_schema(conn)
+
+    dates = pd.date_range(datetime.fromisoformat(start_date), periods=n_days, freq="D")
+    rows = 0
+
+    for ticker in tickers:
+        logger.info(f"Creating sample data for {ticker}...")
+
+        prices = 100 + np.cumsum(rng.randn(len(dates)) * 2)
+        prices = np.maximum(prices, 10)
+
+        prices_df = pd.DataFrame({
+            "date": dates.strftime("%Y-%m-%d"),
+            "open": prices * (1 + rng.randn(len(dates)) * 0.01),
+            "high": prices * (1 + np.abs(rng.randn(len(dates)) * 0.02)),
+            "low": prices * (1 - np.abs(rng.randn(len(dates)) * 0.02)),
+            "close": prices,
+            "adjusted_close": prices,
+            "volume": rng.randint(1000000, 10000000, len(dates))
+        })
+
+        symbol_id = get_or_create_symbol(conn, ticker)
+        insert_prices(conn, symbol_id, prices_df)
+        rows += len(prices_df)
+        logger.info(f"  Inserted {len(prices_df)} price rows")
+        if progress is not None:
+            progress(rows)
+
+    conn.close()
+
+    logger.info("Computing features...")
+    compute_and_store_features(db_path=db_path)
+
+    logger.info("Computing targets...")
+    compute_and_store_targets(db_path=db_path)
+
+    return rows
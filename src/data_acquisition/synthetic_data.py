@@ -0,0 +1,315 @@
+"""Synthetic market data at benchmark scale.
+
+``create_sample_data`` reproduces the small sample database. This module
+generates any number of tickers and trading days, optionally as intraday
+bars, for scaling tests:
+
+- returns follow a factor model: each ticker loads on ``n_factors`` common
+  factors (the first one a market factor) plus idiosyncratic noise, so
+  tickers are correlated like real ones;
+- prices are generated ``chunk_tickers`` tickers at a time as NumPy
+  arrays, so memory stays bounded at any ticker count;
+- every ticker draws from its own seeded stream and the factors from
+  another, so the data depends only on the seed, never on the chunk size;
+- chunks stream into the database through the bulk insert functions,
+  which keep the coverage tables, prediction versions and rolling metrics
+  consistent, with features and targets computed in memory, or into one
+  Parquet file with a row group per chunk (needs ``pyarrow``).
+
+Intraday bars only go to Parquet: the database stores one row per day.
+
+Example, 10k tickers x 20 years into a separate database::
+
+    python -m src.data_acquisition.synthetic_data --tickers 10000 --days 5040 --db data/bench.db
+"""
+
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config import DB_PATH, RANDOM_SEED
+from src.data_preprocessing.calculate_technical_features import calculate_technical_features
+from src.data_preprocessing.create_targets import create_targets_from_prices
+from src.database.db_utils import (
+    get_connection, get_or_create_symbol, initialize_schema, insert_features, insert_prices, insert_targets
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_START_DATE = "2000-01-03"
+DEFAULT_CHUNK_TICKERS = 250
+# Chunks are cut smaller when their tickers would exceed this many bars.
+MAX_CHUNK_ROWS = 2_000_000
+TICKER_FORMAT = "SYN{:05d}"
+SESSION_OPEN = "09:30"
+SESSION_CLOSE = "16:00"
+
+FACTOR_DAILY_VOL = 0.01
+IDIO_DAILY_VOL = (0.01, 0.03)
+DAILY_DRIFT = (0.0003, 0.0002)
+VOLUME_RANGE = (1e5, 1e7)
+
+# Stream keys: the factors and each ticker get independent seeded generators.
+FACTOR_STREAM = 0
+TICKER_STREAM = 1
+
+
+def synthetic_tickers(indices) -> List[str]:
+    return [TICKER_FORMAT.format(i) for i in indices]
+
+
+def bar_timestamps(
+    n_days: int,
+    start_date: str = DEFAULT_START_DATE,
+    freq: Optional[str] = None
+) -> pd.DatetimeIndex:
+    """
+    Timestamps of ``n_days`` business days, or of their intraday bars.
+
+    Args:
+        n_days: Trading days
+        start_date: First trading day (or the next business day)
+        freq: Bar length such as ``"1h"`` or ``"5min"``; bars start at
+            ``SESSION_OPEN`` and the last one ends by ``SESSION_CLOSE``
+    """
+    days = pd.bdate_range(start_date, periods=n_days)
+    if freq is None:
+        return days
+    session = pd.date_range(f"2000-01-01 {SESSION_OPEN}", f"2000-01-01 {SESSION_CLOSE}", freq=freq, inclusive="left")
+    offsets = session - session[0].normalize()
+    return pd.DatetimeIndex((days.values[:, None] + offsets.values[None, :]).ravel())
+
+
+def factor_returns(n_periods: int, n_factors: int, periods_per_day: int = 1, seed: int = RANDOM_SEED) -> np.ndarray:
+    """Returns of the common factors, shape (periods, factors)."""
+    rng = np.random.default_rng([seed, FACTOR_STREAM])
+    return rng.standard_normal((n_periods, n_factors)) * FACTOR_DAILY_VOL / np.sqrt(periods_per_day)
+
+
+def _ticker_draws(index: int, n_periods: int, n_factors: int, seed: int) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng([seed, TICKER_STREAM, index])
+    loadings = np.concatenate([rng.normal(1.0, 0.3, 1), rng.normal(0.0, 0.5, n_factors - 1)])
+    return {
+        "loadings": loadings,
+        "idio_vol": rng.uniform(*IDIO_DAILY_VOL),
+        "drift": rng.normal(*DAILY_DRIFT),
+        "start_price": rng.lognormal(np.log(50), 0.8),
+        "volume": np.exp(rng.uniform(*np.log(VOLUME_RANGE))),
+        "noise": rng.standard_normal((4, n_periods)),
+    }
+
+
+def price_chunk(
+    indices: range,
+    timestamps: pd.DatetimeIndex,
+    factors: np.ndarray,
+    periods_per_day: int = 1,
+    seed: int = RANDOM_SEED
+) -> pd.DataFrame:
+    """
+    OHLCV bars of the tickers ``indices``, ticker-major and time-ordered.
+
+    Args:
+        indices: Ticker numbers
+        timestamps: Bar timestamps from ``bar_timestamps``
+        factors: Factor returns from ``factor_returns``
+        periods_per_day: Bars per trading day, scales drift and volatility
+        seed: Random seed
+    """
+    n_periods, n_factors = factors.shape
+    draws = [_ticker_draws(i, n_periods, n_factors, seed) for i in indices]
+    scale = 1 / np.sqrt(periods_per_day)
+
+    loadings = np.stack([d["loadings"] for d in draws])                     # (tickers, factors)
+    idio_vol = np.array([d["idio_vol"] for d in draws])[:, None] * scale
+    drift = np.array([d["drift"] for d in draws])[:, None] / periods_per_day
+    noise = np.stack([d["noise"] for d in draws])                           # (tickers, 4, periods)
+
+    log_returns = loadings @ factors.T + drift + idio_vol * noise[:, 0]
+    start = np.log([d["start_price"] for d in draws])[:, None]
+    close = np.exp(start + np.cumsum(log_returns, axis=1))
+    previous = np.concatenate([np.exp(start), close[:, :-1]], axis=1)
+    open_ = previous * np.exp(0.2 * idio_vol * noise[:, 1])
+    high = np.maximum(open_, close) * np.exp(0.5 * idio_vol * np.abs(noise[:, 2]))
+    low = np.minimum(open_, close) * np.exp(-0.5 * idio_vol * np.abs(noise[:, 3]))
+    base_volume = np.array([d["volume"] for d in draws])[:, None] / periods_per_day
+    volume = np.round(base_volume * np.exp(0.3 * noise[:, 1] + 5 * np.abs(log_returns)))
+
+    tickers = synthetic_tickers(indices)
+    return pd.DataFrame({
+        "ticker": np.repeat(tickers, n_periods),
+        "date": np.tile(timestamps.values, len(tickers)),
+        "open": open_.ravel(),
+        "high": high.ravel(),
+        "low": low.ravel(),
+        "close": close.ravel(),
+        "adjusted_close": close.ravel(),
+        "volume": volume.ravel(),
+    })
+
+
+def generate_price_chunks(
+    n_tickers: int,
+    n_days: int,
+    start_date: str = DEFAULT_START_DATE,
+    freq: Optional[str] = None,
+    n_factors: int = 3,
+    seed: int = RANDOM_SEED,
+    chunk_tickers: int = DEFAULT_CHUNK_TICKERS
+) -> Iterator[pd.DataFrame]:
+    """Yield ``price_chunk`` frames of up to ``chunk_tickers`` tickers until ``n_tickers`` are generated."""
+    if n_factors < 1:
+        raise ValueError("n_factors must be at least 1 (the market factor)")
+    timestamps = bar_timestamps(n_days, start_date, freq)
+    periods_per_day = len(timestamps) // n_days
+    factors = factor_returns(len(timestamps), n_factors, periods_per_day, seed)
+    chunk_tickers = max(1, min(chunk_tickers, MAX_CHUNK_ROWS // len(timestamps)))
+    for first in range(0, n_tickers, chunk_tickers):
+        yield price_chunk(range(first, min(first + chunk_tickers, n_tickers)), timestamps, factors,
+                          periods_per_day, seed)
+
+
+def write_chunks_to_db(
+    chunks: Iterator[pd.DataFrame],
+    conn: sqlite3.Connection,
+    features: bool = True,
+    progress: Optional[Callable[[int], None]] = None
+) -> int:
+    """
+    Store price chunks, and their features and targets, ticker by ticker.
+
+    Returns:
+        Number of price rows written
+    """
+    rows = 0
+    for chunk in chunks:
+        for ticker, prices_df in chunk.groupby("ticker", sort=False):
+            symbol_id = get_or_create_symbol(conn, ticker)
+            insert_prices(conn, symbol_id, prices_df)
+            if features:
+                insert_features(conn, symbol_id, calculate_technical_features(prices_df))
+                insert_targets(conn, symbol_id, create_targets_from_prices(prices_df))
+            rows += len(prices_df)
+        logger.info(f"Stored {rows} price rows")
+        if progress is not None:
+            progress(rows)
+    return rows
+
+
+def write_chunks_to_parquet(
+    chunks: Iterator[pd.DataFrame],
+    path: Path,
+    progress: Optional[Callable[[int], None]] = None
+) -> int:
+    """
+    Stream price chunks into one Parquet file, one row group per chunk.
+
+    Returns:
+        Number of price rows written
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Writing Parquet needs pyarrow: pip install pyarrow") from e
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rows, writer = 0, None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema, compression="zstd")
+            writer.write_table(table)
+            rows += len(chunk)
+            logger.info(f"Wrote {rows} price rows to {path}")
+            if progress is not None:
+                progress(rows)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def generate_synthetic_data(
+    n_tickers: int,
+    n_days: int,
+    start_date: str = DEFAULT_START_DATE,
+    freq: Optional[str] = None,
+    n_factors: int = 3,
+    seed: int = RANDOM_SEED,
+    chunk_tickers: int = DEFAULT_CHUNK_TICKERS,
+    parquet_path: Optional[Path] = None,
+    db_path: Path = DB_PATH,
+    features: bool = True,
+    progress: Optional[Callable[[int], None]] = None
+) -> Dict:
+    """
+    Generate synthetic prices and write them to the database or to Parquet.
+
+    Args:
+        n_tickers: Number of tickers (``SYN00000``, ``SYN00001``, ...)
+        n_days: Trading days per ticker
+        start_date: First trading day
+        freq: Intraday bar length (Parquet only); default one bar per day
+        n_factors: Common return factors, the first being the market
+        seed: Random seed; the same seed gives the same data at any chunk size
+        chunk_tickers: Tickers generated and written per chunk
+        parquet_path: Write this Parquet file instead of the database
+        db_path: Database to fill
+        features: Also compute and store features and targets (database only)
+        progress: Called with the running number of price rows written
+
+    Returns:
+        Dictionary with ``rows``, ``seconds`` and ``rows_per_second``
+    """
+    if freq is not None and parquet_path is None:
+        raise ValueError("Intraday bars can only be written to Parquet; the database stores daily rows")
+
+    chunks = generate_price_chunks(n_tickers, n_days, start_date, freq, n_factors, seed, chunk_tickers)
+    start = time.perf_counter()
+    if parquet_path is not None:
+        rows = write_chunks_to_parquet(chunks, parquet_path, progress)
+    else:
+        conn = get_connection(db_path)
+        initialize_schema(conn)
+        try:
+            rows = write_chunks_to_db(chunks, conn, features, progress)
+        finally:
+            conn.close()
+    seconds = time.perf_counter() - start
+
+    throughput = rows / seconds if seconds > 0 else float(rows)
+    logger.info(f"Generated {rows} rows for {n_tickers} tickers in {seconds:.1f}s ({throughput:,.0f} rows/s)")
+    return {"rows": rows, "seconds": seconds, "rows_per_second": throughput}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=100)
+    parser.add_argument("--days", type=int, default=252 * 5, help="Trading days per ticker")
+    parser.add_argument("--start", default=DEFAULT_START_DATE)
+    parser.add_argument("--freq", default=None, help='Intraday bar length, e.g. "1h" (Parquet only)')
+    parser.add_argument("--factors", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=RANDOM_SEED)
+    parser.add_argument("--chunk-tickers", type=int, default=DEFAULT_CHUNK_TICKERS)
+    parser.add_argument("--parquet", type=Path, default=None, help="Write this Parquet file instead of the database")
+    parser.add_argument("--db", type=Path, default=DB_PATH)
+    parser.add_argument("--no-features", action="store_true", help="Only store prices")
+    args = parser.parse_args()
+
+    summary = generate_synthetic_data(
+        args.tickers, args.days, args.start, args.freq, args.factors, args.seed, args.chunk_tickers,
+        args.parquet, args.db, not args.no_features
+    )
+    for key, value in summary.items():
+        print(f"{key}: {value}")
@@ -3,10 +3,12 @@
 import logging
 import pandas as pd
 import numpy as np
+from pathlib import Path
 from typing import Optional
 
 from src.database.db_utils import get_connection, query_features_and_targets, insert_features, get_or_create_symbol
 from src.config import DB_PATH
+from src.instrumentation import instrument
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -33,6 +35,7 @@ def calculate_macd(prices: pd.Series, fast: int = 12, slow: int = 26, signal: in
     return macd, macd_signal, macd_histogram
 
 
+@instrument()
 def calculate_technical_features(prices_df: pd.DataFrame) -> pd.DataFrame:
     """
     Calculate technical indicators from price data.
@@ -74,9 +77,10 @@ def calculate_technical_features(prices_df: pd.DataFrame) -> pd.DataFrame:
                "macd_histogram", "lag_return_1", "lag_return_2", "lag_return_5"]]
 
 
-def compute_and_store_features(ticker: Optional[str] = None) -> None:
-    """Compute features for all symbols or a specific ticker and store in database."""
-    conn = get_connection()
+@instrument()
+def compute_and_store_features(ticker: Optional[str] = None, db_path: Path = DB_PATH) -> None:
+    """Compute features for all symbols or a specific ticker and store in database ``db_path``."""
+    conn = get_connection(db_path)
     
     query = """
         SELECT s.ticker, s.id as symbol_id, p.date, p.close, p.adjusted_close, p.volume
@@ -2,15 +2,18 @@
 
 import logging
 import pandas as pd
+from pathlib import Path
 from typing import Optional
 
-from src.database.db_utils import get_connection, get_or_create_symbol, insert_targets
-from src.config import DIRECTION_THRESHOLD_UP, DIRECTION_THRESHOLD_DOWN
+from src.database.db_utils import get_connection, get_or_create_symbol, initialize_schema, insert_targets
+from src.config import DB_PATH, DIRECTION_THRESHOLD_UP, DIRECTION_THRESHOLD_DOWN
+from src.instrumentation import instrument
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@instrument()
 def create_targets_from_prices(
     prices_df: pd.DataFrame,
     threshold_up: float = DIRECTION_THRESHOLD_UP,
@@ -42,9 +45,11 @@ def create_targets_from_prices(
     return df
 
 
-def compute_and_store_targets(ticker: Optional[str] = None) -> None:
-    """Compute targets for all symbols or a specific ticker and store in database."""
-    conn = get_connection()
+@instrument()
+def compute_and_store_targets(ticker: Optional[str] = None, db_path: Path = DB_PATH) -> None:
+    """Compute targets for all symbols or a specific ticker and store in database ``db_path``."""
+    conn = get_connection(db_path)
+    initialize_schema(conn)
     
     query = """
         SELECT s.ticker, s.id as symbol_id, p.date, p.adjusted_close
@@ -7,15 +7,23 @@ from typing import Optional, List, Tuple
 import pandas as pd
 
 from src.config import DB_PATH, PROJECT_ROOT
+from src.instrumentation import instrument
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+FEATURE_FLOAT_COLS = [
+    "return_1d", "return_5d", "volatility_10d", "volatility_20d",
+    "sma_10", "sma_20", "sma_50", "rsi_14",
+    "macd", "macd_signal", "macd_histogram",
+    "lag_return_1", "lag_return_2", "lag_return_5"
+]
 
-def get_connection(db_path: Path = DB_PATH) -> sqlite3.Connection:
+
+def get_connection(db_path: Path = DB_PATH, check_same_thread: bool = True) -> sqlite3.Connection:
     """Get connection to SQLite database."""
     db_path.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(db_path))
+    conn = sqlite3.connect(str(db_path), check_same_thread=check_same_thread)
     conn.row_factory = sqlite3.Row
     return conn
 
@@ -32,6 +40,14 @@ def initialize_schema(conn: Optional[sqlite3.Connection] = None) -> None:
     
     conn.executescript(schema_sql)
     conn.commit()
+
+    # Databases created before the coverage tables existed get them backfilled once.
+    backfill = conn.execute("""
+        SELECT (NOT EXISTS (SELECT 1 FROM prediction_coverage) AND EXISTS (SELECT 1 FROM predictions))
+            OR (NOT EXISTS (SELECT 1 FROM price_coverage) AND EXISTS (SELECT 1 FROM prices))
+    """).fetchone()[0]
+    if backfill:
+        rebuild_coverage(conn)
     logger.info("Database schema initialized")
 
 
@@ -43,32 +59,106 @@ def get_or_create_symbol(conn: sqlite3.Connection, ticker: str, name: Optional[s
     if row:
         return row["id"]
     
-    conn.execute("INSERT INTO symbols (ticker, name) VALUES (?, ?)", (ticker, name))
+    cursor = conn.execute("INSERT INTO symbols (ticker, name) VALUES (?, ?)", (ticker, name))
     conn.commit()
-    symbol_id = cursor.lastrowid if cursor.lastrowid else conn.lastrowid
-    return symbol_id
+    return cursor.lastrowid
+
+
+def _date_strings(dates) -> List[str]:
+    """Dates as ``YYYY-MM-DD`` strings; values that are already strings are kept."""
+    dates = pd.Series(dates)
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates.dt.strftime("%Y-%m-%d").tolist()
+    return [date_val.strftime("%Y-%m-%d") if hasattr(date_val, "strftime") else date_val for date_val in dates]
 
 
+def _nullable_rows(df: pd.DataFrame, columns: List[str]) -> List[list]:
+    """Row-major Python values of ``columns`` with NaN as None (missing columns are all None)."""
+    values = pd.DataFrame({col: df[col] if col in df else None for col in columns}, index=df.index)
+    return values.astype(object).where(values.notna(), None).values.tolist()
+
+
+@instrument(rows="prices_df")
 def insert_prices(conn: sqlite3.Connection, symbol_id: int, prices_df: pd.DataFrame) -> None:
     """Insert or replace price data."""
-    for _, row in prices_df.iterrows():
-        conn.execute("""
-            INSERT OR REPLACE INTO prices 
-            (symbol_id, date, open, high, low, close, adjusted_close, volume)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            symbol_id,
-            row["date"],
-            row.get("open"),
-            row.get("high"),
-            row.get("low"),
-            row.get("close"),
-            row.get("adjusted_close", row.get("close")),
-            row.get("volume")
-        ))
+    dates = _date_strings(prices_df["date"])
+    prices_df = prices_df.assign(adjusted_close=prices_df.get("adjusted_close", prices_df.get("close")))
+    values = _nullable_rows(prices_df, ["open", "high", "low", "close", "adjusted_close", "volume"])
+    coverage = _CoverageUpdate(conn, "price_coverage", "prices", symbol_id, dates)
+    conn.executemany("""
+        INSERT OR REPLACE INTO prices 
+        (symbol_id, date, open, high, low, close, adjusted_close, volume)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, ([symbol_id, date_val] + row for date_val, row in zip(dates, values)))
+    coverage.apply()
+    conn.commit()
+
+
+class _CoverageUpdate:
+    """
+    Incremental maintenance of a coverage summary row around one write.
+
+    Counts the stored rows in the written date range before and after the
+    write, then adds the difference to ``n_rows`` and widens the date
+    bounds. Only the written range is scanned (through the
+    (symbol_id, [model_name,] date) index), never the whole table.
+    """
+
+    def __init__(self, conn, coverage_table, data_table, symbol_id, dates, model_name=None):
+        self.conn = conn
+        self.coverage_table = coverage_table
+        self.data_table = data_table
+        self.symbol_id = symbol_id
+        self.model_name = model_name
+        self.bounds = (min(dates), max(dates)) if len(dates) else None
+        self.before = self._count() if self.bounds else 0
+
+    def _key(self):
+        if self.model_name is None:
+            return "symbol_id = ?", [self.symbol_id]
+        return "symbol_id = ? AND model_name = ?", [self.symbol_id, self.model_name]
+
+    def _count(self):
+        where, params = self._key()
+        return self.conn.execute(
+            f"SELECT COUNT(*) FROM {self.data_table} WHERE {where} AND date BETWEEN ? AND ?",
+            params + list(self.bounds)
+        ).fetchone()[0]
+
+    def apply(self):
+        if self.bounds is None:
+            return
+        added = self._count() - self.before
+        key_cols = "symbol_id" if self.model_name is None else "symbol_id, model_name"
+        key_params = self._key()[1]
+        self.conn.execute(f"""
+            INSERT INTO {self.coverage_table} ({key_cols}, n_rows, min_date, max_date)
+            VALUES ({",".join(["?"] * len(key_params))}, ?, ?, ?)
+            ON CONFLICT({key_cols}) DO UPDATE SET
+                n_rows = n_rows + excluded.n_rows,
+                min_date = MIN(min_date, excluded.min_date),
+                max_date = MAX(max_date, excluded.max_date)
+        """, key_params + [added] + list(self.bounds))
+
+
+def rebuild_coverage(conn: sqlite3.Connection) -> None:
+    """Recompute the coverage summary tables with one full scan of prices and predictions."""
+    conn.execute("DELETE FROM price_coverage")
+    conn.execute("""
+        INSERT INTO price_coverage (symbol_id, n_rows, min_date, max_date)
+        SELECT symbol_id, COUNT(*), MIN(date), MAX(date) FROM prices GROUP BY symbol_id
+    """)
+    conn.execute("DELETE FROM prediction_coverage")
+    conn.execute("""
+        INSERT INTO prediction_coverage (symbol_id, model_name, n_rows, min_date, max_date)
+        SELECT symbol_id, model_name, COUNT(*), MIN(date), MAX(date)
+        FROM predictions GROUP BY symbol_id, model_name
+    """)
     conn.commit()
+    logger.info("Coverage summary tables rebuilt")
 
 
+@instrument(rows="features_df")
 def insert_features(conn: sqlite3.Connection, symbol_id: int, features_df: pd.DataFrame) -> None:
     """Insert or replace feature data."""
     feature_cols = [
@@ -77,87 +167,179 @@ def insert_features(conn: sqlite3.Connection, symbol_id: int, features_df: pd.Da
         "macd_histogram", "lag_return_1", "lag_return_2", "lag_return_5"
     ]
     
-    for _, row in features_df.iterrows():
-        date_val = row["date"]
-        if hasattr(date_val, 'strftime'):
-            date_val = date_val.strftime("%Y-%m-%d")
-        elif isinstance(date_val, pd.Timestamp):
-            date_val = date_val.strftime("%Y-%m-%d")
-        
-        values = [symbol_id, date_val]
-        for col in feature_cols[1:]:
-            val = row.get(col)
-            if pd.isna(val):
-                values.append(None)
-            else:
-                values.append(float(val))
-        
-        placeholders = ",".join(["?"] * len(values))
-        cols = "symbol_id,date," + ",".join(feature_cols[1:])
-        
-        conn.execute(f"""
-            INSERT OR REPLACE INTO features ({cols})
-            VALUES ({placeholders})
-        """, tuple(values))
+    dates = _date_strings(features_df["date"])
+    values = _nullable_rows(features_df.astype({col: float for col in feature_cols[1:] if col in features_df}),
+                            feature_cols[1:])
+    cols = "symbol_id,date," + ",".join(feature_cols[1:])
+    conn.executemany(f"""
+        INSERT OR REPLACE INTO features ({cols})
+        VALUES ({",".join(["?"] * (len(feature_cols) + 1))})
+    """, ([symbol_id, date_val] + row for date_val, row in zip(dates, values)))
     conn.commit()
 
 
+@instrument(rows="targets_df")
 def insert_targets(conn: sqlite3.Connection, symbol_id: int, targets_df: pd.DataFrame) -> None:
     """Insert or replace target data."""
-    for _, row in targets_df.iterrows():
-        date_val = row["date"]
-        if hasattr(date_val, 'strftime'):
-            date_val = date_val.strftime("%Y-%m-%d")
-        elif isinstance(date_val, pd.Timestamp):
-            date_val = date_val.strftime("%Y-%m-%d")
-        
-        conn.execute("""
-            INSERT OR REPLACE INTO targets 
-            (symbol_id, date, next_day_return, direction_label)
-            VALUES (?, ?, ?, ?)
-        """, (
-            symbol_id,
-            date_val,
-            float(row["next_day_return"]) if not pd.isna(row["next_day_return"]) else None,
-            int(row["direction_label"])
-        ))
+    dates = _date_strings(targets_df["date"])
+    first_date = min(dates) if dates else None
+    returns = _nullable_rows(targets_df.astype({"next_day_return": float}), ["next_day_return"])
+    labels = targets_df["direction_label"].astype(int).tolist()
+    conn.executemany("""
+        INSERT OR REPLACE INTO targets 
+        (symbol_id, date, next_day_return, direction_label)
+        VALUES (?, ?, ?, ?)
+    """, ((symbol_id, date_val, next_day_return, label)
+          for date_val, (next_day_return,), label in zip(dates, returns, labels)))
+    invalidate_backtests(conn, symbol_id)
+    if first_date is not None:
+        truncate_rolling_metrics(conn, symbol_id, first_date)
     conn.commit()
 
 
+@instrument(rows="predictions_df")
 def insert_predictions(conn: sqlite3.Connection, symbol_id: int, predictions_df: pd.DataFrame, model_name: str) -> None:
     """Insert or replace prediction data."""
-    for _, row in predictions_df.iterrows():
-        date_val = row["date"]
-        if hasattr(date_val, 'strftime'):
-            date_val = date_val.strftime("%Y-%m-%d")
-        elif isinstance(date_val, pd.Timestamp):
-            date_val = date_val.strftime("%Y-%m-%d")
-        
+    dates = _date_strings(predictions_df["date"])
+    if "predicted_direction" in predictions_df:
+        predictions_df = predictions_df.astype({"predicted_direction": "Int64"})
+    values = _nullable_rows(
+        predictions_df, ["predicted_direction", "predicted_return", "prob_up", "prob_flat", "prob_down"]
+    )
+    coverage = _CoverageUpdate(conn, "prediction_coverage", "predictions", symbol_id, dates, model_name)
+    first_date = min(dates) if dates else None
+    conn.executemany("""
+        INSERT OR REPLACE INTO predictions 
+        (symbol_id, date, model_name, predicted_direction, predicted_return,
+         prob_up, prob_flat, prob_down)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, ([symbol_id, date_val, model_name] + row for date_val, row in zip(dates, values)))
+    coverage.apply()
+    invalidate_backtests(conn, symbol_id, model_name)
+    if first_date is not None:
+        truncate_rolling_metrics(conn, symbol_id, first_date, model_name)
+    conn.commit()
+
+
+def invalidate_backtests(conn: sqlite3.Connection, symbol_id: int, model_name: Optional[str] = None) -> None:
+    """
+    Bump the predictions version and drop cached backtests for a symbol.
+
+    Called whenever predictions (one model) or targets (every model) of the
+    symbol are rewritten. The caller commits.
+    """
+    if model_name is not None:
         conn.execute("""
-            INSERT OR REPLACE INTO predictions 
-            (symbol_id, date, model_name, predicted_direction, predicted_return,
-             prob_up, prob_flat, prob_down)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            symbol_id,
-            date_val,
-            model_name,
-            int(row.get("predicted_direction")) if pd.notna(row.get("predicted_direction")) else None,
-            float(row.get("predicted_return")) if pd.notna(row.get("predicted_return")) else None,
-            float(row.get("prob_up")) if pd.notna(row.get("prob_up")) else None,
-            float(row.get("prob_flat")) if pd.notna(row.get("prob_flat")) else None,
-            float(row.get("prob_down")) if pd.notna(row.get("prob_down")) else None
-        ))
+            INSERT INTO prediction_versions (symbol_id, model_name) VALUES (?, ?)
+            ON CONFLICT(symbol_id, model_name)
+            DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+        """, (symbol_id, model_name))
+        conn.execute("DELETE FROM backtests WHERE symbol_id = ? AND model_name = ?", (symbol_id, model_name))
+    else:
+        conn.execute("""
+            UPDATE prediction_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+            WHERE symbol_id = ?
+        """, (symbol_id,))
+        conn.execute("DELETE FROM backtests WHERE symbol_id = ?", (symbol_id,))
+
+
+def truncate_rolling_metrics(
+    conn: sqlite3.Connection,
+    symbol_id: int,
+    start_date: str,
+    model_name: Optional[str] = None
+) -> None:
+    """
+    Drop stored rolling metrics from ``start_date`` on for a symbol.
+
+    Rows before ``start_date`` are unaffected by a rewrite from that date,
+    so the next incremental update resumes from the last kept row. The
+    caller commits.
+    """
+    query = "DELETE FROM rolling_metrics WHERE symbol_id = ? AND date >= ?"
+    params = [symbol_id, start_date]
+    if model_name is not None:
+        query += " AND model_name = ?"
+        params.append(model_name)
+    conn.execute(query, params)
+
+
+def get_prediction_version(conn: sqlite3.Connection, symbol_id: int, model_name: str) -> int:
+    """Current predictions version of a (symbol, model) pair, 0 if never written."""
+    row = conn.execute(
+        "SELECT version FROM prediction_versions WHERE symbol_id = ? AND model_name = ?",
+        (symbol_id, model_name)
+    ).fetchone()
+    return row[0] if row else 0
+
+
+def insert_backtest(conn: sqlite3.Connection, backtest: dict) -> None:
+    """Insert or replace one cached backtest result."""
+    insert_backtests(conn, [backtest])
+
+
+@instrument(rows="backtests")
+def insert_backtests(conn: sqlite3.Connection, backtests: List[dict]) -> None:
+    """Insert or replace cached backtest results in one transaction."""
+    cols = [
+        "cache_key", "symbol_id", "model_name", "start_date", "end_date", "params",
+        "predictions_version", "n_days", "total_return", "buy_hold_return",
+        "sharpe_ratio", "max_drawdown", "curves"
+    ]
+    conn.executemany(f"""
+        INSERT OR REPLACE INTO backtests ({",".join(cols)})
+        VALUES ({",".join(["?"] * len(cols))})
+    """, [tuple(backtest.get(col) for col in cols) for backtest in backtests])
     conn.commit()
 
 
+def insert_walk_forward_folds(conn: sqlite3.Connection, folds_df: pd.DataFrame) -> None:
+    """Insert or replace per-fold walk-forward metrics."""
+    cols = [
+        "run_id", "model_name", "fold", "mode", "train_start", "train_end",
+        "test_start", "test_end", "n_train", "n_test", "accuracy", "log_loss",
+        "mean_strategy_return", "fit_seconds"
+    ]
+    rows = [
+        tuple(None if pd.isna(row[col]) else row[col] for col in cols)
+        for row in folds_df[cols].astype(object).to_dict("records")
+    ]
+    conn.executemany(f"""
+        INSERT OR REPLACE INTO walk_forward_folds ({",".join(cols)})
+        VALUES ({",".join(["?"] * len(cols))})
+    """, rows)
+    conn.commit()
+
+
+def insert_hyperparameter_trial(conn: sqlite3.Connection, trial: dict) -> None:
+    """Insert or replace one hyperparameter search trial result."""
+    cols = [
+        "study", "trial", "model_type", "params", "status", "val_accuracy",
+        "val_loss", "epochs", "runtime_seconds", "error"
+    ]
+    conn.execute(f"""
+        INSERT OR REPLACE INTO hyperparameter_trials ({",".join(cols)})
+        VALUES ({",".join(["?"] * len(cols))})
+    """, tuple(trial.get(col) for col in cols))
+    conn.commit()
+
+
+@instrument()
 def query_features_and_targets(
     conn: sqlite3.Connection,
     ticker: Optional[str] = None,
     start_date: Optional[str] = None,
-    end_date: Optional[str] = None
+    end_date: Optional[str] = None,
+    dtype: Optional[str] = None
 ) -> pd.DataFrame:
-    """Query features and targets joined together."""
+    """
+    Query features and targets joined together.
+    
+    Feature columns are float64 unless ``dtype`` is given; the dataset
+    builders pass ``MODEL_DTYPE`` to read them directly as float32.
+    ``next_day_return`` always stays float64 so that backtests and return
+    metrics do not lose precision.
+    """
     query = """
         SELECT 
             s.ticker,
@@ -186,7 +368,8 @@ def query_features_and_targets(
     
     query += " ORDER BY s.ticker, f.date"
     
-    df = pd.read_sql_query(query, conn, params=params)
+    dtypes = {col: dtype for col in FEATURE_FLOAT_COLS} if dtype else None
+    df = pd.read_sql_query(query, conn, params=params, dtype=dtypes)
     if not df.empty:
         df["date"] = pd.to_datetime(df["date"])
     return df
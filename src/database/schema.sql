@@ -64,8 +64,139 @@ CREATE TABLE IF NOT EXISTS predictions (
     UNIQUE(symbol_id, date, model_name)
 );
 
+CREATE TABLE IF NOT EXISTS walk_forward_folds (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    model_name TEXT NOT NULL,
+    fold INTEGER NOT NULL,
+    mode TEXT NOT NULL,
+    train_start DATE,
+    train_end DATE,
+    test_start DATE,
+    test_end DATE,
+    n_train INTEGER,
+    n_test INTEGER,
+    accuracy REAL,
+    log_loss REAL,
+    mean_strategy_return REAL,
+    fit_seconds REAL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(run_id, model_name, fold)
+);
+
+CREATE TABLE IF NOT EXISTS hyperparameter_trials (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    study TEXT NOT NULL,
+    trial INTEGER NOT NULL,
+    model_type TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    val_accuracy REAL,
+    val_loss REAL,
+    epochs INTEGER,
+    runtime_seconds REAL,
+    error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(study, trial)
+);
+
+CREATE TABLE IF NOT EXISTS hyperparameter_trial_epochs (
+    study TEXT NOT NULL,
+    trial INTEGER NOT NULL,
+    epoch INTEGER NOT NULL,
+    val_loss REAL NOT NULL,
+    PRIMARY KEY (study, trial, epoch)
+);
+
+CREATE TABLE IF NOT EXISTS prediction_versions (
+    symbol_id INTEGER NOT NULL,
+    model_name TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (symbol_id) REFERENCES symbols(id),
+    PRIMARY KEY (symbol_id, model_name)
+);
+
+CREATE TABLE IF NOT EXISTS backtests (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    cache_key TEXT UNIQUE NOT NULL,
+    symbol_id INTEGER NOT NULL,
+    model_name TEXT NOT NULL,
+    start_date DATE,
+    end_date DATE,
+    params TEXT NOT NULL,
+    predictions_version INTEGER NOT NULL,
+    n_days INTEGER,
+    total_return REAL,
+    buy_hold_return REAL,
+    sharpe_ratio REAL,
+    max_drawdown REAL,
+    curves BLOB,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (symbol_id) REFERENCES symbols(id)
+);
+
+CREATE TABLE IF NOT EXISTS rolling_metrics (
+    symbol_id INTEGER NOT NULL,
+    model_name TEXT NOT NULL,
+    window_days INTEGER NOT NULL,
+    date DATE NOT NULL,
+    rolling_sharpe REAL,
+    rolling_volatility REAL,
+    rolling_hit_rate REAL,
+    equity REAL NOT NULL,
+    drawdown REAL NOT NULL,
+    FOREIGN KEY (symbol_id) REFERENCES symbols(id),
+    PRIMARY KEY (symbol_id, model_name, window_days, date)
+);
+
+CREATE TABLE IF NOT EXISTS prediction_coverage (
+    symbol_id INTEGER NOT NULL,
+    model_name TEXT NOT NULL,
+    n_rows INTEGER NOT NULL,
+    min_date DATE,
+    max_date DATE,
+    FOREIGN KEY (symbol_id) REFERENCES symbols(id),
+    PRIMARY KEY (symbol_id, model_name)
+);
+
+CREATE TABLE IF NOT EXISTS price_coverage (
+    symbol_id INTEGER PRIMARY KEY,
+    n_rows INTEGER NOT NULL,
+    min_date DATE,
+    max_date DATE,
+    FOREIGN KEY (symbol_id) REFERENCES symbols(id)
+);
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    stages TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    stage TEXT,
+    stage_index INTEGER NOT NULL DEFAULT 0,
+    progress REAL NOT NULL DEFAULT 0,
+    rows_processed INTEGER NOT NULL DEFAULT 0,
+    epoch INTEGER,
+    message TEXT,
+    error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS pipeline_stages (
+    name TEXT PRIMARY KEY,
+    input_hash TEXT NOT NULL,
+    output_hash TEXT NOT NULL,
+    rows_processed INTEGER,
+    seconds REAL,
+    finished_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 CREATE INDEX IF NOT EXISTS idx_prices_symbol_date ON prices(symbol_id, date);
 CREATE INDEX IF NOT EXISTS idx_features_symbol_date ON features(symbol_id, date);
 CREATE INDEX IF NOT EXISTS idx_targets_symbol_date ON targets(symbol_id, date);
 CREATE INDEX IF NOT EXISTS idx_predictions_symbol_date ON predictions(symbol_id, date);
-
+CREATE INDEX IF NOT EXISTS idx_predictions_symbol_model_date ON predictions(symbol_id, model_name, date);
+CREATE INDEX IF NOT EXISTS idx_backtests_symbol_model ON backtests(symbol_id, model_name);
@@ -0,0 +1,319 @@
+"""Timing, CPU, row and memory instrumentation for the pipeline's hot paths.
+
+Functions decorated with ``instrument`` and blocks wrapped in ``stage``
+record, per name:
+
+- calls, wall time and process CPU time (CPU time is process-wide, so
+  stages running concurrently in threads share it);
+- rows processed: an ``int`` result, the length of a frame, array or list
+  result (the first item of a tuple), or what the ``rows`` argument of
+  ``instrument`` selects;
+- the process's peak RSS at the end of the stage and how much the stage
+  raised it.
+
+Instrumentation is off by default and costs one flag check per call. Turn
+it on with ``enable`` or for any script with environment variables::
+
+    STOCKLY_REPORT=run.json python -m src.pipeline.run_pipeline
+    STOCKLY_REPORT=run.json STOCKLY_PROFILE=1 python -m src.models.train_baseline_models
+
+With profiling on, every outermost stage of each thread runs under
+cProfile; the merged profile is saved next to the report (``.prof``, for
+``snakeviz`` or ``pstats``) and its top functions are included in it.
+
+Reports are JSON and can be compared across runs::
+
+    python -m src.instrumentation run.json
+    python -m src.instrumentation before.json after.json
+"""
+
+import atexit
+import functools
+import inspect
+import json
+import logging
+import os
+import platform
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+REPORT_ENV = "STOCKLY_REPORT"
+PROFILE_ENV = "STOCKLY_PROFILE"
+PROFILE_TOP_FUNCTIONS = 30
+STAT_FIELDS = ["calls", "wall_seconds", "cpu_seconds", "rows", "peak_rss_mb", "rss_growth_mb"]
+
+_enabled = False
+_profile = False
+_started = {"wall": 0.0, "cpu": 0.0}
+_stats: Dict[str, Dict] = {}
+_profiles = []
+_lock = threading.Lock()
+_local = threading.local()
+
+
+class StageRecord:
+    """Handle yielded by ``stage``; add the rows the block processes to ``rows``."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.rows = 0
+
+
+def peak_rss_mb() -> Optional[float]:
+    """High-water mark of this process's resident memory, in MB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def enable(profile: bool = False) -> None:
+    """Start recording (and with ``profile``, profiling), discarding earlier records."""
+    global _enabled, _profile
+    with _lock:
+        _stats.clear()
+        _profiles.clear()
+    _started.update(wall=time.perf_counter(), cpu=time.process_time())
+    _enabled, _profile = True, profile
+
+
+def disable() -> None:
+    global _enabled, _profile
+    _enabled, _profile = False, False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def _record(name: str, wall: float, cpu: float, rows: int, rss_before: Optional[float]) -> None:
+    rss_after = peak_rss_mb()
+    with _lock:
+        stats = _stats.setdefault(name, dict.fromkeys(STAT_FIELDS, 0))
+        stats["calls"] += 1
+        stats["wall_seconds"] += wall
+        stats["cpu_seconds"] += cpu
+        stats["rows"] += rows
+        if rss_after is not None:
+            stats["peak_rss_mb"] = max(stats["peak_rss_mb"], rss_after)
+            stats["rss_growth_mb"] += rss_after - rss_before
+
+
+@contextmanager
+def stage(name: str):
+    """
+    Record a block as one call of ``name``.
+
+    Example:
+        with stage("pipeline.train_lstm") as record:
+            record.rows += train(...)
+    """
+    record = StageRecord(name)
+    if not _enabled:
+        yield record
+        return
+
+    depth = getattr(_local, "depth", 0)
+    profiler = None
+    if _profile and depth == 0:
+        import cProfile
+        profiler = cProfile.Profile()
+
+    _local.depth = depth + 1
+    rss_before = peak_rss_mb()
+    wall, cpu = time.perf_counter(), time.process_time()
+    if profiler is not None:
+        try:
+            profiler.enable()
+        except ValueError:  # another profiler is active (Python 3.12+ allows only one)
+            profiler = None
+    try:
+        yield record
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            with _lock:
+                _profiles.append(profiler)
+        _local.depth = depth
+        _record(name, time.perf_counter() - wall, time.process_time() - cpu, record.rows, rss_before)
+
+
+def count_rows(value) -> int:
+    """Rows in a function result: ints as is, else the length of a frame, array or list."""
+    if isinstance(value, tuple) and value:
+        value = value[0]
+    if isinstance(value, bool) or value is None or isinstance(value, (dict, str)):
+        return 0
+    if isinstance(value, int):
+        return value
+    try:
+        return len(value)
+    except TypeError:
+        return 0
+
+
+def instrument(name: Optional[str] = None, rows: Union[None, str, Callable] = None) -> Callable:
+    """
+    Decorator recording each call of a function as a stage.
+
+    Args:
+        name: Stage name (default: ``<module>.<function>``)
+        rows: Name of an argument whose length is the rows processed, or a
+            function of the result; by default rows are counted from the
+            result with ``count_rows``
+    """
+    def decorator(func):
+        module = func.__module__ if func.__module__ != "__main__" else Path(inspect.getfile(func)).stem
+        stage_name = name or f"{module.rsplit('.', 1)[-1]}.{func.__qualname__}"
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with stage(stage_name) as record:
+                result = func(*args, **kwargs)
+                if isinstance(rows, str):
+                    value = signature.bind(*args, **kwargs).arguments.get(rows)
+                    record.rows = len(value) if value is not None else 0
+                else:
+                    record.rows = rows(result) if rows is not None else count_rows(result)
+                return result
+        return wrapper
+    return decorator
+
+
+def _profile_summary(top: int = PROFILE_TOP_FUNCTIONS):
+    import pstats
+
+    with _lock:
+        profilers = list(_profiles)
+    if not profilers:
+        return None, []
+    stats = pstats.Stats(profilers[0])
+    for profiler in profilers[1:]:
+        stats.add(profiler)
+
+    rows = []
+    for (filename, line, function), (_, calls, total, cumulative, _) in stats.stats.items():
+        rows.append({
+            "function": f"{Path(filename).name}:{line}({function})",
+            "calls": calls,
+            "total_seconds": total,
+            "cumulative_seconds": cumulative,
+        })
+    rows.sort(key=lambda row: row["cumulative_seconds"], reverse=True)
+    return stats, rows[:top]
+
+
+def report() -> Dict:
+    """The run report: environment, totals since ``enable`` and per-stage stats."""
+    with _lock:
+        stages = {name: dict(stats) for name, stats in _stats.items()}
+    stages = dict(sorted(stages.items(), key=lambda item: item[1]["wall_seconds"], reverse=True))
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "command": " ".join(sys.argv),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "wall_seconds": time.perf_counter() - _started["wall"],
+        "cpu_seconds": time.process_time() - _started["cpu"],
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": stages,
+        "profile": _profile_summary()[1],
+    }
+
+
+def write_report(path: Path) -> Path:
+    """Write ``report()`` to ``path`` and, when profiling, the merged profile next to it."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report(), indent=2))
+    stats, _ = _profile_summary()
+    if stats is not None:
+        stats.dump_stats(path.with_suffix(".prof"))
+    logger.info(f"Instrumentation report written to {path}")
+    return path
+
+
+def load_report(path: Path) -> Dict:
+    return json.loads(Path(path).read_text())
+
+
+def compare_reports(base: Dict, new: Dict) -> List[Dict]:
+    """
+    Stage-by-stage comparison of two reports.
+
+    Returns:
+        One dictionary per stage in either report with the base and new
+        wall time, CPU time, rows and peak RSS and the wall time change in
+        percent, slowest new stages first
+    """
+    rows = []
+    for name in dict.fromkeys(list(new["stages"]) + list(base["stages"])):
+        before, after = base["stages"].get(name), new["stages"].get(name)
+        row = {"stage": name}
+        for field in ["wall_seconds", "cpu_seconds", "rows", "peak_rss_mb"]:
+            row[f"base_{field}"] = before[field] if before else None
+            row[f"new_{field}"] = after[field] if after else None
+        if before and after and before["wall_seconds"] > 0:
+            row["wall_change_pct"] = 100 * (after["wall_seconds"] / before["wall_seconds"] - 1)
+        else:
+            row["wall_change_pct"] = None
+        rows.append(row)
+    return rows
+
+
+def _enable_from_environment() -> None:
+    path = os.environ.get(REPORT_ENV)
+    if path and not _enabled:
+        enable(profile=os.environ.get(PROFILE_ENV, "") not in ("", "0"))
+        atexit.register(write_report, Path(path))
+
+
+_enable_from_environment()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("reports", nargs="+", type=Path, help="A report to show, or a base and a new report")
+    args = parser.parse_args()
+
+    def fmt(value, spec, suffix=""):
+        return "-" if value is None else format(value, spec) + suffix
+
+    if len(args.reports) == 1:
+        run = load_report(args.reports[0])
+        print(f"{run['command']} ({run['created_at']}): {run['wall_seconds']:.1f}s wall, "
+              f"{run['cpu_seconds']:.1f}s CPU, peak RSS {fmt(run['peak_rss_mb'], '.0f')} MB")
+        print(f"{'stage':<52} {'calls':>7} {'wall s':>9} {'cpu s':>9} {'rows':>11} {'peak MB':>8}")
+        for name, stats in run["stages"].items():
+            print(f"{name:<52} {stats['calls']:>7} {stats['wall_seconds']:>9.3f} {stats['cpu_seconds']:>9.3f} "
+                  f"{stats['rows']:>11} {stats['peak_rss_mb']:>8.0f}")
+        for row in run["profile"][:10]:
+            print(f"  {row['cumulative_seconds']:>8.3f}s {row['calls']:>9} {row['function']}")
+    else:
+        base, new = load_report(args.reports[0]), load_report(args.reports[1])
+        print(f"{'stage':<52} {'base s':>9} {'new s':>9} {'change':>9} {'base MB':>8} {'new MB':>8}")
+        for row in compare_reports(base, new):
+            print(f"{row['stage']:<52} {fmt(row['base_wall_seconds'], '.3f'):>9} "
+                  f"{fmt(row['new_wall_seconds'], '.3f'):>9} {fmt(row['wall_change_pct'], '+.1f', '%'):>9} "
+                  f"{fmt(row['base_peak_rss_mb'], '.0f'):>8} "
+                  f"{fmt(row['new_peak_rss_mb'], '.0f'):>8}")
@@ -0,0 +1,200 @@
+"""Model backend plugins with lazily imported frameworks.
+
+Each backend knows how to locate, load and score one kind of saved model.
+Framework imports (joblib/sklearn, TensorFlow) happen inside ``load`` so that
+importing a scoring module only pays for the frameworks it actually uses.
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.config import MODELS_DIR
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class ModelBackend(ABC):
+    """Base class for model backends.
+
+    Subclasses set ``name`` and ``file_suffix`` and must implement ``load``
+    and ``predict_proba``; a backend missing either cannot be instantiated. Probabilities are returned as an (n_samples, 3) array
+    ordered down, flat, up, or None when the model cannot provide them.
+    """
+
+    name = ""
+    file_suffix = ""
+
+    def artifact_path(self, model_name: str, models_dir: Path = MODELS_DIR) -> Path:
+        """Return the path where this backend stores ``model_name``."""
+        return models_dir / f"{model_name}{self.file_suffix}"
+
+    @abstractmethod
+    def load(self, path: Path):
+        """Load a model artifact from disk."""
+
+    @abstractmethod
+    def predict_proba(self, model, X) -> Optional[np.ndarray]:
+        """Return class probabilities ordered down, flat, up."""
+
+    def predict(self, model, X) -> np.ndarray:
+        """Return predicted directions (-1, 0, 1)."""
+        probabilities = self.predict_proba(model, X)
+        return np.argmax(probabilities, axis=1) - 1
+
+
+class SklearnBackend(ModelBackend):
+    """scikit-learn estimators pickled with joblib."""
+
+    name = "sklearn"
+    file_suffix = ".pkl"
+
+    def load(self, path: Path):
+        import joblib
+        return joblib.load(path)
+
+    def predict_proba(self, model, X) -> Optional[np.ndarray]:
+        if not hasattr(model, "predict_proba"):
+            return None
+        probabilities = model.predict_proba(X)
+        if probabilities.shape[1] != 3:
+            return None
+        return probabilities
+
+    def predict(self, model, X) -> np.ndarray:
+        return model.predict(X)
+
+
+class KerasBackend(ModelBackend):
+    """Keras models saved in HDF5 format."""
+
+    name = "keras"
+    file_suffix = ".h5"
+
+    def load(self, path: Path):
+        from tensorflow import keras
+        return keras.models.load_model(path)
+
+    def predict_proba(self, model, X) -> Optional[np.ndarray]:
+        return model.predict(X)
+
+
+class NumpyLSTMBackend(ModelBackend):
+    """LSTM weights exported to ``.npz`` and scored with pure NumPy."""
+
+    name = "numpy"
+    file_suffix = ".npz"
+
+    def load(self, path: Path):
+        from src.models.lstm_numpy import NumpyLSTMModel
+        return NumpyLSTMModel.load(path)
+
+    def predict_proba(self, model, X) -> Optional[np.ndarray]:
+        return model.predict(X)
+
+
+class TFLiteBackend(ModelBackend):
+    """Quantized TFLite exports of the LSTM (``<name>_<quantization>.tflite``)."""
+
+    def __init__(self, quantization: str):
+        self.quantization = quantization
+        self.name = f"tflite_{quantization}"
+        self.file_suffix = f"_{quantization}.tflite"
+
+    def load(self, path: Path):
+        from src.models.tflite_export import TFLiteModel
+        return TFLiteModel(path)
+
+    def predict_proba(self, model, X) -> Optional[np.ndarray]:
+        return model.predict(X)
+
+
+class LoadedModel:
+    """A loaded model bound to the backend that knows how to score it."""
+
+    def __init__(self, name: str, backend: ModelBackend, model, path: Path):
+        self.name = name
+        self.backend = backend
+        self.model = model
+        self.path = path
+
+    def predict_proba(self, X) -> Optional[np.ndarray]:
+        return self.backend.predict_proba(self.model, X)
+
+    def predict(self, X) -> np.ndarray:
+        return self.backend.predict(self.model, X)
+
+
+_BACKENDS: Dict[str, ModelBackend] = {}
+
+
+def register_backend(backend: ModelBackend) -> ModelBackend:
+    """Register a backend under its ``name``, replacing any existing one."""
+    if not backend.name:
+        raise ValueError("Backend must define a name")
+    _BACKENDS[backend.name] = backend
+    return backend
+
+
+def get_backend(name: str) -> ModelBackend:
+    """Look up a registered backend by name."""
+    if name not in _BACKENDS:
+        raise ValueError(f"Unknown model backend: {name}. Available: {available_backends()}")
+    return _BACKENDS[name]
+
+
+def available_backends() -> List[str]:
+    """Names of registered backends in registration order."""
+    return list(_BACKENDS)
+
+
+def resolve_backend(
+    model_name: str,
+    backend: Optional[str] = None,
+    models_dir: Path = MODELS_DIR
+) -> Optional[ModelBackend]:
+    """
+    Find the backend to use for ``model_name``.
+
+    Args:
+        model_name: Artifact name without suffix (e.g. "random_forest")
+        backend: Backend name to force; otherwise the first registered backend
+            with an existing artifact is used
+        models_dir: Directory holding model artifacts
+
+    Returns:
+        The matching backend, or None if no artifact exists
+    """
+    candidates = [get_backend(backend)] if backend else list(_BACKENDS.values())
+    for candidate in candidates:
+        if candidate.artifact_path(model_name, models_dir).exists():
+            return candidate
+    return None
+
+
+def load_model(
+    model_name: str,
+    backend: Optional[str] = None,
+    models_dir: Path = MODELS_DIR
+) -> Optional[LoadedModel]:
+    """Load ``model_name`` through its backend, or return None if it is missing."""
+    resolved = resolve_backend(model_name, backend, models_dir)
+    if resolved is None:
+        logger.warning(f"Model not found: {model_name} (backend={backend or 'any'}) in {models_dir}")
+        return None
+
+    path = resolved.artifact_path(model_name, models_dir)
+    model = resolved.load(path)
+    logger.info(f"Loaded {model_name} with {resolved.name} backend from {path}")
+    return LoadedModel(model_name, resolved, model, path)
+
+
+register_backend(SklearnBackend())
+register_backend(NumpyLSTMBackend())
+register_backend(KerasBackend())
+register_backend(TFLiteBackend("float16"))
+register_backend(TFLiteBackend("int8"))
@@ -0,0 +1,336 @@
+"""Persisted backtest results.
+
+``cached_backtest_model`` serves ``backtest_model`` results from the
+``backtests`` table. Entries are keyed by (ticker, model, date range,
+strategy parameters, predictions version) and store the summary metrics
+plus a compact float32 copy of the equity curves. Rewriting a pair's
+predictions (or a ticker's targets) bumps its version in
+``prediction_versions`` and deletes its cached rows, so a stale result is
+never served.
+
+Full-range entries (no date bounds) double as the per-pair summary table
+of the app's dashboard: ``fill_backtest_cache`` computes the missing ones
+for many pairs at once with ``backtest_matrix``, and
+``query_backtest_summaries`` pages through them with sorting done in SQL.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import sqlite3
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.database.db_utils import (
+    get_connection, get_prediction_version, initialize_schema, insert_backtest, insert_backtests
+)
+from src.models.matrix_backtest import backtest_matrix, load_backtest_panel
+from src.models.time_series_backtest import backtest_model
+from src.instrumentation import instrument
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKTEST_PARAMS = {"strategy": "direction", "initial_capital": 10000.0}
+SUMMARY_METRICS = ["total_return", "buy_hold_return", "sharpe_ratio", "max_drawdown"]
+SUMMARY_SORT_COLUMNS = ["ticker", "model_name", "n_days"] + SUMMARY_METRICS
+FILL_CHUNK_TICKERS = 200
+
+
+def backtest_cache_key(
+    ticker: str,
+    model_name: str,
+    start_date: Optional[str],
+    end_date: Optional[str],
+    params: Dict,
+    predictions_version: int
+) -> str:
+    """Stable hash of everything a backtest result depends on."""
+    payload = json.dumps(
+        [ticker, model_name, start_date, end_date, params, predictions_version],
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def encode_curves(results: Dict) -> bytes:
+    """Pack dates and equity curves as a compressed float32 .npz blob."""
+    buffer = io.BytesIO()
+    np.savez_compressed(
+        buffer,
+        dates=np.asarray(results["dates"], dtype="datetime64[D]"),
+        cumulative_returns=np.asarray(results["cumulative_returns"], dtype=np.float32),
+        buy_hold_value=np.asarray(results["buy_hold_value"], dtype=np.float32),
+    )
+    return buffer.getvalue()
+
+
+def decode_curves(blob: bytes, initial_capital: float) -> Dict:
+    """Inverse of ``encode_curves``, in the shape ``backtest_model`` returns."""
+    with np.load(io.BytesIO(blob)) as data:
+        cumulative_returns = data["cumulative_returns"].astype(np.float64)
+        return {
+            "dates": data["dates"].astype("datetime64[ns]"),
+            "cumulative_returns": cumulative_returns,
+            "portfolio_value": initial_capital * cumulative_returns,
+            "buy_hold_value": data["buy_hold_value"].astype(np.float64),
+        }
+
+
+def cached_backtest_model(
+    ticker: str,
+    model_name: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    conn: Optional[sqlite3.Connection] = None,
+    refresh: bool = False
+) -> Dict:
+    """
+    ``backtest_model`` with a persistent result cache.
+
+    Args:
+        ticker: Ticker symbol
+        model_name: Prediction model name
+        start_date: First prediction date (inclusive)
+        end_date: Last prediction date (inclusive)
+        conn: Connection to use (default: open one on the default database)
+        refresh: Recompute and overwrite even if a cached result exists
+
+    Returns:
+        Backtest results with summary metrics and the equity curves as
+        arrays, plus ``cached`` telling whether they came from the table;
+        empty if there are no predictions
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    try:
+        symbol = conn.execute("SELECT id FROM symbols WHERE ticker = ?", (ticker,)).fetchone()
+        if symbol is None:
+            logger.warning(f"Unknown ticker: {ticker}")
+            return {}
+        symbol_id = symbol[0]
+
+        params = DEFAULT_BACKTEST_PARAMS
+        version = get_prediction_version(conn, symbol_id, model_name)
+        key = backtest_cache_key(ticker, model_name, start_date, end_date, params, version)
+
+        if not refresh:
+            row = conn.execute(
+                f"SELECT {', '.join(SUMMARY_METRICS)}, curves FROM backtests WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                results = {metric: row[metric] for metric in SUMMARY_METRICS}
+                results.update(decode_curves(row["curves"], params["initial_capital"]))
+                results.update({"ticker": ticker, "model_name": model_name, "cached": True})
+                logger.info(f"Serving cached backtest for {ticker} ({model_name})")
+                return results
+
+        results = backtest_model(ticker, model_name, start_date, end_date, conn=conn)
+        if not results:
+            return {}
+
+        insert_backtest(conn, {
+            "cache_key": key,
+            "symbol_id": symbol_id,
+            "model_name": model_name,
+            "start_date": start_date,
+            "end_date": end_date,
+            "params": json.dumps(params, sort_keys=True),
+            "predictions_version": version,
+            "n_days": len(results["dates"]),
+            **{metric: float(results[metric]) for metric in SUMMARY_METRICS},
+            "curves": encode_curves(results),
+        })
+        results["cached"] = False
+        return results
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def clear_backtest_cache(conn: Optional[sqlite3.Connection] = None) -> int:
+    """Delete every cached backtest and return how many were removed."""
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    deleted = conn.execute("DELETE FROM backtests").rowcount
+    conn.commit()
+    if own_conn:
+        conn.close()
+    return deleted
+
+
+def missing_summaries(conn: sqlite3.Connection, tickers: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Pairs with predictions but no full-range cached backtest for their current version.
+
+    Returns:
+        DataFrame with ticker, symbol_id, model_name, version and cache_key
+    """
+    pairs = pd.read_sql_query("""
+        SELECT s.ticker, c.symbol_id, c.model_name, COALESCE(v.version, 0) AS version
+        FROM prediction_coverage c
+        JOIN symbols s ON c.symbol_id = s.id
+        LEFT JOIN prediction_versions v ON c.symbol_id = v.symbol_id AND c.model_name = v.model_name
+        WHERE c.n_rows > 0
+        ORDER BY s.ticker, c.model_name
+    """, conn)
+    if tickers:
+        pairs = pairs[pairs["ticker"].isin(tickers)]
+    pairs["cache_key"] = [
+        backtest_cache_key(ticker, model_name, None, None, DEFAULT_BACKTEST_PARAMS, version)
+        for ticker, model_name, version in pairs[["ticker", "model_name", "version"]].itertuples(index=False)
+    ]
+    stored = {row[0] for row in conn.execute(
+        "SELECT cache_key FROM backtests WHERE start_date IS NULL AND end_date IS NULL"
+    )}
+    return pairs[~pairs["cache_key"].isin(stored)].reset_index(drop=True)
+
+
+@instrument()
+def fill_backtest_cache(
+    tickers: Optional[List[str]] = None,
+    conn: Optional[sqlite3.Connection] = None,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> int:
+    """
+    Store full-range backtests for every pair that has none yet.
+
+    Tickers are processed ``FILL_CHUNK_TICKERS`` at a time: one panel query
+    and one ``backtest_matrix`` pass per chunk, then one bulk insert.
+
+    Args:
+        tickers: Restrict to these tickers (default: all)
+        conn: Connection to use (default: open one on the default database)
+        progress: Called with (pairs stored so far, pairs missing)
+
+    Returns:
+        Number of backtests stored
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+
+    missing = missing_summaries(conn, tickers)
+    wanted = {(row.ticker, row.model_name): row for row in missing.itertuples(index=False)}
+    missing_tickers = missing["ticker"].unique().tolist()
+    params = json.dumps(DEFAULT_BACKTEST_PARAMS, sort_keys=True)
+    stored = 0
+
+    for start in range(0, len(missing_tickers), FILL_CHUNK_TICKERS):
+        chunk = missing_tickers[start:start + FILL_CHUNK_TICKERS]
+        panel = load_backtest_panel(chunk, conn=conn)
+        if panel["columns"].empty:
+            continue
+        results = backtest_matrix(panel["positions"], panel["returns"], panel["mask"],
+                                  DEFAULT_BACKTEST_PARAMS["initial_capital"])
+
+        entries = []
+        for j, key in enumerate(panel["columns"][["ticker", "model_name"]].itertuples(index=False, name=None)):
+            pair = wanted.get(key)
+            if pair is None:
+                continue
+            mask = panel["mask"][:, j]
+            entries.append({
+                "cache_key": pair.cache_key,
+                "symbol_id": pair.symbol_id,
+                "model_name": pair.model_name,
+                "params": params,
+                "predictions_version": pair.version,
+                "n_days": int(mask.sum()),
+                **{metric: float(results[metric][j]) for metric in SUMMARY_METRICS},
+                "curves": encode_curves({
+                    "dates": panel["dates"][mask],
+                    "cumulative_returns": results["cumulative_returns"][mask, j],
+                    "buy_hold_value": results["buy_hold_value"][mask, j],
+                }),
+            })
+        insert_backtests(conn, entries)
+        stored += len(entries)
+        if progress is not None:
+            progress(stored, len(missing))
+
+    if own_conn:
+        conn.close()
+    logger.info(f"Stored {stored} full-range backtests")
+    return stored
+
+
+def query_backtest_summaries(
+    conn: sqlite3.Connection,
+    search: Optional[str] = None,
+    model_names: Optional[List[str]] = None,
+    sort_by: str = "sharpe_ratio",
+    descending: bool = True,
+    limit: int = 50,
+    offset: int = 0
+) -> Tuple[int, pd.DataFrame]:
+    """
+    One page of full-range backtest summaries, filtered and sorted in SQL.
+
+    Args:
+        conn: Database connection
+        search: Ticker prefix (case-insensitive)
+        model_names: Restrict to these models
+        sort_by: One of ``SUMMARY_SORT_COLUMNS``; NULLs sort last
+        descending: Sort direction
+        limit: Page size
+        offset: Rows to skip
+
+    Returns:
+        Total number of matching rows and the page as a DataFrame
+    """
+    if sort_by not in SUMMARY_SORT_COLUMNS:
+        raise ValueError(f"Unknown sort column: {sort_by}. Use one of {SUMMARY_SORT_COLUMNS}")
+
+    where = "b.start_date IS NULL AND b.end_date IS NULL AND b.params = ?"
+    params: list = [json.dumps(DEFAULT_BACKTEST_PARAMS, sort_keys=True)]
+    if search:
+        where += " AND s.ticker LIKE ?"
+        params.append(search.upper() + "%")
+    if model_names:
+        where += f" AND b.model_name IN ({','.join('?' * len(model_names))})"
+        params.extend(model_names)
+
+    from_clause = f"FROM backtests b JOIN symbols s ON b.symbol_id = s.id WHERE {where}"
+    total = conn.execute(f"SELECT COUNT(*) {from_clause}", params).fetchone()[0]
+
+    column = "s.ticker" if sort_by == "ticker" else f"b.{sort_by}"
+    direction = "DESC" if descending else "ASC"
+    page = pd.read_sql_query(f"""
+        SELECT s.ticker, b.model_name, b.n_days, {', '.join(f'b.{metric}' for metric in SUMMARY_METRICS)}
+        {from_clause}
+        ORDER BY {column} {direction} NULLS LAST, s.ticker, b.model_name
+        LIMIT ? OFFSET ?
+    """, conn, params=params + [limit, offset])
+    return total, page
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("ticker", nargs="?")
+    parser.add_argument("--model", default="lstm_model")
+    parser.add_argument("--start", default=None)
+    parser.add_argument("--end", default=None)
+    parser.add_argument("--refresh", action="store_true", help="Recompute even if cached")
+    parser.add_argument("--clear", action="store_true", help="Delete all cached backtests")
+    parser.add_argument("--fill", action="store_true", help="Store full-range backtests of all pairs")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    initialize_schema(conn)
+    if args.clear:
+        logger.info(f"Deleted {clear_backtest_cache(conn)} cached backtests")
+    if args.fill:
+        fill_backtest_cache(conn=conn)
+    if args.ticker:
+        results = cached_backtest_model(args.ticker, args.model, args.start, args.end, conn=conn, refresh=args.refresh)
+        for metric in SUMMARY_METRICS + ["cached"]:
+            print(f"{metric}: {results.get(metric)}")
+    conn.close()
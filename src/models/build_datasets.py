@@ -3,19 +3,32 @@
 import logging
 import pandas as pd
 import numpy as np
+from pathlib import Path
 from typing import Tuple, Optional
 
 from src.database.db_utils import get_connection, query_features_and_targets
+from src.config import DB_PATH, MODEL_DTYPE
+from src.instrumentation import instrument
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+FEATURE_COLS = [
+    "return_1d", "return_5d", "volatility_10d", "volatility_20d",
+    "sma_10", "sma_20", "sma_50", "rsi_14",
+    "macd", "macd_signal", "macd_histogram",
+    "lag_return_1", "lag_return_2", "lag_return_5"
+]
 
+
+@instrument(rows=lambda result: len(result[0]) + len(result[2]))
 def build_tabular_dataset(
     ticker: Optional[str] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    train_split_date: Optional[str] = None
+    train_split_date: Optional[str] = None,
+    dtype: str = MODEL_DTYPE,
+    db_path: Path = DB_PATH
 ) -> Tuple[pd.DataFrame, pd.Series, pd.DataFrame, pd.Series]:
     """
     Build tabular dataset for baseline models.
@@ -23,19 +36,14 @@ def build_tabular_dataset(
     Returns:
         X_train, y_train, X_test, y_test
     """
-    conn = get_connection()
-    df = query_features_and_targets(conn, ticker, start_date, end_date)
+    conn = get_connection(db_path)
+    df = query_features_and_targets(conn, ticker, start_date, end_date, dtype=dtype)
     conn.close()
     
     if df.empty:
         raise ValueError("No data found for given parameters")
     
-    feature_cols = [
-        "return_1d", "return_5d", "volatility_10d", "volatility_20d",
-        "sma_10", "sma_20", "sma_50", "rsi_14",
-        "macd", "macd_signal", "macd_histogram",
-        "lag_return_1", "lag_return_2", "lag_return_5"
-    ]
+    feature_cols = FEATURE_COLS
     
     df = df.dropna(subset=feature_cols + ["direction_label"])
     
@@ -3,39 +3,59 @@
 import logging
 import pandas as pd
 import numpy as np
-import joblib
 from pathlib import Path
 from typing import Optional
 
-import tensorflow as tf
-from tensorflow import keras
-
-from src.database.db_utils import get_connection, get_or_create_symbol, insert_predictions, query_features_and_targets
-from src.models.build_datasets import build_tabular_dataset
+from src.database.db_utils import (
+    get_connection, get_or_create_symbol, initialize_schema, insert_predictions, query_features_and_targets
+)
+from src.models.backends import LoadedModel, load_model
 from src.models.sequence_dataset import build_sequence_dataset
-from src.config import MODELS_DIR, LSTM_LOOKBACK_WINDOW
+from src.config import DB_PATH, MODELS_DIR, MODEL_DTYPE, LSTM_LOOKBACK_WINDOW
+from src.instrumentation import instrument
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def generate_baseline_predictions(ticker: str, model_name: str, start_date: Optional[str] = None, end_date: Optional[str] = None):
-    """Generate predictions using baseline model."""
-    model_path = MODELS_DIR / f"{model_name}.pkl"
-    
-    if not model_path.exists():
-        logger.warning(f"Model not found: {model_path}")
-        return
+@instrument()
+def generate_baseline_predictions(
+    ticker: str,
+    model_name: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    model: Optional[LoadedModel] = None,
+    output_name: Optional[str] = None,
+    db_path: Path = DB_PATH
+) -> int:
+    """
+    Generate predictions using baseline model.
+    
+    Args:
+        ticker: Stock ticker symbol
+        model_name: Saved model to load from MODELS_DIR
+        start_date: First date to score
+        end_date: Last date to score
+        model: Already loaded model to use instead of ``model_name``
+        output_name: Model name stored with the predictions (default: ``model_name``)
+        db_path: Database to read features from and write predictions to
+
+    Returns:
+        Number of predictions stored
+    """
+    if model is None:
+        model = load_model(model_name, backend="sklearn")
     
-    model = joblib.load(model_path)
+    if model is None:
+        return 0
     
-    conn = get_connection()
-    df = query_features_and_targets(conn, ticker, start_date, end_date)
+    conn = get_connection(db_path)
+    df = query_features_and_targets(conn, ticker, start_date, end_date, dtype=MODEL_DTYPE)
     conn.close()
     
     if df.empty:
         logger.warning(f"No data found for {ticker}")
-        return
+        return 0
     
     feature_cols = [
         "return_1d", "return_5d", "volatility_10d", "volatility_20d",
@@ -48,17 +68,12 @@ def generate_baseline_predictions(ticker: str, model_name: str, start_date: Opti
     X = df[feature_cols]
     
     predictions = model.predict(X)
+    probabilities = model.predict_proba(X)
     
-    if hasattr(model, "predict_proba"):
-        probabilities = model.predict_proba(X)
-        if probabilities.shape[1] == 3:
-            prob_up = probabilities[:, 2]
-            prob_flat = probabilities[:, 1]
-            prob_down = probabilities[:, 0]
-        else:
-            prob_up = None
-            prob_flat = None
-            prob_down = None
+    if probabilities is not None:
+        prob_up = probabilities[:, 2]
+        prob_flat = probabilities[:, 1]
+        prob_down = probabilities[:, 0]
     else:
         prob_up = None
         prob_flat = None
@@ -72,41 +87,64 @@ def generate_baseline_predictions(ticker: str, model_name: str, start_date: Opti
         "prob_down": prob_down
     })
     
-    conn = get_connection()
+    conn = get_connection(db_path)
     symbol_id = get_or_create_symbol(conn, ticker)
-    insert_predictions(conn, symbol_id, predictions_df, model_name)
+    insert_predictions(conn, symbol_id, predictions_df, output_name or model_name)
     conn.close()
     
     logger.info(f"Generated {len(predictions_df)} predictions for {ticker}")
+    return len(predictions_df)
 
 
-def generate_lstm_predictions(ticker: str, start_date: Optional[str] = None, end_date: Optional[str] = None):
-    """Generate predictions using LSTM model."""
-    model_path = MODELS_DIR / "lstm_model.h5"
-    
-    if not model_path.exists():
-        logger.warning(f"Model not found: {model_path}")
-        return
+@instrument()
+def generate_lstm_predictions(
+    ticker: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    backend: Optional[str] = None,
+    model: Optional[LoadedModel] = None,
+    output_name: str = "lstm_model",
+    db_path: Path = DB_PATH
+) -> int:
+    """
+    Generate predictions using LSTM model.
+    
+    Args:
+        ticker: Stock ticker symbol
+        start_date: First date to score
+        end_date: Last date to score
+        backend: Model backend name; defaults to the first one with a saved artifact
+        model: Already loaded model to use instead of ``lstm_model``
+        output_name: Model name stored with the predictions
+        db_path: Database to read features from and write predictions to
+
+    Returns:
+        Number of predictions stored
+    """
+    if model is None:
+        model = load_model("lstm_model", backend=backend)
     
-    model = keras.models.load_model(model_path)
+    if model is None:
+        return 0
     
-    X_train, y_train, X_test, y_test = build_sequence_dataset(ticker, start_date, end_date, lookback=LSTM_LOOKBACK_WINDOW)
+    X_train, y_train, X_test, y_test = build_sequence_dataset(
+        ticker, start_date, end_date, lookback=LSTM_LOOKBACK_WINDOW, db_path=db_path
+    )
     
     if len(X_test) == 0:
         logger.warning(f"No test sequences for {ticker}")
-        return
+        return 0
     
-    y_test_shifted = y_test + 1
-    predictions_proba = model.predict(X_test)
+    predictions_proba = model.predict_proba(X_test)
     predictions = np.argmax(predictions_proba, axis=1) - 1
     
-    conn = get_connection()
-    df = query_features_and_targets(conn, ticker, start_date, end_date)
+    conn = get_connection(db_path)
+    df = query_features_and_targets(conn, ticker, start_date, end_date, dtype=MODEL_DTYPE)
     conn.close()
     
     if df.empty:
         logger.warning(f"No data found for {ticker}")
-        return
+        return 0
     
     df = df.sort_values("date").reset_index(drop=True)
     feature_cols = [
@@ -117,8 +155,8 @@ def generate_lstm_predictions(ticker: str, start_date: Optional[str] = None, end
     ]
     df = df.dropna(subset=feature_cols + ["direction_label"])
     
-    start_idx = LSTM_LOOKBACK_WINDOW
-    dates = df["date"].iloc[start_idx:start_idx+len(predictions)].values
+    # Test sequences are the most recent windows; each is dated by the row it predicts.
+    dates = df["date"].iloc[len(df) - len(predictions):].values
     
     predictions_df = pd.DataFrame({
         "date": dates,
@@ -128,20 +166,34 @@ def generate_lstm_predictions(ticker: str, start_date: Optional[str] = None, end
         "prob_down": predictions_proba[:, 0]
     })
     
-    conn = get_connection()
+    conn = get_connection(db_path)
     symbol_id = get_or_create_symbol(conn, ticker)
-    insert_predictions(conn, symbol_id, predictions_df, "lstm_model")
+    insert_predictions(conn, symbol_id, predictions_df, output_name)
     conn.close()
     
     logger.info(f"Generated {len(predictions_df)} LSTM predictions for {ticker}")
+    return len(predictions_df)
 
 
 if __name__ == "__main__":
+    import argparse
     from src.config import DEFAULT_TICKERS, TEST_START_DATE, TEST_END_DATE
+    from src.models.backends import available_backends
+    
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lstm-backend", choices=available_backends(), default=None,
+                        help="Backend for the LSTM (default: first saved artifact found)")
+    args = parser.parse_args()
+    
+    conn = get_connection()
+    initialize_schema(conn)
+    conn.close()
     
     for ticker in DEFAULT_TICKERS[:3]:
         logger.info(f"Generating predictions for {ticker}")
         generate_baseline_predictions(ticker, "logistic_regression", TEST_START_DATE, TEST_END_DATE)
         generate_baseline_predictions(ticker, "random_forest", TEST_START_DATE, TEST_END_DATE)
-        generate_lstm_predictions(ticker, TEST_START_DATE, TEST_END_DATE)
+        generate_baseline_predictions(ticker, "hist_gradient_boosting", TEST_START_DATE, TEST_END_DATE)
+        generate_baseline_predictions(ticker, "sgd_logistic_regression", TEST_START_DATE, TEST_END_DATE)
+        generate_lstm_predictions(ticker, TEST_START_DATE, TEST_END_DATE, backend=args.lstm_backend)
 
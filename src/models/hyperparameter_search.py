@@ -0,0 +1,295 @@
+"""Parallel hyperparameter search for the baseline and LSTM models.
+
+The dataset is built once in the parent process and published read-only to
+the workers as memory-mapped arrays (see ``shared_arrays``). Trials are
+random samples from a per-model search space and run in a process pool.
+LSTM trials report validation loss after every epoch to
+``hyperparameter_trial_epochs``; a trial is pruned early when its loss is
+worse than the median of the other trials at the same epoch. Every trial
+is recorded in ``hyperparameter_trials`` with its runtime.
+"""
+
+import json
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.database.db_utils import (
+    get_connection, initialize_schema, insert_hyperparameter_trial, query_features_and_targets
+)
+from src.models.build_datasets import FEATURE_COLS
+from src.models.sequence_dataset import sequence_windows
+from src.models.shared_arrays import SharedArrays, worker_arrays
+from src.models.worker_pool import configure_tensorflow_threads, init_worker
+from src.config import DB_PATH, MODEL_DTYPE, RANDOM_SEED, TRAIN_END_DATE
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SEARCH_SPACES = {
+    "logistic_regression": {
+        "C": ("log_uniform", 1e-3, 1e2),
+    },
+    "random_forest": {
+        "n_estimators": ("int", 50, 400),
+        "max_depth": ("int", 3, 20),
+        "min_samples_leaf": ("int", 1, 20),
+        "max_features": ("choice", ["sqrt", "log2", 0.5]),
+    },
+    "hist_gradient_boosting": {
+        "max_iter": ("int", 50, 500),
+        "learning_rate": ("log_uniform", 1e-2, 3e-1),
+        "max_leaf_nodes": ("int", 7, 63),
+        "l2_regularization": ("log_uniform", 1e-4, 1e1),
+    },
+    "lstm": {
+        "hidden_units": ("choice", [16, 32, 64, 128]),
+        "batch_size": ("choice", [16, 32, 64, 128]),
+        "lookback": ("choice", [10, 20, 30, 60]),
+        "learning_rate": ("log_uniform", 1e-4, 1e-2),
+    },
+}
+
+LSTM_MAX_EPOCHS = 20
+PRUNING_WARMUP_EPOCHS = 3
+PRUNING_MIN_TRIALS = 3
+
+
+def sample_params(model_type: str, n_trials: int, seed: int = RANDOM_SEED) -> List[Dict]:
+    """Draw ``n_trials`` random configurations from the model's search space."""
+    rng = np.random.default_rng(seed)
+    space = SEARCH_SPACES[model_type]
+    trials = []
+    for _ in range(n_trials):
+        params = {}
+        for name, (kind, *spec) in space.items():
+            if kind == "log_uniform":
+                params[name] = float(np.exp(rng.uniform(np.log(spec[0]), np.log(spec[1]))))
+            elif kind == "int":
+                params[name] = int(rng.integers(spec[0], spec[1] + 1))
+            else:
+                choice = spec[0][rng.integers(len(spec[0]))]
+                params[name] = choice.item() if hasattr(choice, "item") else choice
+        trials.append(params)
+    return trials
+
+
+def build_search_arrays(
+    model_type: str,
+    split_date: str = TRAIN_END_DATE,
+    db_path: Path = DB_PATH
+) -> Dict[str, np.ndarray]:
+    """
+    Build the dataset once for every trial.
+
+    Tabular models get ready-made train/validation matrices. The LSTM gets the
+    ticker-ordered feature matrix plus segment offsets, because the lookback
+    window is itself a hyperparameter; workers cut windows per trial.
+    """
+    conn = get_connection(db_path)
+    df = query_features_and_targets(conn)
+    conn.close()
+
+    if df.empty:
+        raise ValueError("No data found for hyperparameter search")
+
+    df = df.dropna(subset=FEATURE_COLS + ["direction_label"]).reset_index(drop=True)
+    features = df[FEATURE_COLS].to_numpy(dtype=MODEL_DTYPE)
+    labels = df["direction_label"].to_numpy(dtype=np.int64)
+    is_train = (df["date"] < pd.to_datetime(split_date)).to_numpy()
+
+    if model_type != "lstm":
+        return {
+            "X_train": features[is_train], "y_train": labels[is_train],
+            "X_val": features[~is_train], "y_val": labels[~is_train],
+        }
+
+    tickers = df["ticker"].to_numpy()
+    boundaries = np.flatnonzero(tickers[1:] != tickers[:-1]) + 1
+    return {
+        "features": features,
+        "labels": labels,
+        "is_train": is_train,
+        "offsets": np.concatenate([[0], boundaries, [len(df)]]),
+    }
+
+
+def _report_epoch(study: str, trial: int, epoch: int, val_loss: float, db_path: Path = DB_PATH) -> bool:
+    """Record an epoch's validation loss and return True if the trial should be pruned."""
+    conn = get_connection(db_path)
+    try:
+        conn.execute(
+            "INSERT OR REPLACE INTO hyperparameter_trial_epochs (study, trial, epoch, val_loss) VALUES (?, ?, ?, ?)",
+            (study, trial, epoch, val_loss)
+        )
+        conn.commit()
+        if epoch < PRUNING_WARMUP_EPOCHS:
+            return False
+        others = [row[0] for row in conn.execute(
+            "SELECT val_loss FROM hyperparameter_trial_epochs WHERE study = ? AND epoch = ? AND trial != ?",
+            (study, epoch, trial)
+        )]
+    finally:
+        conn.close()
+    return len(others) >= PRUNING_MIN_TRIALS and val_loss > float(np.median(others))
+
+
+def _run_sklearn_trial(model_type: str, params: Dict) -> Dict:
+    from sklearn.metrics import accuracy_score, log_loss
+    from src.models.train_baseline_models import BASELINE_MODEL_FACTORIES
+
+    arrays = worker_arrays()
+    if model_type == "random_forest":
+        params = {**params, "n_jobs": 1}
+    model = BASELINE_MODEL_FACTORIES[model_type](**params)
+    model.fit(arrays["X_train"], arrays["y_train"])
+
+    return {
+        "status": "complete",
+        "val_accuracy": float(accuracy_score(arrays["y_val"], model.predict(arrays["X_val"]))),
+        "val_loss": float(log_loss(arrays["y_val"], model.predict_proba(arrays["X_val"]), labels=model.classes_)),
+    }
+
+
+def _run_lstm_trial(study: str, trial: int, params: Dict, max_epochs: int, db_path: Path) -> Dict:
+    configure_tensorflow_threads()
+    from tensorflow import keras
+    from src.models.train_lstm import build_lstm_model
+
+    X_train, y_train, X_val, y_val = sequence_windows(worker_arrays(), params["lookback"])
+
+    class MedianPruning(keras.callbacks.Callback):
+        def __init__(self):
+            super().__init__()
+            self.pruned = False
+
+        def on_epoch_end(self, epoch, logs=None):
+            if _report_epoch(study, trial, epoch, float(logs["val_loss"]), db_path):
+                self.pruned = True
+                self.model.stop_training = True
+
+    pruner = MedianPruning()
+
+    model = build_lstm_model(
+        (X_train.shape[1], X_train.shape[2]),
+        hidden_units=params["hidden_units"],
+        learning_rate=params["learning_rate"]
+    )
+    history = model.fit(
+        X_train, y_train + 1,
+        batch_size=params["batch_size"],
+        epochs=max_epochs,
+        validation_data=(X_val, y_val + 1),
+        callbacks=[pruner, keras.callbacks.EarlyStopping(monitor="val_loss", patience=5)],
+        verbose=0
+    )
+
+    best_epoch = int(np.argmin(history.history["val_loss"]))
+    return {
+        "status": "pruned" if pruner.pruned else "complete",
+        "val_accuracy": float(history.history["val_accuracy"][best_epoch]),
+        "val_loss": float(history.history["val_loss"][best_epoch]),
+        "epochs": len(history.history["val_loss"]),
+    }
+
+
+def _run_trial(study: str, model_type: str, trial: int, params: Dict, max_epochs: int, db_path: Path) -> Dict:
+    """Run one trial in a worker and record it, whatever the outcome."""
+    start = time.perf_counter()
+    record = {"study": study, "trial": trial, "model_type": model_type, "params": json.dumps(params)}
+    try:
+        if model_type == "lstm":
+            record.update(_run_lstm_trial(study, trial, params, max_epochs, db_path))
+        else:
+            record.update(_run_sklearn_trial(model_type, params))
+    except Exception as e:
+        record.update({"status": "failed", "error": f"{type(e).__name__}: {e}"})
+    record["runtime_seconds"] = time.perf_counter() - start
+
+    conn = get_connection(db_path)
+    insert_hyperparameter_trial(conn, record)
+    conn.close()
+    return record
+
+
+def run_search(
+    model_type: str,
+    n_trials: int = 20,
+    max_workers: Optional[int] = None,
+    study: Optional[str] = None,
+    seed: int = RANDOM_SEED,
+    max_epochs: int = LSTM_MAX_EPOCHS,
+    db_path: Path = DB_PATH
+) -> pd.DataFrame:
+    """
+    Run a parallel random search for ``model_type`` on the data in ``db_path``.
+
+    Returns:
+        All trials of the study, best validation loss first
+    """
+    if model_type not in SEARCH_SPACES:
+        raise ValueError(f"Unknown model type: {model_type}. Use one of {list(SEARCH_SPACES)}")
+
+    study = study or f"{model_type}_{datetime.now():%Y%m%d_%H%M%S}"
+    conn = get_connection(db_path)
+    initialize_schema(conn)
+    conn.close()
+
+    arrays = build_search_arrays(model_type, db_path=db_path)
+    trials = sample_params(model_type, n_trials, seed)
+    logger.info(f"Study {study}: {n_trials} {model_type} trials")
+
+    with SharedArrays(arrays) as shared:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=init_worker,
+            initargs=(shared.directory, 1)
+        ) as pool:
+            futures = [
+                pool.submit(_run_trial, study, model_type, trial, params, max_epochs, db_path)
+                for trial, params in enumerate(trials)
+            ]
+            for future in as_completed(futures):
+                record = future.result()
+                logger.info(
+                    f"Trial {record['trial']} {record['status']}: val_loss={record.get('val_loss')} "
+                    f"({record['runtime_seconds']:.1f}s) {record['params']}"
+                )
+
+    return query_trials(study, db_path)
+
+
+def query_trials(study: Optional[str] = None, db_path: Path = DB_PATH) -> pd.DataFrame:
+    """Load recorded trials, optionally for one study, best validation loss first."""
+    query = "SELECT * FROM hyperparameter_trials"
+    params = []
+    if study:
+        query += " WHERE study = ?"
+        params.append(study)
+    query += " ORDER BY val_loss IS NULL, val_loss"
+
+    conn = get_connection(db_path)
+    df = pd.read_sql_query(query, conn, params=params)
+    conn.close()
+    return df
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("model_type", choices=list(SEARCH_SPACES))
+    parser.add_argument("--trials", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--study", default=None)
+    parser.add_argument("--max-epochs", type=int, default=LSTM_MAX_EPOCHS)
+    args = parser.parse_args()
+
+    results = run_search(args.model_type, args.trials, args.workers, args.study, max_epochs=args.max_epochs)
+    print(results[["trial", "status", "val_accuracy", "val_loss", "epochs", "runtime_seconds", "params"]].to_string(index=False))
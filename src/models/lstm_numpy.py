@@ -0,0 +1,185 @@
+"""Pure-NumPy inference for the LSTM direction model.
+
+The network from ``build_lstm_model`` is exported to a compact ``.npz`` file
+and scored here without TensorFlow. Dropout layers are identity at inference
+and are skipped by the exporter.
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from src.config import MODELS_DIR
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 0.5 * (np.tanh(0.5 * x) + 1.0)
+
+
+def _softmax(x: np.ndarray) -> np.ndarray:
+    shifted = np.exp(x - x.max(axis=-1, keepdims=True))
+    return shifted / shifted.sum(axis=-1, keepdims=True)
+
+
+ACTIVATIONS = {
+    "linear": lambda x: x,
+    "relu": lambda x: np.maximum(x, 0),
+    "sigmoid": _sigmoid,
+    "tanh": np.tanh,
+    "softmax": _softmax,
+}
+
+
+def _activation_name(activation) -> str:
+    name = activation if isinstance(activation, str) else activation.__name__
+    if name not in ACTIVATIONS:
+        raise ValueError(f"Unsupported activation for NumPy export: {name}")
+    return name
+
+
+def export_lstm_npz(model, path: Path = MODELS_DIR / "lstm_model.npz") -> Path:
+    """
+    Export the weights of a trained Keras LSTM model to ``.npz``.
+
+    Args:
+        model: Keras Sequential model made of LSTM, Dropout and Dense layers
+        path: Output file
+
+    Returns:
+        Path of the written file
+    """
+    arrays = {}
+    kinds = []
+
+    for layer in model.layers:
+        kind = type(layer).__name__
+        if kind == "Dropout":
+            continue
+
+        prefix = f"layer{len(kinds)}_"
+        config = layer.get_config()
+
+        if kind == "LSTM":
+            kernel, recurrent_kernel, bias = layer.get_weights()
+            arrays[prefix + "kernel"] = kernel
+            arrays[prefix + "recurrent_kernel"] = recurrent_kernel
+            arrays[prefix + "bias"] = bias
+            arrays[prefix + "activation"] = np.array(_activation_name(config["activation"]))
+            arrays[prefix + "recurrent_activation"] = np.array(_activation_name(config["recurrent_activation"]))
+            arrays[prefix + "return_sequences"] = np.array(config["return_sequences"])
+        elif kind == "Dense":
+            kernel, bias = layer.get_weights()
+            arrays[prefix + "kernel"] = kernel
+            arrays[prefix + "bias"] = bias
+            arrays[prefix + "activation"] = np.array(_activation_name(config["activation"]))
+        else:
+            raise ValueError(f"Unsupported layer for NumPy export: {kind}")
+
+        kinds.append(kind)
+
+    arrays["layers"] = np.array(kinds)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(path, **arrays)
+    logger.info(f"Exported {len(kinds)} layers to {path} ({path.stat().st_size / 1024:.1f} KB)")
+    return path
+
+
+class NumpyLSTMModel:
+    """Stacked LSTM + Dense network evaluated with NumPy.
+
+    Input projections for all timesteps are computed with one matrix
+    multiplication per layer; only the recurrent term is evaluated step by
+    step, batched over samples with the four gates fused into one matmul.
+    """
+
+    def __init__(self, layers: List[Dict], dtype=np.float32):
+        self.layers = layers
+        self.dtype = np.dtype(dtype)
+
+    @classmethod
+    def load(cls, path: Path, dtype=np.float32) -> "NumpyLSTMModel":
+        """Load a model written by ``export_lstm_npz``."""
+        layers = []
+        with np.load(path) as data:
+            for i, kind in enumerate(data["layers"]):
+                prefix = f"layer{i}_"
+                layer = {"kind": str(kind), "activation": str(data[prefix + "activation"])}
+                layer["kernel"] = data[prefix + "kernel"].astype(dtype)
+                layer["bias"] = data[prefix + "bias"].astype(dtype)
+                if kind == "LSTM":
+                    layer["recurrent_kernel"] = data[prefix + "recurrent_kernel"].astype(dtype)
+                    layer["recurrent_activation"] = str(data[prefix + "recurrent_activation"])
+                    layer["return_sequences"] = bool(data[prefix + "return_sequences"])
+                layers.append(layer)
+        return cls(layers, dtype)
+
+    def _lstm(self, layer: Dict, X: np.ndarray) -> np.ndarray:
+        batch, steps, _ = X.shape
+        units = layer["recurrent_kernel"].shape[0]
+        activation = ACTIVATIONS[layer["activation"]]
+        recurrent_activation = ACTIVATIONS[layer["recurrent_activation"]]
+
+        # Gate order follows Keras: input, forget, cell, output.
+        projected = X @ layer["kernel"] + layer["bias"]
+        h = np.zeros((batch, units), dtype=self.dtype)
+        c = np.zeros((batch, units), dtype=self.dtype)
+        outputs = np.empty((batch, steps, units), dtype=self.dtype) if layer["return_sequences"] else None
+
+        for t in range(steps):
+            z = projected[:, t, :] + h @ layer["recurrent_kernel"]
+            i = recurrent_activation(z[:, :units])
+            f = recurrent_activation(z[:, units:2 * units])
+            g = activation(z[:, 2 * units:3 * units])
+            o = recurrent_activation(z[:, 3 * units:])
+            c = f * c + i * g
+            h = o * activation(c)
+            if outputs is not None:
+                outputs[:, t, :] = h
+
+        return outputs if outputs is not None else h
+
+    def _forward(self, X: np.ndarray) -> np.ndarray:
+        out = X
+        for layer in self.layers:
+            if layer["kind"] == "LSTM":
+                out = self._lstm(layer, out)
+            else:
+                out = ACTIVATIONS[layer["activation"]](out @ layer["kernel"] + layer["bias"])
+        return out
+
+    def predict(self, X: np.ndarray, batch_size: int = 4096) -> np.ndarray:
+        """
+        Score sequences.
+
+        Args:
+            X: Array of shape (n_samples, lookback, n_features)
+            batch_size: Samples per forward pass, bounding peak memory
+
+        Returns:
+            Array of class probabilities, shape (n_samples, num_classes)
+        """
+        X = np.asarray(X, dtype=self.dtype)
+        if len(X) == 0:
+            return np.empty((0, self.layers[-1]["kernel"].shape[1]), dtype=self.dtype)
+        return np.concatenate([
+            self._forward(X[start:start + batch_size])
+            for start in range(0, len(X), batch_size)
+        ])
+
+
+if __name__ == "__main__":
+    from tensorflow import keras
+
+    keras_model = keras.models.load_model(MODELS_DIR / "lstm_model.h5")
+    npz_path = export_lstm_npz(keras_model)
+
+    sample = np.random.default_rng(0).normal(size=(256,) + tuple(keras_model.input_shape[1:])).astype(np.float32)
+    max_diff = np.abs(NumpyLSTMModel.load(npz_path).predict(sample) - keras_model.predict(sample, verbose=0)).max()
+    logger.info(f"Max abs difference vs Keras on random input: {max_diff:.2e}")
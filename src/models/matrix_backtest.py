@@ -0,0 +1,239 @@
+"""Vectorized backtest of many (ticker, model) pairs at once.
+
+Predictions and targets are loaded with one query and pivoted into aligned
+``date x column`` arrays, one column per (ticker, model) pair. Strategy
+returns, equity curves, Sharpe ratio, max drawdown and buy-and-hold are
+then computed for every column in a single NumPy pass. Each column matches
+``backtest_strategy`` run on that pair alone, including its convention of
+pinning the first equity value to 1.0.
+"""
+
+import logging
+import sqlite3
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.database.db_utils import get_connection
+from src.instrumentation import instrument
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def load_backtest_panel(
+    tickers: Optional[List[str]] = None,
+    model_names: Optional[List[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    conn: Optional[sqlite3.Connection] = None
+) -> Dict:
+    """
+    Load predictions and next-day returns as aligned date x column arrays.
+
+    Args:
+        tickers: Restrict to these tickers (default: all)
+        model_names: Restrict to these models (default: all)
+        start_date: First prediction date (inclusive)
+        end_date: Last prediction date (inclusive)
+        conn: Connection to use (default: open one on the default database)
+
+    Returns:
+        Dictionary with ``dates`` (n_dates,), ``columns`` (DataFrame of
+        ticker/model_name per column), ``positions`` and ``returns``
+        (n_dates, n_columns) float arrays, and a boolean ``mask`` marking
+        the cells where the pair has a prediction
+    """
+    query = """
+        SELECT
+            s.ticker,
+            p.model_name,
+            p.date,
+            p.predicted_direction,
+            t.next_day_return
+        FROM predictions p
+        JOIN targets t ON p.symbol_id = t.symbol_id AND p.date = t.date
+        JOIN symbols s ON p.symbol_id = s.id
+        WHERE 1 = 1
+    """
+    params = []
+    if tickers:
+        query += f" AND s.ticker IN ({','.join('?' * len(tickers))})"
+        params.extend(tickers)
+    if model_names:
+        query += f" AND p.model_name IN ({','.join('?' * len(model_names))})"
+        params.extend(model_names)
+    if start_date:
+        query += " AND p.date >= ?"
+        params.append(start_date)
+    if end_date:
+        query += " AND p.date <= ?"
+        params.append(end_date)
+
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    df = pd.read_sql_query(query, conn, params=params)
+    if own_conn:
+        conn.close()
+
+    return build_panel(df)
+
+
+def build_panel(df: pd.DataFrame) -> Dict:
+    """Pivot long ticker/model_name/date rows into date x column arrays."""
+    df = df.assign(date=pd.to_datetime(df["date"]))
+    dates, date_idx = np.unique(df["date"].to_numpy(), return_inverse=True)
+    columns = df[["ticker", "model_name"]].drop_duplicates().sort_values(["ticker", "model_name"]).reset_index(drop=True)
+    col_idx = pd.MultiIndex.from_frame(columns).get_indexer(pd.MultiIndex.from_frame(df[["ticker", "model_name"]]))
+
+    shape = (len(dates), len(columns))
+    positions = np.zeros(shape)
+    returns = np.zeros(shape)
+    mask = np.zeros(shape, dtype=bool)
+    positions[date_idx, col_idx] = df["predicted_direction"].to_numpy(dtype=float)
+    returns[date_idx, col_idx] = df["next_day_return"].to_numpy(dtype=float)
+    mask[date_idx, col_idx] = True
+
+    return {"dates": dates, "columns": columns, "positions": positions, "returns": returns, "mask": mask}
+
+
+def _equity(returns: np.ndarray, mask: np.ndarray, first_row: np.ndarray) -> np.ndarray:
+    """Cumulative product of ``1 + returns`` per column, NaN outside ``mask``.
+
+    NaN returns are skipped by the product but stay NaN in the curve, like
+    ``Series.cumprod``. The first row of every column is pinned to 1.0.
+    """
+    growth = np.where(mask & ~np.isnan(returns), 1 + returns, 1.0)
+    equity = np.cumprod(growth, axis=0)
+    equity[~mask | np.isnan(returns)] = np.nan
+    columns = np.arange(returns.shape[1])
+    has_rows = mask.any(axis=0)
+    equity[first_row[has_rows], columns[has_rows]] = 1.0
+    return equity
+
+
+def _last_valid(values: np.ndarray, last_row: np.ndarray) -> np.ndarray:
+    return values[last_row, np.arange(values.shape[1])]
+
+
+@instrument(rows=lambda result: int(result["n_days"].sum()))
+def backtest_matrix(
+    positions: np.ndarray,
+    returns: np.ndarray,
+    mask: Optional[np.ndarray] = None,
+    initial_capital: float = 10000.0
+) -> Dict[str, np.ndarray]:
+    """
+    Backtest every column of a date x column panel in one pass.
+
+    Args:
+        positions: Predicted directions (-1, 0, 1)
+        returns: Next-day returns aligned with ``positions``
+        mask: Cells that belong to each column's series (default: all)
+        initial_capital: Starting capital
+
+    Returns:
+        Dictionary of per-column metric arrays (``total_return``,
+        ``buy_hold_return``, ``sharpe_ratio``, ``max_drawdown``, ``n_days``)
+        and date x column arrays (``strategy_returns``,
+        ``cumulative_returns``, ``portfolio_value``, ``buy_hold_value``)
+    """
+    positions = np.asarray(positions, dtype=float)
+    returns = np.asarray(returns, dtype=float)
+    mask = np.ones(returns.shape, dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+
+    n_days = mask.sum(axis=0)
+    first_row = np.argmax(mask, axis=0)
+    last_row = returns.shape[0] - 1 - np.argmax(mask[::-1], axis=0)
+
+    strategy_returns = np.where(mask, positions * returns, np.nan)
+    cumulative_returns = _equity(strategy_returns, mask, first_row)
+    buy_hold_returns = _equity(np.where(mask, returns, np.nan), mask, first_row)
+
+    # NaN-skipping mean and sample std, as pandas computes them.
+    valid = ~np.isnan(strategy_returns)
+    count = valid.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(valid, strategy_returns, 0).sum(axis=0) / count
+        squared = np.where(valid, (strategy_returns - mean) ** 2, 0).sum(axis=0)
+        std = np.sqrt(squared / (count - 1))
+        sharpe_ratio = np.where(std > 0, np.sqrt(252) * mean / std, 0.0)
+
+        running_max = np.fmax.accumulate(cumulative_returns, axis=0)
+        max_drawdown = np.fmin.reduce(cumulative_returns / running_max - 1, axis=0) * 100
+
+    total_return = (_last_valid(cumulative_returns, last_row) - 1) * 100
+    buy_hold_return = (_last_valid(buy_hold_returns, last_row) - 1) * 100
+    empty = n_days == 0
+    for metric in (total_return, buy_hold_return, max_drawdown):
+        metric[empty] = np.nan
+
+    return {
+        "total_return": total_return,
+        "buy_hold_return": buy_hold_return,
+        "sharpe_ratio": sharpe_ratio,
+        "max_drawdown": max_drawdown,
+        "n_days": n_days,
+        "strategy_returns": strategy_returns,
+        "cumulative_returns": cumulative_returns,
+        "portfolio_value": initial_capital * cumulative_returns,
+        "buy_hold_value": initial_capital * buy_hold_returns,
+    }
+
+
+def run_matrix_backtest(
+    tickers: Optional[List[str]] = None,
+    model_names: Optional[List[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    initial_capital: float = 10000.0,
+    conn: Optional[sqlite3.Connection] = None
+) -> pd.DataFrame:
+    """
+    Backtest every (ticker, model) pair with predictions in the range.
+
+    Returns:
+        Tidy DataFrame with one row per pair: ticker, model_name, start_date,
+        end_date, n_days, total_return, buy_hold_return, sharpe_ratio,
+        max_drawdown
+    """
+    panel = load_backtest_panel(tickers, model_names, start_date, end_date, conn)
+    if panel["columns"].empty:
+        logger.warning("No predictions found for the matrix backtest")
+        return pd.DataFrame(columns=[
+            "ticker", "model_name", "start_date", "end_date", "n_days",
+            "total_return", "buy_hold_return", "sharpe_ratio", "max_drawdown"
+        ])
+
+    results = backtest_matrix(panel["positions"], panel["returns"], panel["mask"], initial_capital)
+    mask = panel["mask"]
+    first_row = np.argmax(mask, axis=0)
+    last_row = len(mask) - 1 - np.argmax(mask[::-1], axis=0)
+
+    metrics = panel["columns"].assign(
+        start_date=panel["dates"][first_row],
+        end_date=panel["dates"][last_row],
+        n_days=results["n_days"],
+        total_return=results["total_return"],
+        buy_hold_return=results["buy_hold_return"],
+        sharpe_ratio=results["sharpe_ratio"],
+        max_drawdown=results["max_drawdown"],
+    )
+    logger.info(f"Backtested {len(metrics)} (ticker, model) pairs over {len(panel['dates'])} dates")
+    return metrics
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickers", nargs="*", default=None)
+    parser.add_argument("--models", nargs="*", default=None)
+    parser.add_argument("--start", default=None)
+    parser.add_argument("--end", default=None)
+    args = parser.parse_args()
+
+    summary = run_matrix_backtest(args.tickers, args.models, args.start, args.end)
+    print(summary.to_string(index=False))
@@ -0,0 +1,333 @@
+"""Per-ticker (or per-cluster) model zoo trained in parallel.
+
+The feature table is loaded once, sorted by group, ticker and date and split
+into contiguous row ranges in a single pass. One training job per group is scheduled on a
+process pool whose workers are capped to a fixed number of BLAS/TensorFlow
+threads, so many small fits do not oversubscribe the CPU. Groups without
+``MIN_TRAIN_ROWS`` training rows of at least two classes are skipped, and a
+group that fails is reported in the summary without stopping the others. Artifacts are
+stored in a sharded layout::
+
+    models/zoo/<model_name>/<shard>/<group><suffix>
+
+where ``<shard>`` is the first two hex digits of the group's hash and
+``<group>`` is the group name reduced to file-name-safe characters. A
+``routing.json`` file per model maps every ticker to its group.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.database.db_utils import get_connection, query_features_and_targets
+from src.models.backends import LoadedModel, load_model
+from src.models.build_datasets import FEATURE_COLS
+from src.models.sequence_dataset import sequence_windows
+from src.models.shared_arrays import SharedArrays, worker_arrays
+from src.models.train_baseline_models import BASELINE_MODEL_FACTORIES
+from src.models.worker_pool import configure_tensorflow_threads, init_worker
+from src.config import DB_PATH, LSTM_BATCH_SIZE, LSTM_EPOCHS, LSTM_LOOKBACK_WINDOW, MODEL_DTYPE, MODELS_DIR, TRAIN_END_DATE
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ZOO_DIR = MODELS_DIR / "zoo"
+ZOO_MODEL_TYPES = list(BASELINE_MODEL_FACTORIES) + ["lstm"]
+MIN_TRAIN_ROWS = 100
+UNSAFE_NAME_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def shard_dir(model_name: str, group: str, zoo_dir: Path = ZOO_DIR) -> Path:
+    """Directory holding the artifact of ``group`` for ``model_name``."""
+    shard = hashlib.md5(group.encode()).hexdigest()[:2]
+    return zoo_dir / model_name / shard
+
+
+def artifact_name(group: str) -> str:
+    """
+    File name stem for ``group``'s artifact.
+
+    Characters outside letters, digits, ``_``, ``.`` and ``-`` (and leading
+    dots) are replaced; a changed name gets a hash suffix so that distinct
+    groups never share a file.
+    """
+    name = UNSAFE_NAME_CHARS.sub("_", group)
+    name = "_" + name[1:] if name.startswith(".") else name
+    if name != group or not name:
+        name = f"{name}-{hashlib.md5(group.encode()).hexdigest()[:8]}"
+    return name
+
+
+def _boundaries(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and stop rows of each run of equal values in a sorted column."""
+    starts = np.concatenate([[0], np.flatnonzero(values[1:] != values[:-1]) + 1]).astype(np.int64)
+    stops = np.append(starts[1:], len(values))
+    return starts, stops
+
+
+def _sort_groups(df: pd.DataFrame, clusters: Dict[str, str]) -> pd.DataFrame:
+    """Add the group column and sort so every group, and every ticker in it, is contiguous."""
+    df = df.assign(group=df["ticker"].map(clusters).fillna(df["ticker"]))
+    return df.sort_values(["group", "ticker", "date"], kind="stable").reset_index(drop=True)
+
+
+def _lstm_windows(X: np.ndarray, y: np.ndarray, is_train: np.ndarray, tickers: np.ndarray):
+    """Lookback windows of one group, cut per ticker so none spans two tickers."""
+    starts, _ = _boundaries(tickers)
+    arrays = {"features": X, "labels": y, "is_train": is_train, "offsets": np.append(starts, len(X))}
+    return sequence_windows(arrays, LSTM_LOOKBACK_WINDOW)
+
+
+def load_routing(model_name: str, zoo_dir: Path = ZOO_DIR) -> Dict[str, str]:
+    """Ticker -> group mapping written by ``train_zoo``."""
+    path = zoo_dir / model_name / "routing.json"
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def _train_group(model_name: str, group: str, start: int, stop: int, zoo_dir: str) -> Dict:
+    """Train one group's model inside a worker and save it to its shard."""
+    arrays = worker_arrays()
+    X, y, is_train = arrays["X"][start:stop], arrays["y"][start:stop], arrays["is_train"][start:stop]
+    target_dir = shard_dir(model_name, group, Path(zoo_dir))
+    target_dir.mkdir(parents=True, exist_ok=True)
+
+    started = time.perf_counter()
+    result = {"group": group, "rows": stop - start, "status": "trained", "error": None}
+    if model_name == "lstm":
+        windows = _lstm_windows(X, y, is_train, arrays["ticker"][start:stop])
+        if len(windows[0]) == 0:
+            reason = f"no ticker has more than {LSTM_LOOKBACK_WINDOW} training rows"
+            logger.warning(f"Skipping {group}: {reason}")
+            return {**result, "status": "skipped", "error": reason, "train_rows": 0, "test_accuracy": np.nan,
+                    "seconds": time.perf_counter() - started}
+        accuracy, n_train = _train_lstm_group(*windows, target_dir / f"{artifact_name(group)}.npz")
+    else:
+        params = {"n_jobs": 1} if model_name == "random_forest" else {}
+        model = BASELINE_MODEL_FACTORIES[model_name](**params)
+        # Keep feature names so scoring from DataFrames matches the global models.
+        frame = pd.DataFrame(X, columns=FEATURE_COLS)
+        model.fit(frame[is_train], y[is_train])
+        n_train = int(is_train.sum())
+        accuracy = float((model.predict(frame[~is_train]) == y[~is_train]).mean()) if (~is_train).any() else np.nan
+        joblib.dump(model, target_dir / f"{artifact_name(group)}.pkl")
+
+    return {**result, "train_rows": n_train, "test_accuracy": accuracy, "seconds": time.perf_counter() - started}
+
+
+def _train_lstm_group(X_train: np.ndarray, y_train: np.ndarray, X_val: np.ndarray, y_val: np.ndarray, path: Path):
+    configure_tensorflow_threads()
+    from tensorflow import keras
+    from src.models.lstm_numpy import export_lstm_npz
+    from src.models.train_lstm import build_lstm_model
+
+    model = build_lstm_model((X_train.shape[1], X_train.shape[2]))
+    callbacks = [keras.callbacks.EarlyStopping(monitor="val_loss", patience=10, restore_best_weights=True)]
+    model.fit(
+        X_train, y_train + 1,
+        batch_size=LSTM_BATCH_SIZE,
+        epochs=LSTM_EPOCHS,
+        validation_data=(X_val, y_val + 1) if len(X_val) else None,
+        callbacks=callbacks if len(X_val) else [],
+        verbose=0
+    )
+    export_lstm_npz(model, path)
+
+    accuracy = np.nan
+    if len(X_val):
+        accuracy = float((np.argmax(model.predict(X_val, verbose=0), axis=1) - 1 == y_val).mean())
+    return accuracy, len(X_train)
+
+
+def train_zoo(
+    model_name: str,
+    clusters: Optional[Dict[str, str]] = None,
+    tickers: Optional[List[str]] = None,
+    split_date: str = TRAIN_END_DATE,
+    max_workers: Optional[int] = None,
+    threads_per_worker: int = 1,
+    zoo_dir: Path = ZOO_DIR,
+    db_path: Path = DB_PATH
+) -> pd.DataFrame:
+    """
+    Train one ``model_name`` model per ticker (or per cluster).
+
+    Args:
+        model_name: A baseline model name or "lstm"
+        clusters: Optional ticker -> cluster mapping; tickers not in it get
+            their own model
+        tickers: Restrict training to these tickers
+        split_date: Rows before this date train, the rest are held out
+        max_workers: Process pool size (default: CPU count)
+        threads_per_worker: BLAS / TF intra-op threads per worker
+        zoo_dir: Root of the sharded artifact layout
+        db_path: Database to read features and targets from
+
+    Returns:
+        DataFrame with one row per group that was attempted; ``status`` is
+        "trained", "skipped" or "failed" with the reason in ``error``
+    """
+    if model_name not in ZOO_MODEL_TYPES:
+        raise ValueError(f"Unknown model: {model_name}. Use one of {ZOO_MODEL_TYPES}")
+
+    conn = get_connection(db_path)
+    df = query_features_and_targets(conn)
+    conn.close()
+
+    if tickers:
+        df = df[df["ticker"].isin(tickers)]
+    df = df.dropna(subset=FEATURE_COLS + ["direction_label"])
+    if df.empty:
+        raise ValueError("No data found for model zoo training")
+
+    df = _sort_groups(df, clusters or {})
+
+    is_train = (df["date"] < pd.to_datetime(split_date)).to_numpy()
+
+    # A group needs enough training rows, and more than one class, to be fitted.
+    train_stats = df[is_train].groupby("group")["direction_label"].agg(["size", "nunique"])
+    trainable = set(train_stats.index[(train_stats["size"] >= MIN_TRAIN_ROWS) & (train_stats["nunique"] >= 2)])
+
+    # One pass over the sorted group column gives every group's row range.
+    groups = df["group"].to_numpy()
+    starts, stops = _boundaries(groups)
+    jobs = [
+        (str(groups[start]), int(start), int(stop))
+        for start, stop in zip(starts, stops)
+        if groups[start] in trainable
+    ]
+    # Largest groups first so the pool does not end on one long straggler.
+    jobs.sort(key=lambda job: job[2] - job[1], reverse=True)
+    logger.info(f"Training {len(jobs)} {model_name} models "
+                f"({len(starts) - len(jobs)} groups without enough training data)")
+
+    arrays = {
+        "X": df[FEATURE_COLS].to_numpy(dtype=MODEL_DTYPE),
+        "y": df["direction_label"].to_numpy(dtype=np.int64),
+        "is_train": is_train,
+        "ticker": pd.factorize(df["ticker"])[0],
+    }
+
+    results = []
+    started = time.perf_counter()
+    with SharedArrays(arrays) as shared:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=init_worker,
+            initargs=(shared.directory, threads_per_worker)
+        ) as pool:
+            futures = {
+                pool.submit(_train_group, model_name, group, start, stop, str(zoo_dir)): (group, start, stop)
+                for group, start, stop in jobs
+            }
+            for future in as_completed(futures):
+                group, start, stop = futures[future]
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logger.error(f"Training {model_name} for {group} failed: {type(e).__name__}: {e}")
+                    results.append({"group": group, "rows": stop - start, "status": "failed",
+                                    "error": f"{type(e).__name__}: {e}", "train_rows": 0,
+                                    "test_accuracy": np.nan, "seconds": np.nan})
+
+    trained = {result["group"] for result in results if result["status"] == "trained"}
+    routing = {
+        ticker: group
+        for ticker, group in df[["ticker", "group"]].drop_duplicates().itertuples(index=False)
+        if group in trained
+    }
+    routing_path = zoo_dir / model_name / "routing.json"
+    routing_path.parent.mkdir(parents=True, exist_ok=True)
+    routing_path.write_text(json.dumps(routing, indent=2, sort_keys=True))
+
+    elapsed = time.perf_counter() - started
+    logger.info(f"Trained {len(trained)} models in {elapsed:.1f}s ({len(trained) / elapsed:.1f} models/s), "
+                f"{len(results) - len(trained)} skipped or failed")
+    columns = ["group", "status", "rows", "train_rows", "test_accuracy", "seconds", "error"]
+    return pd.DataFrame(results, columns=columns).sort_values("group").reset_index(drop=True)
+
+
+def load_zoo_model(
+    ticker: str,
+    model_name: str,
+    zoo_dir: Path = ZOO_DIR,
+    routing: Optional[Dict[str, str]] = None
+) -> Optional[LoadedModel]:
+    """
+    Load the zoo model that serves ``ticker``, or None if it has none.
+
+    Pass ``routing`` (from ``load_routing``) when loading many tickers so
+    routing.json is read once instead of once per ticker.
+    """
+    if routing is None:
+        routing = load_routing(model_name, zoo_dir)
+    group = routing.get(ticker)
+    if group is None:
+        return None
+    backend = "numpy" if model_name == "lstm" else "sklearn"
+    return load_model(artifact_name(group), backend=backend, models_dir=shard_dir(model_name, group, zoo_dir))
+
+
+def generate_zoo_predictions(
+    ticker: str,
+    model_name: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    zoo_dir: Path = ZOO_DIR,
+    routing: Optional[Dict[str, str]] = None
+) -> None:
+    """
+    Score ``ticker`` with its own zoo model and store as ``<model_name>_zoo``.
+
+    Tickers without a zoo model fall back to the global model.
+    """
+    from src.models.generate_predictions import generate_baseline_predictions, generate_lstm_predictions
+
+    model = load_zoo_model(ticker, model_name, zoo_dir, routing)
+    if model is None:
+        logger.info(f"No zoo {model_name} model for {ticker}, using the global model")
+
+    output_name = f"{model_name}_zoo"
+    if model_name == "lstm":
+        if model is None:
+            model = load_model("lstm_model")
+        if model is not None:
+            generate_lstm_predictions(ticker, start_date, end_date, model=model, output_name=output_name)
+    else:
+        generate_baseline_predictions(ticker, model_name, start_date, end_date, model=model, output_name=output_name)
+
+
+if __name__ == "__main__":
+    import argparse
+    from src.config import TEST_START_DATE, TEST_END_DATE
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["train", "predict"])
+    parser.add_argument("--model", choices=ZOO_MODEL_TYPES, default="logistic_regression")
+    parser.add_argument("--tickers", nargs="*", default=None)
+    parser.add_argument("--clusters", type=Path, default=None, help="CSV with ticker,cluster columns")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--threads-per-worker", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.command == "train":
+        clusters = None
+        if args.clusters:
+            clusters = dict(pd.read_csv(args.clusters)[["ticker", "cluster"]].astype(str).itertuples(index=False))
+        summary = train_zoo(args.model, clusters, args.tickers, max_workers=args.workers,
+                            threads_per_worker=args.threads_per_worker)
+        print(summary.to_string(index=False))
+    else:
+        routing = load_routing(args.model)
+        for ticker in args.tickers or sorted(routing):
+            generate_zoo_predictions(ticker, args.model, TEST_START_DATE, TEST_END_DATE, routing=routing)
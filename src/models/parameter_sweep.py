@@ -0,0 +1,256 @@
+"""Parameter-sweep backtester over thresholds, costs, slippage and sizing.
+
+``backtest_strategy`` trades the predicted direction with a full position
+and no costs. This module instead builds positions from the stored class
+probabilities and evaluates a whole grid of strategy settings at once:
+
+- ``thresholds``: minimum ``prob_up`` (long) or ``prob_down`` (short)
+  needed to open a position; the favoured side must also beat the other
+- ``costs_bps``: commission per unit of turnover, in basis points
+- ``slippage_bps``: extra execution cost per unit of turnover, in basis points
+- ``sizing``: how large a position is once the threshold is met
+
+For one return series the positions are a (threshold, sizing, day) array and
+the net returns a (threshold, cost, slippage, sizing, day) array, so every
+configuration is computed in one broadcasted NumPy pass. The result is a
+metrics cube with one row per (ticker, configuration).
+"""
+
+import logging
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.database.db_utils import get_connection
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLDS = np.round(np.arange(0.34, 0.81, 0.02), 2)
+DEFAULT_COSTS_BPS = [0.0, 1.0, 2.0, 5.0, 10.0]
+DEFAULT_SLIPPAGE_BPS = [0.0, 1.0, 2.0, 5.0, 10.0]
+SIZING_RULES = ["full", "edge", "linear"]
+METRICS = ["total_return", "sharpe_ratio", "max_drawdown", "turnover", "exposure", "n_trades"]
+
+# Bound on the float64 cells of the (threshold, cost, slippage, sizing, day)
+# net-return array; larger grids are evaluated in threshold chunks.
+MAX_SWEEP_CELLS = 20_000_000
+
+
+def position_sizes(
+    prob_up: np.ndarray,
+    prob_down: np.ndarray,
+    thresholds: Sequence[float],
+    sizing: Sequence[str] = SIZING_RULES
+) -> np.ndarray:
+    """
+    Signed positions for every (threshold, sizing rule) pair.
+
+    Sizing rules:
+        full: a full unit position whenever the threshold is met
+        edge: ``|prob_up - prob_down|``
+        linear: scales from 0 at the threshold to 1 at probability 1
+
+    Returns:
+        Array of shape (len(thresholds), len(sizing), n_days)
+    """
+    thresholds = np.asarray(thresholds, dtype=float)[:, None]
+    direction = np.sign(prob_up - prob_down)
+    confidence = np.maximum(prob_up, prob_down)
+    active = confidence >= thresholds
+
+    sizes = []
+    for rule in sizing:
+        if rule == "full":
+            size = np.ones_like(active, dtype=float)
+        elif rule == "edge":
+            size = np.broadcast_to(np.abs(prob_up - prob_down), active.shape)
+        elif rule == "linear":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                size = np.clip((confidence - thresholds) / (1 - thresholds), 0, 1)
+            size = np.nan_to_num(size, nan=1.0)
+        else:
+            raise ValueError(f"Unknown sizing rule: {rule}. Use one of {SIZING_RULES}")
+        sizes.append(np.where(active, direction * size, 0.0))
+
+    return np.stack(sizes, axis=1)
+
+
+def sweep_series(
+    prob_up: np.ndarray,
+    prob_down: np.ndarray,
+    returns: np.ndarray,
+    thresholds: Sequence[float] = DEFAULT_THRESHOLDS,
+    costs_bps: Sequence[float] = DEFAULT_COSTS_BPS,
+    slippage_bps: Sequence[float] = DEFAULT_SLIPPAGE_BPS,
+    sizing: Sequence[str] = SIZING_RULES
+) -> Dict[str, np.ndarray]:
+    """
+    Evaluate every strategy configuration on one date-ordered series.
+
+    Missing returns (the last day of a ticker) count as a flat day.
+
+    Returns:
+        Dictionary of metric arrays, each of shape
+        (len(thresholds), len(costs_bps), len(slippage_bps), len(sizing))
+    """
+    returns = np.nan_to_num(np.asarray(returns, dtype=float))
+    n_days = len(returns)
+    cells_per_threshold = len(costs_bps) * len(slippage_bps) * len(sizing) * max(n_days, 1)
+    chunk = max(1, MAX_SWEEP_CELLS // cells_per_threshold)
+
+    parts = [
+        _sweep_chunk(prob_up, prob_down, returns, thresholds[start:start + chunk], costs_bps, slippage_bps, sizing)
+        for start in range(0, len(thresholds), chunk)
+    ]
+    return {metric: np.concatenate([part[metric] for part in parts]) for metric in METRICS}
+
+
+def _sweep_chunk(prob_up, prob_down, returns, thresholds, costs_bps, slippage_bps, sizing) -> Dict[str, np.ndarray]:
+    positions = position_sizes(prob_up, prob_down, thresholds, sizing)                  # (T, Z, N)
+    turnover = np.abs(np.diff(positions, axis=-1, prepend=0.0))                           # (T, Z, N)
+    cost_rate = (np.asarray(costs_bps)[:, None] + np.asarray(slippage_bps)[None, :]) / 1e4   # (C, S)
+
+    gross = (positions * returns)[:, None, None, :, :]                                  # (T, 1, 1, Z, N)
+    net = gross - turnover[:, None, None, :, :] * cost_rate[None, :, :, None, None]     # (T, C, S, Z, N)
+
+    equity = np.cumprod(1 + net, axis=-1)
+    running_max = np.maximum(np.maximum.accumulate(equity, axis=-1), 1.0)
+
+    std = net.std(axis=-1, ddof=1) if net.shape[-1] > 1 else np.zeros(net.shape[:-1])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sharpe_ratio = np.where(std > 0, np.sqrt(252) * net.mean(axis=-1) / std, 0.0)
+
+    shape = net.shape[:-1]
+    return {
+        "total_return": (equity[..., -1] - 1) * 100,
+        "sharpe_ratio": sharpe_ratio,
+        "max_drawdown": np.minimum((equity / running_max - 1).min(axis=-1), 0) * 100,
+        "turnover": np.broadcast_to(turnover.mean(axis=-1)[:, None, None, :], shape),
+        "exposure": np.broadcast_to(np.abs(positions).mean(axis=-1)[:, None, None, :], shape),
+        "n_trades": np.broadcast_to((turnover > 0).sum(axis=-1)[:, None, None, :], shape),
+    }
+
+
+def load_sweep_inputs(
+    tickers: Optional[List[str]] = None,
+    model_name: str = "lstm_model",
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+) -> pd.DataFrame:
+    """Load class probabilities and next-day returns for one model, ordered by ticker and date."""
+    query = """
+        SELECT
+            s.ticker,
+            p.date,
+            p.prob_up,
+            p.prob_down,
+            t.next_day_return
+        FROM predictions p
+        JOIN targets t ON p.symbol_id = t.symbol_id AND p.date = t.date
+        JOIN symbols s ON p.symbol_id = s.id
+        WHERE p.model_name = ?
+    """
+    params = [model_name]
+    if tickers:
+        query += f" AND s.ticker IN ({','.join('?' * len(tickers))})"
+        params.extend(tickers)
+    if start_date:
+        query += " AND p.date >= ?"
+        params.append(start_date)
+    if end_date:
+        query += " AND p.date <= ?"
+        params.append(end_date)
+    query += " ORDER BY s.ticker, p.date"
+
+    conn = get_connection()
+    df = pd.read_sql_query(query, conn, params=params)
+    conn.close()
+    return df
+
+
+def run_sweep(
+    tickers: Optional[List[str]] = None,
+    model_name: str = "lstm_model",
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    thresholds: Sequence[float] = DEFAULT_THRESHOLDS,
+    costs_bps: Sequence[float] = DEFAULT_COSTS_BPS,
+    slippage_bps: Sequence[float] = DEFAULT_SLIPPAGE_BPS,
+    sizing: Sequence[str] = SIZING_RULES
+) -> pd.DataFrame:
+    """
+    Sweep the strategy grid for every ticker with ``model_name`` predictions.
+
+    Returns:
+        Metrics cube as a DataFrame indexed by (ticker, threshold, cost_bps,
+        slippage_bps, sizing) with one column per metric
+    """
+    df = load_sweep_inputs(tickers, model_name, start_date, end_date)
+    df = df.dropna(subset=["prob_up", "prob_down"])
+    if df.empty:
+        logger.warning(f"No probability predictions found for {model_name}")
+        return pd.DataFrame(columns=METRICS)
+
+    grid = pd.MultiIndex.from_product(
+        [np.asarray(thresholds, dtype=float), np.asarray(costs_bps, dtype=float),
+         np.asarray(slippage_bps, dtype=float), list(sizing)],
+        names=["threshold", "cost_bps", "slippage_bps", "sizing"]
+    )
+
+    frames = []
+    for ticker, ticker_df in df.groupby("ticker", sort=True):
+        metrics = sweep_series(
+            ticker_df["prob_up"].to_numpy(), ticker_df["prob_down"].to_numpy(),
+            ticker_df["next_day_return"].to_numpy(), thresholds, costs_bps, slippage_bps, sizing
+        )
+        frame = pd.DataFrame({metric: values.ravel() for metric, values in metrics.items()}, index=grid)
+        frames.append(pd.concat({ticker: frame}, names=["ticker"]))
+
+    cube = pd.concat(frames)
+    logger.info(f"Swept {len(grid)} configurations x {len(frames)} tickers for {model_name}")
+    return cube
+
+
+def best_configurations(
+    cube: pd.DataFrame,
+    metric: str = "sharpe_ratio",
+    top: int = 5,
+    per_ticker: bool = True
+) -> pd.DataFrame:
+    """
+    Highest-``metric`` configurations of a sweep cube.
+
+    Args:
+        cube: Output of ``run_sweep``
+        metric: Column to rank by (max drawdown ranks closest to zero first)
+        top: Configurations to keep (per ticker, or in total)
+        per_ticker: Rank within each ticker instead of pooling tickers
+
+    Returns:
+        Flat DataFrame of the best configurations, best first
+    """
+    flat = cube.reset_index().sort_values(metric, ascending=False, kind="stable")
+    if per_ticker:
+        flat = flat.groupby("ticker", sort=True).head(top).sort_values(["ticker", metric], ascending=[True, False])
+    else:
+        flat = flat.head(top)
+    return flat.reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", nargs="*", default=None)
+    parser.add_argument("--model", default="lstm_model")
+    parser.add_argument("--start", default=None)
+    parser.add_argument("--end", default=None)
+    parser.add_argument("--metric", choices=METRICS, default="sharpe_ratio")
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args()
+
+    cube = run_sweep(args.tickers, args.model, args.start, args.end)
+    if not cube.empty:
+        print(best_configurations(cube, args.metric, args.top).to_string(index=False))
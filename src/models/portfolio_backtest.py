@@ -0,0 +1,276 @@
+"""Portfolio backtest of one model's signals across the whole universe.
+
+Predictions, next-day returns and ``volatility_20d`` are loaded with one
+query into dense ``date x ticker`` matrices. At every rebalance date the
+signals are turned into target weights (gross exposure 1) by one of the
+``WEIGHTINGS``:
+
+- ``equal``: the same size long or short on every ticker with a signal
+- ``signal``: proportional to ``prob_up - prob_down`` (the predicted
+  direction where probabilities are missing)
+- ``volatility``: predicted direction scaled by ``1 / volatility_20d``
+
+Between rebalances positions drift with their returns; turnover at each
+rebalance is charged ``cost_bps``. Everything is computed on whole
+matrices, so the cost grows with dates x tickers and not with a Python loop
+over tickers.
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.database.db_utils import get_connection
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+WEIGHTINGS = ["equal", "signal", "volatility"]
+
+
+def load_portfolio_panel(
+    model_name: str,
+    tickers: Optional[List[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+) -> Dict:
+    """
+    Load one model's signals as dense date x ticker matrices.
+
+    Returns:
+        Dictionary with ``dates``, ``tickers`` and (n_dates, n_tickers)
+        float arrays ``direction``, ``strength``, ``returns`` and
+        ``volatility``; cells without a prediction are NaN
+    """
+    query = """
+        SELECT
+            s.ticker,
+            p.date,
+            p.predicted_direction,
+            p.prob_up - p.prob_down AS strength,
+            t.next_day_return,
+            f.volatility_20d
+        FROM predictions p
+        JOIN targets t ON p.symbol_id = t.symbol_id AND p.date = t.date
+        JOIN symbols s ON p.symbol_id = s.id
+        LEFT JOIN features f ON p.symbol_id = f.symbol_id AND p.date = f.date
+        WHERE p.model_name = ?
+    """
+    params = [model_name]
+    if tickers:
+        query += f" AND s.ticker IN ({','.join('?' * len(tickers))})"
+        params.extend(tickers)
+    if start_date:
+        query += " AND p.date >= ?"
+        params.append(start_date)
+    if end_date:
+        query += " AND p.date <= ?"
+        params.append(end_date)
+
+    conn = get_connection()
+    df = pd.read_sql_query(query, conn, params=params)
+    conn.close()
+
+    dates, date_idx = np.unique(pd.to_datetime(df["date"]).to_numpy(), return_inverse=True)
+    names, ticker_idx = np.unique(df["ticker"].to_numpy(), return_inverse=True)
+
+    panel = {"dates": dates, "tickers": names}
+    for key, column in [("direction", "predicted_direction"), ("strength", "strength"),
+                        ("returns", "next_day_return"), ("volatility", "volatility_20d")]:
+        matrix = np.full((len(dates), len(names)), np.nan)
+        matrix[date_idx, ticker_idx] = df[column].to_numpy(dtype=float)
+        panel[key] = matrix
+    return panel
+
+
+def target_weights(
+    direction: np.ndarray,
+    strength: Optional[np.ndarray] = None,
+    volatility: Optional[np.ndarray] = None,
+    weighting: str = "equal"
+) -> np.ndarray:
+    """
+    Target weights for every date, normalized to a gross exposure of 1.
+
+    Dates without any signal get all-zero weights.
+    """
+    direction = np.nan_to_num(direction)
+    if weighting == "equal":
+        raw = direction
+    elif weighting == "signal":
+        raw = np.where(np.isnan(strength), direction, strength) if strength is not None else direction
+    elif weighting == "volatility":
+        if volatility is None:
+            raise ValueError("Volatility weighting needs volatility_20d")
+        with np.errstate(invalid="ignore", divide="ignore"):
+            raw = np.where(volatility > 0, direction / volatility, 0.0)
+    else:
+        raise ValueError(f"Unknown weighting: {weighting}. Use one of {WEIGHTINGS}")
+
+    raw = np.nan_to_num(raw)
+    gross = np.abs(raw).sum(axis=1, keepdims=True)
+    return np.divide(raw, gross, out=np.zeros_like(raw), where=gross > 0)
+
+
+def simulate_portfolio(
+    targets: np.ndarray,
+    returns: np.ndarray,
+    rebalance_every: int = 1,
+    cost_bps: float = 0.0
+) -> Dict[str, np.ndarray]:
+    """
+    Simulate a portfolio rebalanced to ``targets`` every ``rebalance_every`` dates.
+
+    Weights set at a rebalance date are held (and drift with returns) until
+    the next one; the unallocated remainder sits in cash at zero return.
+    Missing returns count as zero.
+
+    Returns:
+        Dictionary with date x ticker ``weights`` (start of day, after
+        rebalancing) and per-date ``gross_returns``, ``turnover``,
+        ``costs`` and ``returns`` (net)
+    """
+    returns = np.nan_to_num(returns)
+    n_dates = len(returns)
+    rows = np.arange(n_dates)
+    segment_start = rows - rows % rebalance_every
+
+    # growth[t] = product of (1 + r) over rows < t, so a position opened at
+    # row s has grown by growth[t] / growth[s] at the start of row t.
+    growth = np.vstack([np.ones((1, returns.shape[1])), np.cumprod(1 + returns, axis=0)])
+    held = targets[segment_start]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        drift = np.nan_to_num(growth[rows] / growth[segment_start], nan=0.0, posinf=0.0)
+    holdings = held * drift
+    value = 1 - held.sum(axis=1) + holdings.sum(axis=1)
+    weights = holdings / value[:, None]
+    gross_returns = (weights * returns).sum(axis=1)
+
+    # Turnover: trade from the drifted weights at the end of the previous
+    # segment to the new targets.
+    rebalance_rows = rows[rows % rebalance_every == 0]
+    previous = np.zeros((len(rebalance_rows), returns.shape[1]))
+    later = rebalance_rows > 0
+    if later.any():
+        ends = rebalance_rows[later]
+        starts = ends - rebalance_every
+        with np.errstate(invalid="ignore", divide="ignore"):
+            end_drift = np.nan_to_num(growth[ends] / growth[starts], nan=0.0, posinf=0.0)
+        end_holdings = targets[starts] * end_drift
+        end_value = 1 - targets[starts].sum(axis=1) + end_holdings.sum(axis=1)
+        previous[later] = end_holdings / end_value[:, None]
+
+    turnover = np.zeros(n_dates)
+    turnover[rebalance_rows] = np.abs(targets[rebalance_rows] - previous).sum(axis=1)
+    costs = turnover * cost_bps / 1e4
+
+    return {
+        "weights": weights,
+        "gross_returns": gross_returns,
+        "turnover": turnover,
+        "costs": costs,
+        "returns": gross_returns - costs,
+    }
+
+
+def portfolio_metrics(returns: np.ndarray, turnover: np.ndarray, weights: np.ndarray) -> Dict[str, float]:
+    """Summary metrics of a daily portfolio return series."""
+    equity = np.cumprod(1 + returns)
+    running_max = np.maximum(np.maximum.accumulate(equity), 1.0)
+    std = returns.std(ddof=1) if len(returns) > 1 else 0.0
+    years = len(returns) / 252
+
+    return {
+        "total_return": (equity[-1] - 1) * 100 if len(equity) else 0.0,
+        "annual_return": (equity[-1] ** (1 / years) - 1) * 100 if len(equity) else 0.0,
+        "annual_volatility": std * np.sqrt(252) * 100,
+        "sharpe_ratio": np.sqrt(252) * returns.mean() / std if std > 0 else 0.0,
+        "max_drawdown": min((equity / running_max - 1).min(), 0.0) * 100 if len(equity) else 0.0,
+        "mean_turnover": float(turnover.mean()) if len(turnover) else 0.0,
+        "mean_gross_exposure": float(np.abs(weights).sum(axis=1).mean()) if len(weights) else 0.0,
+    }
+
+
+def run_portfolio_backtest(
+    model_name: str,
+    weighting: str = "equal",
+    rebalance_every: int = 1,
+    cost_bps: float = 0.0,
+    tickers: Optional[List[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    initial_capital: float = 10000.0
+) -> Dict:
+    """
+    Backtest ``model_name`` as one portfolio over all tickers.
+
+    Args:
+        model_name: Prediction model name
+        weighting: One of ``WEIGHTINGS``
+        rebalance_every: Rebalance period in trading dates
+        cost_bps: Cost per unit of turnover, in basis points
+        tickers: Restrict the universe (default: every ticker with predictions)
+        start_date: First prediction date (inclusive)
+        end_date: Last prediction date (inclusive)
+        initial_capital: Starting capital
+
+    Returns:
+        Dictionary with ``metrics``, the ``dates`` and ``tickers`` axes,
+        ``weights``, daily ``returns``, ``turnover``, ``portfolio_value`` and
+        an equal-weight long-only ``benchmark_value``; empty if there are no
+        predictions
+    """
+    panel = load_portfolio_panel(model_name, tickers, start_date, end_date)
+    if len(panel["dates"]) == 0:
+        logger.warning(f"No predictions found for {model_name}")
+        return {}
+
+    targets = target_weights(panel["direction"], panel["strength"], panel["volatility"], weighting)
+    simulation = simulate_portfolio(targets, panel["returns"], rebalance_every, cost_bps)
+
+    available = ~np.isnan(panel["returns"])
+    benchmark = np.divide(np.nansum(panel["returns"], axis=1), available.sum(axis=1),
+                          out=np.zeros(len(panel["dates"])), where=available.any(axis=1))
+
+    metrics = portfolio_metrics(simulation["returns"], simulation["turnover"], simulation["weights"])
+    metrics["benchmark_return"] = (np.prod(1 + benchmark) - 1) * 100
+    metrics["n_tickers"] = len(panel["tickers"])
+
+    logger.info(f"Portfolio backtest for {model_name} ({weighting}, rebalance every {rebalance_every}):")
+    logger.info(f"  Total Return: {metrics['total_return']:.2f}%")
+    logger.info(f"  Sharpe Ratio: {metrics['sharpe_ratio']:.4f}")
+
+    return {
+        "metrics": metrics,
+        "dates": panel["dates"],
+        "tickers": panel["tickers"],
+        "weights": simulation["weights"],
+        "returns": simulation["returns"],
+        "turnover": simulation["turnover"],
+        "portfolio_value": initial_capital * np.cumprod(1 + simulation["returns"]),
+        "benchmark_value": initial_capital * np.cumprod(1 + benchmark),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="lstm_model")
+    parser.add_argument("--weighting", choices=WEIGHTINGS + ["all"], default="all")
+    parser.add_argument("--rebalance-every", type=int, default=1)
+    parser.add_argument("--cost-bps", type=float, default=5.0)
+    parser.add_argument("--tickers", nargs="*", default=None)
+    parser.add_argument("--start", default=None)
+    parser.add_argument("--end", default=None)
+    args = parser.parse_args()
+
+    rows = []
+    for weighting in WEIGHTINGS if args.weighting == "all" else [args.weighting]:
+        result = run_portfolio_backtest(args.model, weighting, args.rebalance_every, args.cost_bps,
+                                        args.tickers, args.start, args.end)
+        if result:
+            rows.append({"weighting": weighting, **result["metrics"]})
+    print(pd.DataFrame(rows).to_string(index=False))
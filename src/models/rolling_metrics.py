@@ -0,0 +1,323 @@
+"""Rolling performance metrics for every (ticker, model) strategy.
+
+For each strategy and each window length in ``ROLLING_WINDOWS`` this
+computes the rolling Sharpe ratio, annualized volatility and hit rate, plus
+the running equity and drawdown. All windows come from prefix sums of the
+returns, squared returns, traded days and winning days, so each window
+costs O(n) regardless of its length and all strategies are computed
+together on the ``matrix_backtest`` date x strategy panel. A window spans
+a strategy's own last ``window`` observations, not rows of the shared date
+grid, so strategies with gaps get full windows too.
+
+Results are stored in ``rolling_metrics``. Updates are incremental: only
+the last ``max(windows) - 1`` stored dates of each strategy are reloaded as
+context, the running equity and peak resume from the last stored row, and
+only new dates are written. Rewriting predictions or targets truncates the
+stored rows from the first rewritten date (see ``truncate_rolling_metrics``).
+"""
+
+import logging
+import sqlite3
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.config import ROLLING_WINDOWS
+from src.database.db_utils import get_connection, initialize_schema
+from src.models.matrix_backtest import load_backtest_panel
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _window_sums(prefix: np.ndarray, window: int) -> np.ndarray:
+    """Sum over the last ``window`` rows (fewer at the start) from a prefix-sum array."""
+    upper = np.arange(1, len(prefix))
+    lower = np.maximum(upper - window, 0)
+    return prefix[upper] - prefix[lower]
+
+
+def _prefix(values: np.ndarray) -> np.ndarray:
+    return np.vstack([np.zeros((1, values.shape[1])), np.cumsum(values, axis=0)])
+
+
+def _scatter(compressed: np.ndarray, order: np.ndarray) -> np.ndarray:
+    """Put rows computed on the observation-ordered panel back on the date grid."""
+    values = np.empty_like(compressed)
+    np.put_along_axis(values, order, compressed, axis=0)
+    return values
+
+
+def compute_rolling_metrics(
+    strategy_returns: np.ndarray,
+    positions: np.ndarray,
+    mask: np.ndarray,
+    windows: Sequence[int] = ROLLING_WINDOWS
+) -> Dict[str, np.ndarray]:
+    """
+    Rolling Sharpe, volatility and hit rate over several windows in one pass.
+
+    Args:
+        strategy_returns: (n_dates, n_strategies) daily strategy returns
+        positions: Positions aligned with ``strategy_returns``
+        mask: Cells that belong to each strategy's series
+        windows: Window lengths in observations of each strategy; a value
+            is only reported once a strategy has ``window`` observations
+
+    Returns:
+        Dictionary of (n_windows, n_dates, n_strategies) arrays
+        ``rolling_sharpe``, ``rolling_volatility`` (annualized, percent) and
+        ``rolling_hit_rate`` (winning share of traded days)
+    """
+    valid = mask & ~np.isnan(strategy_returns)
+    returns = np.where(valid, strategy_returns, 0.0)
+    traded = valid & (np.nan_to_num(positions) != 0)
+
+    # Move every strategy's observations to the top of its column, in date
+    # order, so a window of rows is a window of that strategy's observations.
+    order = np.argsort(~valid, axis=0, kind="stable")
+    valid, returns, traded = (np.take_along_axis(values, order, axis=0) for values in (valid, returns, traded))
+
+    prefix_count = _prefix(valid.astype(float))
+    prefix_sum = _prefix(returns)
+    prefix_squares = _prefix(returns ** 2)
+    prefix_traded = _prefix(traded.astype(float))
+    prefix_wins = _prefix((traded & (returns > 0)).astype(float))
+
+    sharpe, volatility, hit_rate = [], [], []
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for window in windows:
+            count = _window_sums(prefix_count, window)
+            mean = _window_sums(prefix_sum, window) / count
+            variance = np.maximum(_window_sums(prefix_squares, window) - count * mean ** 2, 0) / (count - 1)
+            std = np.sqrt(variance)
+            full = valid & (count >= window)
+
+            sharpe.append(_scatter(np.where(full, np.where(std > 0, np.sqrt(252) * mean / std, 0.0), np.nan), order))
+            volatility.append(_scatter(np.where(full, std * np.sqrt(252) * 100, np.nan), order))
+            hit_rate.append(_scatter(np.where(
+                full, _window_sums(prefix_wins, window) / _window_sums(prefix_traded, window), np.nan
+            ), order))
+
+    return {
+        "rolling_sharpe": np.stack(sharpe),
+        "rolling_volatility": np.stack(volatility),
+        "rolling_hit_rate": np.stack(hit_rate),
+    }
+
+
+def running_drawdown(
+    strategy_returns: np.ndarray,
+    mask: np.ndarray,
+    resume_row: Optional[np.ndarray] = None,
+    resume_equity: Optional[np.ndarray] = None,
+    resume_peak: Optional[np.ndarray] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Running equity and drawdown (percent) per strategy.
+
+    ``resume_row``/``resume_equity``/``resume_peak`` continue a stored series:
+    equity at ``resume_row`` is rescaled to ``resume_equity`` and the peak
+    starts from ``resume_peak``. Values are only meaningful after that row.
+    """
+    n_dates, n_strategies = strategy_returns.shape
+    valid = mask & ~np.isnan(strategy_returns)
+    equity = np.cumprod(np.where(valid, 1 + strategy_returns, 1.0), axis=0)
+
+    if resume_row is None:
+        resume_row = np.full(n_strategies, -1)
+        resume_equity = np.ones(n_strategies)
+        resume_peak = np.ones(n_strategies)
+    base = np.where(resume_row >= 0, equity[np.maximum(resume_row, 0), np.arange(n_strategies)], 1.0)
+    equity = equity * (resume_equity / base)
+
+    after = np.arange(n_dates)[:, None] > resume_row
+    with np.errstate(invalid="ignore"):
+        peak = np.fmax(resume_peak, np.fmax.accumulate(np.where(after & mask, equity, np.nan), axis=0))
+    return {"equity": equity, "drawdown": (equity / peak - 1) * 100, "new_rows": after & mask}
+
+
+def _load_state(conn: sqlite3.Connection, state_window: int) -> pd.DataFrame:
+    """Last stored row (date, equity, drawdown) of every strategy."""
+    return pd.read_sql_query("""
+        SELECT s.ticker, r.model_name, r.date, r.equity, r.drawdown
+        FROM rolling_metrics r
+        JOIN symbols s ON r.symbol_id = s.id
+        JOIN (
+            SELECT symbol_id, model_name, MAX(date) AS date
+            FROM rolling_metrics WHERE window_days = ?
+            GROUP BY symbol_id, model_name
+        ) last ON r.symbol_id = last.symbol_id AND r.model_name = last.model_name AND r.date = last.date
+        WHERE r.window_days = ?
+    """, conn, params=[state_window, state_window])
+
+
+def _context_start(conn: sqlite3.Connection, state_window: int, context_rows: int) -> Optional[str]:
+    """Earliest date needed so every stored strategy has ``context_rows`` rows of history."""
+    row = conn.execute("""
+        SELECT MIN(date) FROM (
+            SELECT date, ROW_NUMBER() OVER (PARTITION BY symbol_id, model_name ORDER BY date DESC) AS rn
+            FROM rolling_metrics WHERE window_days = ?
+        ) WHERE rn <= ?
+    """, (state_window, max(context_rows, 1))).fetchone()
+    return row[0]
+
+
+def update_rolling_metrics(
+    tickers: Optional[List[str]] = None,
+    model_names: Optional[List[str]] = None,
+    windows: Sequence[int] = ROLLING_WINDOWS,
+    rebuild: bool = False,
+    conn: Optional[sqlite3.Connection] = None
+) -> int:
+    """
+    Compute and store rolling metrics for dates not stored yet.
+
+    Args:
+        tickers: Restrict to these tickers (default: all)
+        model_names: Restrict to these models (default: all)
+        windows: Window lengths; use ``rebuild`` after changing them
+        rebuild: Drop the stored rows of the selected strategies first
+        conn: Connection to use (default: open one on the default database)
+
+    Returns:
+        Number of (strategy, date) rows written
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    initialize_schema(conn)
+
+    try:
+        windows = sorted(windows)
+        state_window = windows[0]
+
+        if rebuild:
+            query = "DELETE FROM rolling_metrics WHERE 1 = 1"
+            params = []
+            if tickers:
+                query += f" AND symbol_id IN (SELECT id FROM symbols WHERE ticker IN ({','.join('?' * len(tickers))}))"
+                params.extend(tickers)
+            if model_names:
+                query += f" AND model_name IN ({','.join('?' * len(model_names))})"
+                params.extend(model_names)
+            conn.execute(query, params)
+            conn.commit()
+
+        state = _load_state(conn, state_window).set_index(["ticker", "model_name"])
+
+        # Strategies without stored rows need their full history.
+        pairs = pd.read_sql_query("""
+            SELECT DISTINCT s.ticker, p.model_name
+            FROM predictions p JOIN symbols s ON p.symbol_id = s.id
+        """, conn)
+        if tickers:
+            pairs = pairs[pairs["ticker"].isin(tickers)]
+        if model_names:
+            pairs = pairs[pairs["model_name"].isin(model_names)]
+        pairs_index = pd.MultiIndex.from_frame(pairs)
+        missing = not pairs_index.isin(state.index).all()
+        start_date = None if missing or state.empty else _context_start(conn, state_window, windows[-1] - 1)
+
+        panel = load_backtest_panel(tickers, model_names, start_date, conn=conn)
+        if panel["columns"].empty:
+            logger.warning("No predictions found for rolling metrics")
+            return 0
+
+        strategy_returns = np.where(panel["mask"], panel["positions"] * panel["returns"], np.nan)
+        columns = pd.MultiIndex.from_frame(panel["columns"])
+        stored = state.reindex(columns)
+        date_strings = pd.DatetimeIndex(panel["dates"]).strftime("%Y-%m-%d").to_numpy()
+
+        known = stored["date"].notna().to_numpy()
+        resume_row = np.where(known, np.searchsorted(date_strings, stored["date"].fillna("").to_numpy()), -1)
+        resume_equity = stored["equity"].fillna(1.0).to_numpy()
+        resume_peak = resume_equity / (1 + stored["drawdown"].fillna(0.0).to_numpy() / 100)
+
+        metrics = compute_rolling_metrics(strategy_returns, panel["positions"], panel["mask"], windows)
+        drawdown = running_drawdown(strategy_returns, panel["mask"], resume_row, resume_equity, resume_peak)
+
+        symbol_ids = dict(conn.execute("SELECT ticker, id FROM symbols").fetchall())
+        date_idx, col_idx = np.nonzero(drawdown["new_rows"])
+        column_symbols = np.array([symbol_ids[ticker] for ticker in panel["columns"]["ticker"]])
+        column_models = panel["columns"]["model_name"].to_numpy()
+
+        def nullable(values):
+            return [None if np.isnan(v) else float(v) for v in values]
+
+        rows = []
+        for w, window in enumerate(windows):
+            rows.extend(zip(
+                column_symbols[col_idx].tolist(),
+                column_models[col_idx].tolist(),
+                [window] * len(date_idx),
+                date_strings[date_idx].tolist(),
+                nullable(metrics["rolling_sharpe"][w, date_idx, col_idx]),
+                nullable(metrics["rolling_volatility"][w, date_idx, col_idx]),
+                nullable(metrics["rolling_hit_rate"][w, date_idx, col_idx]),
+                drawdown["equity"][date_idx, col_idx].tolist(),
+                drawdown["drawdown"][date_idx, col_idx].tolist(),
+            ))
+
+        conn.executemany("""
+            INSERT OR REPLACE INTO rolling_metrics
+            (symbol_id, model_name, window_days, date, rolling_sharpe, rolling_volatility,
+             rolling_hit_rate, equity, drawdown)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        conn.commit()
+
+        logger.info(f"Stored {len(date_idx)} new dates x {len(windows)} windows for {len(columns)} strategies")
+        return len(date_idx)
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def query_rolling_metrics(
+    ticker: str,
+    model_name: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    conn: Optional[sqlite3.Connection] = None
+) -> pd.DataFrame:
+    """Stored rolling metrics of one strategy, one row per (date, window)."""
+    query = """
+        SELECT r.date, r.window_days, r.rolling_sharpe, r.rolling_volatility,
+               r.rolling_hit_rate, r.equity, r.drawdown
+        FROM rolling_metrics r
+        JOIN symbols s ON r.symbol_id = s.id
+        WHERE s.ticker = ? AND r.model_name = ?
+    """
+    params = [ticker, model_name]
+    if start_date:
+        query += " AND r.date >= ?"
+        params.append(start_date)
+    if end_date:
+        query += " AND r.date <= ?"
+        params.append(end_date)
+    query += " ORDER BY r.date, r.window_days"
+
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    df = pd.read_sql_query(query, conn, params=params)
+    if own_conn:
+        conn.close()
+
+    df["date"] = pd.to_datetime(df["date"])
+    return df
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", nargs="*", default=None)
+    parser.add_argument("--models", nargs="*", default=None)
+    parser.add_argument("--windows", nargs="+", type=int, default=ROLLING_WINDOWS)
+    parser.add_argument("--rebuild", action="store_true", help="Recompute the stored history")
+    args = parser.parse_args()
+
+    update_rolling_metrics(args.tickers, args.models, args.windows, args.rebuild)
@@ -3,30 +3,39 @@
 import logging
 import pandas as pd
 import numpy as np
-from typing import Tuple, Optional
+from numpy.lib.stride_tricks import sliding_window_view
+from pathlib import Path
+from typing import Dict, Tuple, Optional
 
 from src.database.db_utils import get_connection, query_features_and_targets
-from src.config import LSTM_LOOKBACK_WINDOW
+from src.config import DB_PATH, LSTM_LOOKBACK_WINDOW, MODEL_DTYPE
+from src.instrumentation import instrument
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@instrument(rows=lambda result: len(result[0]) + len(result[2]))
 def build_sequence_dataset(
     ticker: Optional[str] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     lookback: int = LSTM_LOOKBACK_WINDOW,
-    train_split_date: Optional[str] = None
+    train_split_date: Optional[str] = None,
+    dtype: str = MODEL_DTYPE,
+    db_path: Path = DB_PATH
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
     """
     Build sequence dataset for LSTM/GRU models.
     
+    The sequences are read-only sliding-window views over one ``dtype``
+    feature matrix, so no (samples, lookback, features) copy is made here.
+    
     Returns:
         X_train_seq, y_train, X_test_seq, y_test
     """
-    conn = get_connection()
-    df = query_features_and_targets(conn, ticker, start_date, end_date)
+    conn = get_connection(db_path)
+    df = query_features_and_targets(conn, ticker, start_date, end_date, dtype=dtype)
     conn.close()
     
     if df.empty:
@@ -42,18 +51,16 @@ def build_sequence_dataset(
     df = df.sort_values("date").reset_index(drop=True)
     df = df.dropna(subset=feature_cols + ["direction_label"])
     
-    X_features = df[feature_cols].values
-    y_labels = df["direction_label"].values
-    
-    sequences = []
-    labels = []
-    
-    for i in range(lookback, len(X_features)):
-        sequences.append(X_features[i-lookback:i])
-        labels.append(y_labels[i])
+    X_features = df[feature_cols].to_numpy(dtype=dtype)
+    y_labels = df["direction_label"].to_numpy()
     
-    X_seq = np.array(sequences)
-    y_seq = np.array(labels)
+    # Window i covers rows i .. i+lookback-1 and is labelled with row i+lookback.
+    n_sequences = max(len(X_features) - lookback, 0)
+    if n_sequences:
+        X_seq = sliding_window_view(X_features, lookback, axis=0)[:n_sequences].transpose(0, 2, 1)
+    else:
+        X_seq = np.empty((0, lookback, len(feature_cols)), dtype=dtype)
+    y_seq = y_labels[lookback:]
     
     if train_split_date:
         split_idx = len(df[df["date"] < pd.to_datetime(train_split_date)]) - lookback
@@ -70,3 +77,35 @@ def build_sequence_dataset(
     
     return X_train, y_train, X_test, y_test
 
+
+def sequence_windows(arrays: Dict[str, np.ndarray], lookback: int):
+    """
+    Cut (lookback, features) windows per segment of a ticker-ordered matrix.
+
+    Args:
+        arrays: ``features``, ``labels`` and ``is_train`` rows plus the
+            ``offsets`` where each ticker's segment starts (and the end)
+        lookback: Window length; shorter segments give no windows
+
+    Returns:
+        X_train, y_train, X_val, y_val (empty when no segment is long enough)
+    """
+    features, labels, is_train, offsets = arrays["features"], arrays["labels"], arrays["is_train"], arrays["offsets"]
+    windows, window_labels, window_train = [], [], []
+    for start, stop in zip(offsets[:-1], offsets[1:]):
+        if stop - start <= lookback:
+            continue
+        # Window j covers rows start+j .. start+j+lookback-1 and predicts row start+j+lookback.
+        view = sliding_window_view(features[start:stop], lookback, axis=0)[:stop - start - lookback]
+        windows.append(view.transpose(0, 2, 1))
+        window_labels.append(labels[start + lookback:stop])
+        window_train.append(is_train[start + lookback:stop])
+
+    if not windows:
+        X = np.empty((0, lookback, features.shape[1]), dtype=features.dtype)
+        return X, labels[:0], X, labels[:0]
+
+    X = np.concatenate(windows)
+    y = np.concatenate(window_labels)
+    train = np.concatenate(window_train)
+    return X[train], y[train], X[~train], y[~train]
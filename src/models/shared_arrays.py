@@ -0,0 +1,60 @@
+"""Share read-only NumPy arrays with worker processes via memory-mapped files.
+
+Arrays are written once to ``.npy`` files in a temporary directory. Workers
+open them with ``mmap_mode="r"``, so every process reads the same page-cache
+pages and slicing a contiguous range is a zero-copy view.
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+_worker_arrays: Dict[str, np.ndarray] = {}
+
+
+class SharedArrays:
+    """Context manager that publishes arrays for worker processes.
+
+    Example:
+        with SharedArrays({"X": X, "y": y}) as shared:
+            with ProcessPoolExecutor(initializer=attach_shared_arrays,
+                                     initargs=(shared.directory,)) as pool:
+                ...
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray], directory: Optional[Path] = None):
+        self.arrays = arrays
+        self._owns_directory = directory is None
+        self.directory = Path(directory) if directory else Path(tempfile.mkdtemp(prefix="stockly_shared_"))
+
+    def __enter__(self) -> "SharedArrays":
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for name, array in self.arrays.items():
+            np.save(self.directory / f"{name}.npy", np.ascontiguousarray(array))
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._owns_directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def open_shared_arrays(directory: Path) -> Dict[str, np.ndarray]:
+    """Memory-map every array published in ``directory`` (read-only)."""
+    return {
+        path.stem: np.load(path, mmap_mode="r")
+        for path in sorted(Path(directory).glob("*.npy"))
+    }
+
+
+def attach_shared_arrays(directory: Path) -> None:
+    """Process-pool initializer: map the shared arrays into this worker."""
+    _worker_arrays.clear()
+    _worker_arrays.update(open_shared_arrays(directory))
+
+
+def worker_arrays() -> Dict[str, np.ndarray]:
+    """Arrays attached by ``attach_shared_arrays`` in the current process."""
+    return _worker_arrays
@@ -0,0 +1,234 @@
+"""Bootstrap and Monte Carlo significance of backtest metrics.
+
+Two questions are answered for a strategy's daily returns:
+
+- How uncertain are its Sharpe ratio and max drawdown? A moving-block
+  bootstrap resamples contiguous blocks of ``strategy_returns`` (keeping
+  short-range autocorrelation) and gives their distributions.
+- Does it beat chance? A permutation test shuffles the predicted positions
+  against the actual returns and compares the observed Sharpe ratio with
+  the Sharpe ratios of these random signals.
+
+Resamples are drawn as one 2-D index array per chunk and all metrics are
+computed row-wise with vectorized operations. Chunks are sized so a chunk
+never holds more than ``MAX_CHUNK_CELLS`` values and run on a thread pool
+capped so chunks in flight hold at most ``MAX_TOTAL_CELLS`` values; each
+chunk has its own seed, so results do not depend on the worker count.
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from src.config import RANDOM_SEED
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MAX_CHUNK_CELLS = 5_000_000
+MAX_TOTAL_CELLS = 20_000_000
+
+
+def sharpe_ratios(returns: np.ndarray) -> np.ndarray:
+    """Annualized Sharpe ratio of every row (0 where the std is 0)."""
+    std = returns.std(axis=-1, ddof=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(std > 0, np.sqrt(252) * returns.mean(axis=-1) / std, 0.0)
+
+
+def max_drawdowns(returns: np.ndarray) -> np.ndarray:
+    """Max drawdown in percent of every row's equity curve, starting at 1."""
+    equity = np.cumprod(1 + returns, axis=-1)
+    running_max = np.maximum(np.maximum.accumulate(equity, axis=-1), 1.0)
+    return np.minimum((equity / running_max - 1).min(axis=-1), 0) * 100
+
+
+def block_bootstrap_indices(n: int, n_resamples: int, block_size: int, rng: np.random.Generator) -> np.ndarray:
+    """Moving-block bootstrap row indices, shape (n_resamples, n)."""
+    if n < 1:
+        raise ValueError("Cannot bootstrap an empty series")
+    block_size = max(1, min(block_size, n))
+    n_blocks = -(-n // block_size)
+    starts = rng.integers(0, n - block_size + 1, size=(n_resamples, n_blocks))
+    return (starts[:, :, None] + np.arange(block_size)).reshape(n_resamples, -1)[:, :n]
+
+
+def permutation_indices(n: int, n_resamples: int, rng: np.random.Generator) -> np.ndarray:
+    """Independent random permutations of ``range(n)``, shape (n_resamples, n)."""
+    return rng.permuted(np.broadcast_to(np.arange(n), (n_resamples, n)), axis=1)
+
+
+def _run_chunked(
+    chunk_fn: Callable[[int, np.random.Generator], Dict[str, np.ndarray]],
+    n: int,
+    n_resamples: int,
+    seed: int,
+    max_workers: Optional[int]
+) -> Dict[str, np.ndarray]:
+    """Split ``n_resamples`` into memory-bounded chunks and run them in parallel."""
+    chunk_size = max(1, min(n_resamples, MAX_CHUNK_CELLS // max(n, 1)))
+    sizes = [min(chunk_size, n_resamples - start) for start in range(0, n_resamples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    # Every worker holds one chunk, so the pool size bounds the total memory.
+    if max_workers is None:
+        max_workers = min(32, (os.cpu_count() or 1) + 4)
+    max_workers = max(1, min(max_workers, len(sizes), MAX_TOTAL_CELLS // max(chunk_size * n, 1)))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        parts = list(pool.map(lambda args: chunk_fn(args[0], np.random.default_rng(args[1])), zip(sizes, seeds)))
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+
+def bootstrap_metrics(
+    strategy_returns: np.ndarray,
+    n_resamples: int = 5000,
+    block_size: int = 10,
+    seed: int = RANDOM_SEED,
+    max_workers: Optional[int] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Block-bootstrap distributions of the Sharpe ratio and max drawdown.
+
+    Args:
+        strategy_returns: Daily strategy returns (NaNs are dropped)
+        n_resamples: Number of bootstrap resamples
+        block_size: Length of the contiguous blocks
+        seed: Base seed; each chunk derives its own stream from it
+        max_workers: Thread pool size (default: Python's default), lowered
+            to fit ``MAX_TOTAL_CELLS``
+
+    Returns:
+        Dictionary with ``sharpe_ratio`` and ``max_drawdown`` arrays of
+        length ``n_resamples``
+
+    Raises:
+        ValueError: If there are no non-NaN returns
+    """
+    returns = np.asarray(strategy_returns, dtype=float)
+    returns = returns[~np.isnan(returns)]
+    if len(returns) == 0:
+        raise ValueError("No non-NaN strategy returns to bootstrap")
+
+    def chunk(size, rng):
+        samples = returns[block_bootstrap_indices(len(returns), size, block_size, rng)]
+        return {"sharpe_ratio": sharpe_ratios(samples), "max_drawdown": max_drawdowns(samples)}
+
+    return _run_chunked(chunk, len(returns), n_resamples, seed, max_workers)
+
+
+def permutation_test(
+    positions: np.ndarray,
+    actual_returns: np.ndarray,
+    n_resamples: int = 5000,
+    seed: int = RANDOM_SEED,
+    max_workers: Optional[int] = None
+) -> Dict:
+    """
+    Compare the strategy's Sharpe ratio with randomly permuted signals.
+
+    Returns:
+        Dictionary with the ``observed`` Sharpe ratio, the ``null``
+        distribution and the one-sided ``p_value`` of beating it
+
+    Raises:
+        ValueError: If there are no non-NaN returns
+    """
+    positions = np.asarray(positions, dtype=float)
+    actual_returns = np.asarray(actual_returns, dtype=float)
+    valid = ~np.isnan(actual_returns)
+    positions, actual_returns = positions[valid], actual_returns[valid]
+    if len(actual_returns) == 0:
+        raise ValueError("No non-NaN returns for the permutation test")
+
+    observed = float(sharpe_ratios(positions * actual_returns))
+
+    def chunk(size, rng):
+        shuffled = positions[permutation_indices(len(positions), size, rng)]
+        return {"sharpe_ratio": sharpe_ratios(shuffled * actual_returns)}
+
+    null = _run_chunked(chunk, len(positions), n_resamples, seed, max_workers)["sharpe_ratio"]
+    p_value = (1 + np.sum(null >= observed)) / (1 + len(null))
+    return {"observed": observed, "null": null, "p_value": float(p_value)}
+
+
+def significance_report(
+    ticker: str,
+    model_name: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    n_resamples: int = 5000,
+    block_size: int = 10,
+    seed: int = RANDOM_SEED,
+    max_workers: Optional[int] = None
+) -> Dict:
+    """
+    Bootstrap confidence intervals and permutation p-value for one backtest.
+
+    Returns:
+        Dictionary of summary statistics plus the raw distributions under
+        ``bootstrap`` and ``permutation``; empty if there are no predictions
+        or no days with a return
+    """
+    from src.models.matrix_backtest import load_backtest_panel
+
+    panel = load_backtest_panel([ticker], [model_name], start_date, end_date)
+    if panel["columns"].empty:
+        logger.warning(f"No predictions found for {ticker} with model {model_name}")
+        return {}
+
+    mask = panel["mask"][:, 0]
+    positions, actual_returns = panel["positions"][mask, 0], panel["returns"][mask, 0]
+    strategy_returns = positions * actual_returns
+    valid_returns = strategy_returns[~np.isnan(strategy_returns)]
+    if len(valid_returns) == 0:
+        logger.warning(f"No returns to test for {ticker} with model {model_name}")
+        return {}
+
+    bootstrap = bootstrap_metrics(strategy_returns, n_resamples, block_size, seed, max_workers)
+    permutation = permutation_test(positions, actual_returns, n_resamples, seed, max_workers)
+
+    report = {
+        "ticker": ticker,
+        "model_name": model_name,
+        "n_days": len(valid_returns),
+        "sharpe_ratio": permutation["observed"],
+        "sharpe_ci_low": float(np.percentile(bootstrap["sharpe_ratio"], 2.5)),
+        "sharpe_ci_high": float(np.percentile(bootstrap["sharpe_ratio"], 97.5)),
+        "prob_sharpe_positive": float(np.mean(bootstrap["sharpe_ratio"] > 0)),
+        "max_drawdown": float(max_drawdowns(valid_returns)),
+        "max_drawdown_ci_low": float(np.percentile(bootstrap["max_drawdown"], 2.5)),
+        "max_drawdown_ci_high": float(np.percentile(bootstrap["max_drawdown"], 97.5)),
+        "permutation_p_value": permutation["p_value"],
+        "bootstrap": bootstrap,
+        "permutation": permutation["null"],
+    }
+
+    logger.info(f"Significance for {ticker} ({model_name}):")
+    logger.info(f"  Sharpe Ratio: {report['sharpe_ratio']:.4f} "
+                f"(95% CI {report['sharpe_ci_low']:.4f} to {report['sharpe_ci_high']:.4f})")
+    logger.info(f"  Permutation p-value: {report['permutation_p_value']:.4f}")
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("ticker")
+    parser.add_argument("--model", default="lstm_model")
+    parser.add_argument("--start", default=None)
+    parser.add_argument("--end", default=None)
+    parser.add_argument("--resamples", type=int, default=5000)
+    parser.add_argument("--block-size", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    report = significance_report(args.ticker, args.model, args.start, args.end,
+                                 args.resamples, args.block_size, max_workers=args.workers)
+    for key, value in report.items():
+        if key not in ("bootstrap", "permutation"):
+            print(f"{key}: {value}")
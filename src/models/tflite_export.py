@@ -0,0 +1,155 @@
+"""Export the LSTM to quantized TFLite models and score them.
+
+The Keras LSTM layers are rebuilt with ``unroll=True`` before conversion so
+the graph becomes plain matmul/activation ops. These quantize cleanly and
+keep a dynamic batch dimension, with no TensorList ops that the TFLite
+converter cannot lower.
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.config import MODELS_DIR, RANDOM_SEED
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+QUANTIZATIONS = ("float16", "int8")
+CALIBRATION_SAMPLES = 200
+
+
+def tflite_path(quantization: str, model_name: str = "lstm_model", models_dir: Path = MODELS_DIR) -> Path:
+    """Path of the TFLite artifact for a quantization mode."""
+    return models_dir / f"{model_name}_{quantization}.tflite"
+
+
+def sample_calibration_windows(
+    X_train: np.ndarray,
+    n_samples: int = CALIBRATION_SAMPLES,
+    seed: int = RANDOM_SEED
+) -> np.ndarray:
+    """Draw a random subset of training windows for int8 calibration."""
+    rng = np.random.default_rng(seed)
+    n_samples = min(n_samples, len(X_train))
+    idx = np.sort(rng.choice(len(X_train), size=n_samples, replace=False))
+    return np.asarray(X_train[idx], dtype=np.float32)
+
+
+def build_unrolled_model(model):
+    """Copy a Sequential LSTM model with unrolled recurrent layers and the same weights."""
+    from tensorflow import keras
+
+    layers = [keras.Input(shape=model.input_shape[1:])]
+    for layer in model.layers:
+        config = layer.get_config()
+        if type(layer).__name__ in ("LSTM", "GRU"):
+            config["unroll"] = True
+        layers.append(type(layer).from_config(config))
+
+    unrolled = keras.Sequential(layers)
+    unrolled.set_weights(model.get_weights())
+    return unrolled
+
+
+def convert_to_tflite(
+    model,
+    quantization: str,
+    calibration_windows: Optional[np.ndarray] = None
+) -> bytes:
+    """
+    Convert a Keras LSTM model to a TFLite flatbuffer.
+
+    Args:
+        model: Trained Keras model
+        quantization: "float16" (half-precision weights) or "int8"
+            (weights and activations calibrated on ``calibration_windows``)
+        calibration_windows: Representative input windows, required for int8
+
+    Returns:
+        Serialized TFLite model
+    """
+    import tensorflow as tf
+
+    if quantization not in QUANTIZATIONS:
+        raise ValueError(f"Unknown quantization: {quantization}. Use one of {QUANTIZATIONS}")
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(build_unrolled_model(model))
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+
+    if quantization == "float16":
+        converter.target_spec.supported_types = [tf.float16]
+    else:
+        if calibration_windows is None or len(calibration_windows) == 0:
+            raise ValueError("int8 quantization needs calibration windows")
+        calibration_windows = np.asarray(calibration_windows, dtype=np.float32)
+
+        def representative_dataset():
+            for window in calibration_windows:
+                yield [window[np.newaxis]]
+
+        converter.representative_dataset = representative_dataset
+
+    return converter.convert()
+
+
+def export_tflite_models(
+    model,
+    X_train: np.ndarray,
+    model_name: str = "lstm_model",
+    models_dir: Path = MODELS_DIR
+) -> Dict[str, Path]:
+    """Write float16 and int8 TFLite versions of a trained LSTM."""
+    calibration_windows = sample_calibration_windows(X_train)
+    models_dir.mkdir(parents=True, exist_ok=True)
+
+    paths = {}
+    for quantization in QUANTIZATIONS:
+        path = tflite_path(quantization, model_name, models_dir)
+        path.write_bytes(convert_to_tflite(model, quantization, calibration_windows))
+        logger.info(f"Saved {quantization} TFLite model to {path} ({path.stat().st_size / 1024:.1f} KB)")
+        paths[quantization] = path
+    return paths
+
+
+def _make_interpreter(path: Path):
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        import tensorflow as tf
+        Interpreter = tf.lite.Interpreter
+    return Interpreter(model_path=str(path))
+
+
+class TFLiteModel:
+    """Batched inference adapter around a TFLite interpreter."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.interpreter = _make_interpreter(self.path)
+        self.input_index = self.interpreter.get_input_details()[0]["index"]
+        self.output_index = self.interpreter.get_output_details()[0]["index"]
+        self._batch = None
+
+    def _resize(self, batch: int) -> None:
+        if batch != self._batch:
+            shape = list(self.interpreter.get_input_details()[0]["shape"])
+            self.interpreter.resize_tensor_input(self.input_index, [batch] + shape[1:])
+            self.interpreter.allocate_tensors()
+            self._batch = batch
+
+    def predict(self, X: np.ndarray, batch_size: int = 1024) -> np.ndarray:
+        """Return class probabilities for windows of shape (n, lookback, features)."""
+        X = np.asarray(X, dtype=np.float32)
+        outputs = []
+        for start in range(0, len(X), batch_size):
+            chunk = X[start:start + batch_size]
+            self._resize(len(chunk))
+            self.interpreter.set_tensor(self.input_index, chunk)
+            self.interpreter.invoke()
+            outputs.append(self.interpreter.get_tensor(self.output_index).copy())
+        if not outputs:
+            return np.empty((0, 3), dtype=np.float32)
+        return np.concatenate(outputs)
@@ -1,11 +1,13 @@
 """Backtesting for time series predictions."""
 
 import logging
+import sqlite3
 import pandas as pd
 import numpy as np
 from typing import Dict, Optional
 
 from src.database.db_utils import get_connection, query_features_and_targets
+from src.instrumentation import instrument
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -64,14 +66,18 @@ def backtest_strategy(
     return results
 
 
+@instrument(rows=lambda result: len(result.get("dates", [])))
 def backtest_model(
     ticker: str,
     model_name: str,
     start_date: Optional[str] = None,
-    end_date: Optional[str] = None
+    end_date: Optional[str] = None,
+    conn: Optional[sqlite3.Connection] = None
 ) -> Dict:
     """Backtest a specific model on a ticker."""
-    conn = get_connection()
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
     
     query = """
         SELECT 
@@ -96,7 +102,8 @@ def backtest_model(
     query += " ORDER BY p.date"
     
     df = pd.read_sql_query(query, conn, params=params)
-    conn.close()
+    if own_conn:
+        conn.close()
     
     if df.empty:
         logger.warning(f"No predictions found for {ticker} with model {model_name}")
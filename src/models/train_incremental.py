@@ -0,0 +1,265 @@
+"""Incremental (online) training of a logistic regression baseline.
+
+The model is an SGD-trained log-loss classifier behind a running
+``StandardScaler``. The model keeps a training watermark per ticker; each
+update reads only the rows dated after their ticker's watermark and applies
+``partial_fit``, so the cost of a daily update does not grow with the length
+of the history. A ticker that lags the others, or is new, is caught up from
+its own watermark rather than skipped.
+"""
+
+import logging
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.metrics import accuracy_score, log_loss
+from sklearn.preprocessing import StandardScaler
+
+from src.database.db_utils import get_connection, query_features_and_targets
+from src.models.build_datasets import FEATURE_COLS
+from src.config import DB_PATH, MODELS_DIR, RANDOM_SEED
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+INCREMENTAL_MODEL_NAME = "sgd_logistic_regression"
+CLASSES = np.array([-1, 0, 1])
+
+
+class IncrementalDirectionModel:
+    """
+    Online direction classifier.
+
+    sklearn's SGD log-loss classifier is one-vs-rest for three classes;
+    ``predict_proba`` normalizes the per-class probabilities so they sum to
+    one, giving the same output layout as the multinomial baseline.
+    """
+
+    classes_ = CLASSES
+
+    def __init__(self, alpha: float = 1e-2, epochs_per_update: int = 5, random_state: int = RANDOM_SEED):
+        self.scaler = StandardScaler()
+        self.model = SGDClassifier(loss="log_loss", alpha=alpha, random_state=random_state)
+        self.epochs_per_update = epochs_per_update
+        self.random_state = random_state
+        self.watermarks: Dict[str, pd.Timestamp] = {}
+        self.n_samples_seen = 0
+
+    @property
+    def watermark(self) -> Optional[pd.Timestamp]:
+        """Latest date consumed for any ticker."""
+        return max(self.watermarks.values()) if self.watermarks else None
+
+    def partial_fit(
+        self,
+        X,
+        y,
+        dates: Optional[pd.Series] = None,
+        tickers: Optional[pd.Series] = None
+    ) -> "IncrementalDirectionModel":
+        """
+        Update the scaler and classifier with a batch of new rows.
+
+        Args:
+            X: Feature rows
+            y: Direction labels
+            dates: Row dates; with ``tickers``, advance each ticker's watermark
+            tickers: Row tickers (default: all rows count towards ``"*"``)
+        """
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y)
+        if len(X) == 0:
+            return self
+
+        self.scaler.partial_fit(X)
+        X_scaled = self.scaler.transform(X)
+
+        rng = np.random.default_rng(self.random_state + self.n_samples_seen)
+        for _ in range(self.epochs_per_update):
+            order = rng.permutation(len(X_scaled))
+            self.model.partial_fit(X_scaled[order], y[order], classes=CLASSES)
+
+        self.n_samples_seen += len(X)
+        if dates is not None and len(dates):
+            frame = pd.DataFrame({
+                "ticker": np.asarray(tickers) if tickers is not None else "*",
+                "date": pd.to_datetime(np.asarray(dates))
+            })
+            for ticker, latest in frame.groupby("ticker")["date"].max().items():
+                current = self.watermarks.get(ticker)
+                self.watermarks[ticker] = latest if current is None else max(current, latest)
+        return self
+
+    def predict(self, X) -> np.ndarray:
+        return self.model.predict(self.scaler.transform(np.asarray(X, dtype=np.float64)))
+
+    def predict_proba(self, X) -> np.ndarray:
+        return self.model.predict_proba(self.scaler.transform(np.asarray(X, dtype=np.float64)))
+
+
+def _clean_rows(df: pd.DataFrame) -> pd.DataFrame:
+    if df.empty:
+        return df
+    return df.dropna(subset=FEATURE_COLS + ["direction_label"]).sort_values("date", kind="stable")
+
+
+def _load_rows(start_date: Optional[str], end_date: Optional[str], db_path: Path = DB_PATH) -> pd.DataFrame:
+    conn = get_connection(db_path)
+    df = query_features_and_targets(conn, start_date=start_date, end_date=end_date)
+    conn.close()
+    return _clean_rows(df)
+
+
+def _load_new_rows(
+    watermarks: Dict[str, pd.Timestamp],
+    end_date: Optional[str],
+    db_path: Path = DB_PATH
+) -> pd.DataFrame:
+    """Rows dated after each ticker's watermark; tickers without one are read in full."""
+    conn = get_connection(db_path)
+    tickers = [row["ticker"] for row in conn.execute("SELECT ticker FROM symbols ORDER BY ticker")]
+    frames = []
+    for ticker in tickers:
+        start_date = None
+        if ticker in watermarks:
+            start_date = (watermarks[ticker] + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+        frames.append(query_features_and_targets(conn, ticker, start_date, end_date))
+    conn.close()
+
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+    return _clean_rows(pd.concat(frames, ignore_index=True))
+
+
+def update_incremental_model(
+    end_date: Optional[str] = None,
+    model_path: Path = MODELS_DIR / f"{INCREMENTAL_MODEL_NAME}.pkl",
+    db_path: Path = DB_PATH
+) -> IncrementalDirectionModel:
+    """
+    Train the persisted incremental model on rows newer than its watermarks.
+
+    Creates the model on first use. For every ticker, rows dated after that
+    ticker's watermark and up to ``end_date`` (inclusive) are consumed and
+    the watermark is advanced to the latest date seen. Rows backfilled before
+    a ticker's watermark are not revisited.
+
+    Args:
+        end_date: Last date to consume (default: everything available)
+        model_path: Where the model is loaded from and saved to
+        db_path: Database to read features and targets from
+
+    Returns:
+        The updated model
+    """
+    if model_path.exists():
+        model = joblib.load(model_path)
+        logger.info(f"Loaded incremental model (watermark {model.watermark}, {model.n_samples_seen} samples seen)")
+    else:
+        model = IncrementalDirectionModel()
+        logger.info("No incremental model found, starting a new one")
+
+    df = _load_new_rows(model.watermarks, end_date, db_path)
+    if df.empty:
+        logger.info("No new rows since the last watermarks")
+        return model
+
+    start = time.perf_counter()
+    model.partial_fit(df[FEATURE_COLS], df["direction_label"], df["date"], df["ticker"])
+    logger.info(f"Updated with {len(df)} new rows from {df['ticker'].nunique()} tickers in "
+                f"{time.perf_counter() - start:.3f}s, watermark {model.watermark.date()}")
+
+    model_path.parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump(model, model_path)
+    logger.info(f"Model saved to {model_path}")
+    return model
+
+
+def parity_report(
+    split_date: str,
+    increment_days: int = 1,
+    initial_days: int = 250
+) -> pd.DataFrame:
+    """
+    Compare incremental training with a full multinomial retrain.
+
+    The incremental model is seeded with the first ``initial_days`` dates and
+    then updated every ``increment_days`` until ``split_date``; both models
+    are scored on the rows from ``split_date`` onwards.
+
+    Returns:
+        DataFrame with accuracy, log loss and training time per approach
+    """
+    df = _load_rows(None, None)
+    if df.empty:
+        raise ValueError("No data found for parity report")
+
+    split = pd.to_datetime(split_date)
+    train, test = df[df["date"] < split], df[df["date"] >= split]
+    if train.empty or test.empty:
+        raise ValueError(f"Split date {split_date} leaves an empty train or test set")
+
+    start = time.perf_counter()
+    full_model = LogisticRegression(max_iter=1000, random_state=RANDOM_SEED, solver="lbfgs")
+    full_model.fit(train[FEATURE_COLS], train["direction_label"])
+    full_seconds = time.perf_counter() - start
+
+    dates = np.sort(train["date"].unique())
+    boundaries = [dates[min(initial_days, len(dates)) - 1]]
+    boundaries += list(dates[min(initial_days, len(dates)) - 1 + increment_days::increment_days])
+    if boundaries[-1] != dates[-1]:
+        boundaries.append(dates[-1])
+
+    incremental = IncrementalDirectionModel()
+    update_seconds = []
+    previous = None
+    for boundary in boundaries:
+        mask = train["date"] <= boundary
+        if previous is not None:
+            mask &= train["date"] > previous
+        chunk = train[mask]
+        start = time.perf_counter()
+        incremental.partial_fit(chunk[FEATURE_COLS], chunk["direction_label"], chunk["date"])
+        update_seconds.append(time.perf_counter() - start)
+        previous = boundary
+
+    rows = []
+    for name, model, seconds in [
+        ("full_retrain_logistic_regression", full_model, full_seconds),
+        ("incremental_sgd", incremental, float(np.median(update_seconds[1:] or update_seconds)))
+    ]:
+        proba = model.predict_proba(test[FEATURE_COLS])
+        rows.append({
+            "model": name,
+            "test_accuracy": accuracy_score(test["direction_label"], model.predict(test[FEATURE_COLS])),
+            "test_log_loss": log_loss(test["direction_label"], proba, labels=CLASSES),
+            "train_seconds_per_update": seconds,
+            "updates": 1 if model is full_model else len(update_seconds)
+        })
+
+    report = pd.DataFrame(rows)
+    logger.info("\nParity report:\n" + report.to_string(index=False))
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+    from src.config import TRAIN_END_DATE
+    # Import from the package so the pickled class is not bound to __main__.
+    from src.models.train_incremental import parity_report, update_incremental_model
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--end-date", default=None, help="Consume new rows up to this date")
+    parser.add_argument("--parity", action="store_true", help="Print an accuracy-parity report instead of updating")
+    args = parser.parse_args()
+
+    if args.parity:
+        parity_report(TRAIN_END_DATE)
+    else:
+        update_incremental_model(args.end_date)
@@ -3,13 +3,16 @@
 import logging
 import numpy as np
 from pathlib import Path
-from typing import Tuple
+from typing import List, Optional, Tuple
 import tensorflow as tf
 from tensorflow import keras
 from tensorflow.keras import layers
 
+from src.models.lstm_numpy import export_lstm_npz
 from src.models.sequence_dataset import build_sequence_dataset
-from src.config import MODELS_DIR, LSTM_LOOKBACK_WINDOW, LSTM_BATCH_SIZE, LSTM_EPOCHS, LSTM_HIDDEN_UNITS, RANDOM_SEED
+from src.models.tflite_export import export_tflite_models
+from src.config import MODELS_DIR, LSTM_LOOKBACK_WINDOW, LSTM_BATCH_SIZE, LSTM_EPOCHS, LSTM_HIDDEN_UNITS, LSTM_LEARNING_RATE, RANDOM_SEED
+from src.instrumentation import instrument
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -17,28 +20,35 @@ logger = logging.getLogger(__name__)
 tf.random.set_seed(RANDOM_SEED)
 
 
-def build_lstm_model(input_shape: Tuple[int, int], num_classes: int = 3) -> keras.Model:
+def build_lstm_model(
+    input_shape: Tuple[int, int],
+    num_classes: int = 3,
+    hidden_units: int = LSTM_HIDDEN_UNITS,
+    learning_rate: float = LSTM_LEARNING_RATE
+) -> keras.Model:
     """
     Build LSTM model for direction prediction.
     
     Args:
         input_shape: (lookback, num_features)
         num_classes: Number of classes (3 for -1, 0, 1)
+        hidden_units: Units in the first LSTM layer (the second has half)
+        learning_rate: Adam learning rate
     
     Returns:
         Compiled Keras model
     """
     model = keras.Sequential([
-        layers.LSTM(LSTM_HIDDEN_UNITS, return_sequences=True, input_shape=input_shape),
+        layers.LSTM(hidden_units, return_sequences=True, input_shape=input_shape),
         layers.Dropout(0.2),
-        layers.LSTM(LSTM_HIDDEN_UNITS // 2, return_sequences=False),
+        layers.LSTM(hidden_units // 2, return_sequences=False),
         layers.Dropout(0.2),
         layers.Dense(32, activation="relu"),
         layers.Dense(num_classes, activation="softmax")
     ])
     
     model.compile(
-        optimizer="adam",
+        optimizer=keras.optimizers.Adam(learning_rate=learning_rate),
         loss="sparse_categorical_crossentropy",
         metrics=["accuracy"]
     )
@@ -46,13 +56,24 @@ def build_lstm_model(input_shape: Tuple[int, int], num_classes: int = 3) -> kera
     return model
 
 
+@instrument(rows="X_train")
 def train_lstm(
     X_train: np.ndarray,
     y_train: np.ndarray,
     X_val: np.ndarray,
-    y_val: np.ndarray
+    y_val: np.ndarray,
+    callbacks: Optional[List[keras.callbacks.Callback]] = None
 ) -> keras.Model:
-    """Train LSTM model."""
+    """
+    Train LSTM model and write all of its inference artifacts.
+
+    The Keras model, its NumPy export and the float16/int8 TFLite exports
+    are written together, so ``backends.load_model`` never finds an
+    artifact left over from an earlier training run.
+
+    Args:
+        callbacks: Passed to ``fit`` after early stopping
+    """
     logger.info("Training LSTM model...")
     logger.info(f"Input shape: {X_train.shape}")
     
@@ -73,7 +94,7 @@ def train_lstm(
         batch_size=LSTM_BATCH_SIZE,
         epochs=LSTM_EPOCHS,
         validation_data=(X_val, y_val_shifted),
-        callbacks=[early_stopping],
+        callbacks=[early_stopping] + (callbacks or []),
         verbose=1
     )
     
@@ -88,6 +109,8 @@ def train_lstm(
     MODELS_DIR.mkdir(parents=True, exist_ok=True)
     model.save(MODELS_DIR / "lstm_model.h5")
     logger.info(f"Model saved to {MODELS_DIR / 'lstm_model.h5'}")
+    export_lstm_npz(model, MODELS_DIR / "lstm_model.npz")
+    export_tflite_models(model, X_train)
     
     return model
 
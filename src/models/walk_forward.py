@@ -0,0 +1,251 @@
+"""Walk-forward training and evaluation of the baseline models.
+
+The feature matrix is loaded once and sorted by date, so every fold's train
+and test sets are contiguous row ranges (zero-copy slices). Folds are
+trained in parallel in a process pool that maps the matrix from shared
+memory. Per-fold metrics go to ``walk_forward_folds`` and out-of-sample
+predictions go to ``predictions`` as ``<model>_walk_forward``.
+"""
+
+import logging
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score, log_loss
+
+from src.database.db_utils import (
+    get_connection, get_or_create_symbol, initialize_schema, insert_predictions,
+    insert_walk_forward_folds, query_features_and_targets
+)
+from src.models.build_datasets import FEATURE_COLS
+from src.models.shared_arrays import SharedArrays, worker_arrays
+from src.models.train_baseline_models import BASELINE_MODEL_FACTORIES
+from src.models.worker_pool import init_worker
+from src.config import MODEL_DTYPE
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CLASSES = np.array([-1, 0, 1])
+
+
+def generate_folds(
+    dates: np.ndarray,
+    n_folds: int = 5,
+    mode: str = "expanding",
+    min_train_days: Optional[int] = None,
+    test_days: Optional[int] = None,
+    train_days: Optional[int] = None
+) -> List[Dict]:
+    """
+    Generate walk-forward folds from a date-sorted row index.
+
+    Args:
+        dates: Row dates, sorted ascending (several rows may share a date)
+        n_folds: Number of consecutive test windows
+        mode: "expanding" (train from the first date) or "rolling"
+            (train on the ``train_days`` dates before each test window)
+        min_train_days: Dates in the first training window (default: half)
+        test_days: Dates per test window (default: split the rest evenly)
+        train_days: Rolling window length (default: ``min_train_days``)
+
+    Returns:
+        List of folds with row ranges (``train_start``/``train_stop``,
+        ``test_start``/``test_stop``) and their boundary dates
+    """
+    if mode not in ("expanding", "rolling"):
+        raise ValueError(f"Unknown walk-forward mode: {mode}")
+
+    unique_dates = np.unique(dates)
+    n_dates = len(unique_dates)
+    min_train_days = min_train_days or n_dates // 2
+    test_days = test_days or (n_dates - min_train_days) // n_folds
+    train_days = train_days or min_train_days
+
+    if test_days <= 0 or min_train_days + test_days > n_dates:
+        raise ValueError(f"Not enough dates ({n_dates}) for {n_folds} folds")
+
+    # Row offset of the first row on each unique date, plus the end sentinel.
+    offsets = np.append(np.searchsorted(dates, unique_dates, side="left"), len(dates))
+
+    folds = []
+    for fold in range(n_folds):
+        test_first = min_train_days + fold * test_days
+        if test_first >= n_dates:
+            break
+        test_last = min(test_first + test_days, n_dates)
+        train_first = 0 if mode == "expanding" else max(0, test_first - train_days)
+
+        folds.append({
+            "fold": fold,
+            "train_start": int(offsets[train_first]),
+            "train_stop": int(offsets[test_first]),
+            "test_start": int(offsets[test_first]),
+            "test_stop": int(offsets[test_last]),
+            "train_start_date": pd.Timestamp(unique_dates[train_first]).strftime("%Y-%m-%d"),
+            "train_end_date": pd.Timestamp(unique_dates[test_first - 1]).strftime("%Y-%m-%d"),
+            "test_start_date": pd.Timestamp(unique_dates[test_first]).strftime("%Y-%m-%d"),
+            "test_end_date": pd.Timestamp(unique_dates[test_last - 1]).strftime("%Y-%m-%d"),
+        })
+    return folds
+
+
+def _run_fold(model_name: str, model_params: Dict, fold: Dict) -> Dict:
+    """Train and score one fold inside a worker process."""
+    arrays = worker_arrays()
+    X, y, returns = arrays["X"], arrays["y"], arrays["returns"]
+
+    X_train, y_train = X[fold["train_start"]:fold["train_stop"]], y[fold["train_start"]:fold["train_stop"]]
+    X_test, y_test = X[fold["test_start"]:fold["test_stop"]], y[fold["test_start"]:fold["test_stop"]]
+
+    model = BASELINE_MODEL_FACTORIES[model_name](**model_params)
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    predictions = model.predict(X_test)
+    probabilities = np.zeros((len(X_test), len(CLASSES)))
+    class_idx = np.searchsorted(CLASSES, model.classes_)
+    probabilities[:, class_idx] = model.predict_proba(X_test)
+
+    return {
+        **fold,
+        "predictions": predictions,
+        "probabilities": probabilities,
+        "accuracy": float(accuracy_score(y_test, predictions)),
+        "log_loss": float(log_loss(y_test, probabilities, labels=CLASSES)),
+        "mean_strategy_return": float(np.mean(predictions * returns[fold["test_start"]:fold["test_stop"]])),
+        "fit_seconds": fit_seconds,
+    }
+
+
+def run_walk_forward(
+    model_names: List[str] = list(BASELINE_MODEL_FACTORIES),
+    n_folds: int = 5,
+    mode: str = "expanding",
+    min_train_days: Optional[int] = None,
+    test_days: Optional[int] = None,
+    train_days: Optional[int] = None,
+    ticker: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    store: bool = True
+) -> pd.DataFrame:
+    """
+    Run a walk-forward evaluation of the baseline models.
+
+    Every (model, fold) pair is an independent task in the process pool.
+    Estimators run single-threaded inside workers to avoid oversubscription.
+
+    Returns:
+        DataFrame of per-fold metrics
+    """
+    conn = get_connection()
+    df = query_features_and_targets(conn, ticker)
+    conn.close()
+
+    if df.empty:
+        raise ValueError("No data found for walk-forward evaluation")
+
+    df = df.dropna(subset=FEATURE_COLS + ["direction_label"])
+    df = df.sort_values("date", kind="stable").reset_index(drop=True)
+
+    dates = df["date"].to_numpy()
+    folds = generate_folds(dates, n_folds, mode, min_train_days, test_days, train_days)
+    run_id = uuid.uuid4().hex[:12]
+    logger.info(f"Walk-forward run {run_id}: {len(folds)} {mode} folds x {len(model_names)} models on {len(df)} rows")
+
+    arrays = {
+        "X": df[FEATURE_COLS].to_numpy(dtype=MODEL_DTYPE),
+        "y": df["direction_label"].to_numpy(dtype=np.int64),
+        "returns": df["next_day_return"].fillna(0).to_numpy(dtype=MODEL_DTYPE),
+    }
+    model_params = {"random_forest": {"n_jobs": 1}}
+
+    results = []
+    with SharedArrays(arrays) as shared:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=init_worker,
+            initargs=(shared.directory, 1)
+        ) as pool:
+            futures = {
+                pool.submit(_run_fold, name, model_params.get(name, {}), fold): name
+                for name in model_names
+                for fold in folds
+            }
+            for future, name in futures.items():
+                result = future.result()
+                result["model_name"] = name
+                results.append(result)
+                logger.info(f"{name} fold {result['fold']}: accuracy {result['accuracy']:.4f} ({result['fit_seconds']:.2f}s)")
+
+    metrics = pd.DataFrame([{
+        "run_id": run_id,
+        "model_name": r["model_name"],
+        "fold": r["fold"],
+        "mode": mode,
+        "train_start": r["train_start_date"],
+        "train_end": r["train_end_date"],
+        "test_start": r["test_start_date"],
+        "test_end": r["test_end_date"],
+        "n_train": r["train_stop"] - r["train_start"],
+        "n_test": r["test_stop"] - r["test_start"],
+        "accuracy": r["accuracy"],
+        "log_loss": r["log_loss"],
+        "mean_strategy_return": r["mean_strategy_return"],
+        "fit_seconds": r["fit_seconds"],
+    } for r in results]).sort_values(["model_name", "fold"]).reset_index(drop=True)
+
+    if store:
+        _store_results(df, results, metrics)
+
+    return metrics
+
+
+def _store_results(df: pd.DataFrame, results: List[Dict], metrics: pd.DataFrame) -> None:
+    conn = get_connection()
+    initialize_schema(conn)
+    insert_walk_forward_folds(conn, metrics)
+
+    for name in metrics["model_name"].unique():
+        model_results = [r for r in results if r["model_name"] == name]
+        rows = np.concatenate([np.arange(r["test_start"], r["test_stop"]) for r in model_results])
+        out = pd.DataFrame({
+            "ticker": df["ticker"].to_numpy()[rows],
+            "date": df["date"].to_numpy()[rows],
+            "predicted_direction": np.concatenate([r["predictions"] for r in model_results]),
+        })
+        probabilities = np.concatenate([r["probabilities"] for r in model_results])
+        out["prob_down"], out["prob_flat"], out["prob_up"] = probabilities.T
+
+        for ticker_name, ticker_df in out.groupby("ticker"):
+            symbol_id = get_or_create_symbol(conn, ticker_name)
+            insert_predictions(conn, symbol_id, ticker_df, f"{name}_walk_forward")
+
+    conn.close()
+    logger.info(f"Stored {len(metrics)} fold results and out-of-sample predictions")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--models", nargs="+", default=list(BASELINE_MODEL_FACTORIES))
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--mode", choices=["expanding", "rolling"], default="expanding")
+    parser.add_argument("--test-days", type=int, default=None)
+    parser.add_argument("--train-days", type=int, default=None)
+    parser.add_argument("--ticker", default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    summary = run_walk_forward(
+        args.models, args.folds, args.mode,
+        test_days=args.test_days, train_days=args.train_days,
+        ticker=args.ticker, max_workers=args.workers
+    )
+    print(summary.to_string(index=False))
@@ -0,0 +1,56 @@
+"""Process-pool worker setup shared by the parallel training harnesses."""
+
+import os
+from pathlib import Path
+from typing import Optional
+
+from threadpoolctl import threadpool_limits
+
+from src.models.shared_arrays import attach_shared_arrays
+
+THREAD_ENV_VARS = [
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+    "TF_NUM_INTRAOP_THREADS",
+]
+
+_worker_threads = 1
+_thread_limits = None
+
+
+def limit_worker_threads(threads: int = 1) -> None:
+    """Cap BLAS/OpenMP threads in this process.
+
+    Forked workers inherit BLAS and OpenMP libraries that have already read
+    their environment, so the cap is applied to the loaded libraries with
+    threadpoolctl; the environment variables cover libraries loaded later
+    and child processes. TensorFlow is capped by
+    ``configure_tensorflow_threads``.
+    """
+    global _worker_threads, _thread_limits
+    _worker_threads = threads
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(threads)
+    os.environ["TF_NUM_INTEROP_THREADS"] = "1"
+    _thread_limits = threadpool_limits(limits=threads)
+
+
+def configure_tensorflow_threads() -> None:
+    """Apply the worker thread cap to TensorFlow; call before building models."""
+    import tensorflow as tf
+
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(_worker_threads)
+        tf.config.threading.set_inter_op_parallelism_threads(1)
+    except RuntimeError:
+        # The TF runtime is already initialized in this worker.
+        pass
+
+
+def init_worker(shared_directory: Optional[Path] = None, threads: int = 1) -> None:
+    """Process-pool initializer: limit threads and attach shared arrays."""
+    limit_worker_threads(threads)
+    if shared_directory is not None:
+        attach_shared_arrays(shared_directory)
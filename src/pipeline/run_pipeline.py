@@ -0,0 +1,407 @@
+"""Run the pipeline stages as a DAG, skipping stages that are up to date.
+
+Each stage in ``STAGES`` declares what it reads and writes: tables by name,
+model artifacts by path, and the config values that change its result.
+Dependencies follow from those declarations (a stage depends on the
+selected stages that write one of its inputs), so baseline and LSTM
+training, which both only read features and targets, run concurrently.
+
+Before a stage runs its inputs are fingerprinted:
+
+- data tables (prices, features, targets) by a hash of their content,
+  ordered by key and without row ids, so rewriting identical rows is not a
+  change;
+- ``predictions`` by the versions in ``prediction_versions`` and
+  ``backtests`` by the keys of its full-range rows, which change whenever
+  the content does and are much cheaper to read;
+- model artifacts by a hash of the file.
+
+A stage is skipped when its input hash matches the one stored in
+``pipeline_stages`` after its last successful run and its outputs still
+have the fingerprint it left them with (deleting a model file reruns the
+stage that writes it). Table fingerprints are computed once per pipeline
+run and recomputed only after a stage that writes the table finishes, so
+``features`` and ``targets`` are hashed once however many stages read
+them. All stages run in this process, on a thread pool,
+so TensorFlow and scikit-learn are imported once.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.app.job_runner import PIPELINE_STAGES
+from src.config import (
+    DB_PATH, DEFAULT_TICKERS, HGB_LEARNING_RATE, HGB_MAX_BINS, HGB_MAX_ITER, HGB_MAX_LEAF_NODES, LOGREG_C,
+    LSTM_BATCH_SIZE, LSTM_EPOCHS, LSTM_HIDDEN_UNITS, LSTM_LEARNING_RATE, LSTM_LOOKBACK_WINDOW, MODEL_DTYPE,
+    MODELS_DIR, RANDOM_SEED, RF_MAX_DEPTH, RF_N_ESTIMATORS, TEST_END_DATE, TEST_START_DATE, TRAIN_END_DATE
+)
+from src.database.db_utils import get_connection, initialize_schema
+from src.instrumentation import enable, stage, write_report
+from src.models.tflite_export import QUANTIZATIONS, tflite_path
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BASELINE_MODELS = ["logistic_regression", "random_forest", "hist_gradient_boosting"]
+# Updated outside the pipeline by train_incremental; scored when present.
+INCREMENTAL_MODEL = MODELS_DIR / "sgd_logistic_regression.pkl"
+HASH_BATCH_ROWS = 50000
+FILE_CHUNK_BYTES = 1 << 20
+
+# Key columns of the tables fingerprinted by content.
+TABLE_KEYS = {
+    "symbols": ["ticker"],
+    "prices": ["symbol_id", "date"],
+    "features": ["symbol_id", "date"],
+    "targets": ["symbol_id", "date"],
+}
+# Tables fingerprinted by a version query instead of their content.
+VERSION_QUERIES = {
+    "predictions": "SELECT symbol_id, model_name, version FROM prediction_versions ORDER BY symbol_id, model_name",
+    "backtests": """
+        SELECT cache_key FROM backtests WHERE start_date IS NULL AND end_date IS NULL ORDER BY cache_key
+    """,
+}
+
+# name -> inputs and outputs (table names or artifact paths), the config
+# values that change the result, and the stage function from the job runner,
+# called with (reporter, db_path).
+STAGES: Dict[str, Dict] = {
+    "sample_data": {
+        "inputs": [],
+        "outputs": ["prices", "features", "targets"],
+        "params": {"tickers": DEFAULT_TICKERS[:3], "n_days": 1000, "start_date": "2020-01-01", "seed": RANDOM_SEED},
+        "run": PIPELINE_STAGES["sample_data"][1],
+    },
+    "train_baseline": {
+        "inputs": ["features", "targets"],
+        "outputs": [MODELS_DIR / f"{name}.pkl" for name in BASELINE_MODELS],
+        "params": {
+            "train_end": TRAIN_END_DATE, "dtype": MODEL_DTYPE, "seed": RANDOM_SEED, "logreg_c": LOGREG_C,
+            "rf": [RF_N_ESTIMATORS, RF_MAX_DEPTH],
+            "hgb": [HGB_MAX_ITER, HGB_LEARNING_RATE, HGB_MAX_LEAF_NODES, HGB_MAX_BINS],
+        },
+        "run": PIPELINE_STAGES["train_baseline"][1],
+    },
+    "train_lstm": {
+        "inputs": ["features", "targets"],
+        "outputs": [MODELS_DIR / "lstm_model.h5", MODELS_DIR / "lstm_model.npz"]
+                   + [tflite_path(quantization) for quantization in QUANTIZATIONS],
+        "params": {
+            "train_end": TRAIN_END_DATE, "dtype": MODEL_DTYPE, "seed": RANDOM_SEED,
+            "lstm": [LSTM_LOOKBACK_WINDOW, LSTM_BATCH_SIZE, LSTM_EPOCHS, LSTM_HIDDEN_UNITS, LSTM_LEARNING_RATE],
+        },
+        "run": PIPELINE_STAGES["train_lstm"][1],
+    },
+    "generate_predictions": {
+        "inputs": ["features", "targets"] + [MODELS_DIR / f"{name}.pkl" for name in BASELINE_MODELS]
+                  + [INCREMENTAL_MODEL, MODELS_DIR / "lstm_model.h5", MODELS_DIR / "lstm_model.npz"],
+        "outputs": ["predictions"],
+        "params": {"tickers": DEFAULT_TICKERS[:3], "start": TEST_START_DATE, "end": TEST_END_DATE},
+        "run": PIPELINE_STAGES["generate_predictions"][1],
+    },
+    "backtest_summaries": {
+        "inputs": ["predictions", "targets"],
+        "outputs": ["backtests"],
+        "params": {},
+        "run": PIPELINE_STAGES["backtest_summaries"][1],
+    },
+}
+# Sample data overwrites the default tickers, so it only runs when asked for.
+DEFAULT_STAGES = [name for name in STAGES if name != "sample_data"]
+
+
+class StageLogger:
+    """Stands in for the job runner's ``JobReporter``: stage messages go to the log."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def update(
+        self,
+        progress: Optional[float] = None,
+        rows: Optional[int] = None,
+        epoch: Optional[int] = None,
+        message: Optional[str] = None
+    ) -> None:
+        if message is not None:
+            logger.info(f"[{self.name}] {message}")
+
+
+def table_fingerprint(conn: sqlite3.Connection, table: str) -> str:
+    """Hash of a table's content (or of its version query, see ``VERSION_QUERIES``)."""
+    if table in VERSION_QUERIES:
+        query = VERSION_QUERIES[table]
+    else:
+        columns = [row["name"] for row in conn.execute(f"PRAGMA table_info({table})") if row["name"] != "id"]
+        if not columns:
+            raise ValueError(f"Unknown table: {table}")
+        keys = TABLE_KEYS.get(table, columns)
+        query = f"SELECT {', '.join(columns)} FROM {table} ORDER BY {', '.join(keys)}"
+
+    digest = hashlib.sha256()
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(query)
+    while rows := cursor.fetchmany(HASH_BATCH_ROWS):
+        digest.update(repr(rows).encode())
+    return digest.hexdigest()
+
+
+class TableFingerprints:
+    """
+    Table fingerprints memoized for one pipeline run.
+
+    Stages only read tables written by the stages they depend on, so a
+    cached fingerprint stays valid until its writer finishes and calls
+    ``invalidate``. The lock also keeps two stages that start together from
+    hashing the same table twice.
+    """
+
+    def __init__(self):
+        self._hashes: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def get(self, conn: sqlite3.Connection, table: str) -> str:
+        with self._lock:
+            if table not in self._hashes:
+                self._hashes[table] = table_fingerprint(conn, table)
+            return self._hashes[table]
+
+    def invalidate(self, items: List) -> None:
+        with self._lock:
+            for item in items:
+                self._hashes.pop(item, None)
+
+
+def file_fingerprint(path: Path) -> str:
+    """Hash of a file's bytes, or ``"missing"``."""
+    if not path.exists():
+        return "missing"
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(FILE_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint(
+    conn: sqlite3.Connection,
+    items: List,
+    params: Optional[Dict] = None,
+    tables: Optional[TableFingerprints] = None
+) -> str:
+    """Combined hash of tables (names), artifacts (paths) and ``params``; ``tables`` memoizes the tables."""
+    table_hash = tables.get if tables is not None else table_fingerprint
+    parts = {str(item): file_fingerprint(item) if isinstance(item, Path) else table_hash(conn, item)
+             for item in items}
+    parts["params"] = params or {}
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def stage_graph(names: List[str], stages: Dict[str, Dict] = STAGES) -> Dict[str, List[str]]:
+    """
+    Dependencies of the selected stages, in topological order.
+
+    Returns:
+        Dictionary mapping each stage to the selected stages it waits for
+    """
+    unknown = [name for name in names if name not in stages]
+    if unknown:
+        raise ValueError(f"Unknown stages: {unknown}. Use any of {list(stages)}")
+
+    writers = {}
+    for name in names:
+        for output in stages[name]["outputs"]:
+            if output in writers:
+                raise ValueError(f"{output} is written by both {writers[output]} and {name}")
+            writers[output] = name
+    deps = {name: sorted({writers[item] for item in stages[name]["inputs"] if item in writers} - {name})
+            for name in names}
+
+    ordered, visiting = [], set()
+
+    def visit(name):
+        if name in ordered:
+            return
+        if name in visiting:
+            raise ValueError(f"Stage dependencies form a cycle through {name}")
+        visiting.add(name)
+        for dep in deps[name]:
+            visit(dep)
+        ordered.append(name)
+
+    for name in names:
+        visit(name)
+    return {name: deps[name] for name in ordered}
+
+
+def stage_status(
+    conn: sqlite3.Connection,
+    name: str,
+    stages: Dict[str, Dict] = STAGES,
+    tables: Optional[TableFingerprints] = None
+) -> Dict:
+    """
+    Whether a stage is up to date.
+
+    Args:
+        conn: Connection to the pipeline database
+        name: Stage name
+        stages: Stage declarations
+        tables: Table fingerprints of the current run (default: hash afresh)
+
+    Returns:
+        Dictionary with ``up_to_date`` and the current ``input_hash``
+    """
+    spec = stages[name]
+    input_hash = fingerprint(conn, spec["inputs"], spec["params"], tables)
+    row = conn.execute("SELECT input_hash, output_hash FROM pipeline_stages WHERE name = ?", (name,)).fetchone()
+    up_to_date = (
+        row is not None
+        and row["input_hash"] == input_hash
+        and row["output_hash"] == fingerprint(conn, spec["outputs"], tables=tables)
+    )
+    return {"up_to_date": up_to_date, "input_hash": input_hash}
+
+
+def run_stage(
+    name: str,
+    force: bool = False,
+    stages: Dict[str, Dict] = STAGES,
+    db_path: Path = DB_PATH,
+    tables: Optional[TableFingerprints] = None
+) -> Dict:
+    """
+    Run one stage against ``db_path`` unless it is up to date, and record its hashes.
+
+    The stage's output tables are dropped from ``tables`` once it has run,
+    whether or not it succeeded.
+
+    Returns:
+        Dictionary with ``status`` ("ran" or "up to date"), ``rows`` and
+        ``seconds``
+    """
+    conn = get_connection(db_path)
+    try:
+        status = stage_status(conn, name, stages, tables)
+        if status["up_to_date"] and not force:
+            logger.info(f"{name} is up to date")
+            return {"status": "up to date", "rows": 0, "seconds": 0.0}
+
+        logger.info(f"Running {name}")
+        start = time.perf_counter()
+        try:
+            with stage(f"pipeline.{name}") as record:
+                rows = record.rows = stages[name]["run"](StageLogger(name), db_path) or 0
+        finally:
+            if tables is not None:
+                tables.invalidate(stages[name]["outputs"])
+        seconds = time.perf_counter() - start
+
+        conn.execute("""
+            INSERT OR REPLACE INTO pipeline_stages (name, input_hash, output_hash, rows_processed, seconds)
+            VALUES (?, ?, ?, ?, ?)
+        """, (name, status["input_hash"], fingerprint(conn, stages[name]["outputs"], tables=tables), rows, seconds))
+        conn.commit()
+        logger.info(f"{name} finished in {seconds:.1f}s ({rows} rows)")
+        return {"status": "ran", "rows": rows, "seconds": seconds}
+    finally:
+        conn.close()
+
+
+def run_pipeline(
+    names: Optional[List[str]] = None,
+    force: bool = False,
+    max_workers: int = 2,
+    stages: Dict[str, Dict] = STAGES,
+    db_path: Path = DB_PATH
+) -> Dict[str, Dict]:
+    """
+    Run the selected stages, each as soon as the stages it depends on are done.
+
+    A failing stage does not stop independent stages; the stages that
+    depend on it are marked "blocked".
+
+    Args:
+        names: Stages to run (default: ``DEFAULT_STAGES``)
+        force: Run stages even when they are up to date
+        max_workers: Stages that may run at the same time
+        stages: Stage declarations
+        db_path: Database holding the data tables and ``pipeline_stages``
+
+    Returns:
+        Dictionary mapping each stage to its ``run_stage`` result, or
+        ``{"status": "failed", "error": ...}`` / ``{"status": "blocked"}``
+    """
+    graph = stage_graph(names or DEFAULT_STAGES, stages)
+
+    conn = get_connection(db_path)
+    initialize_schema(conn)
+    conn.close()
+
+    results, running, tables = {}, {}, TableFingerprints()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while len(results) < len(graph):
+            for name, deps in graph.items():
+                if name in results or name in running.values():
+                    continue
+                dep_status = [results[dep]["status"] if dep in results else None for dep in deps]
+                if any(status in ("failed", "blocked") for status in dep_status):
+                    logger.warning(f"{name} is blocked by a failed upstream stage")
+                    results[name] = {"status": "blocked"}
+                elif all(status is not None for status in dep_status):
+                    running[pool.submit(run_stage, name, force, stages, db_path, tables)] = name
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception:
+                    error = traceback.format_exc()
+                    logger.error(f"{name} failed:\n{error}")
+                    results[name] = {"status": "failed", "error": error}
+
+    return {name: results[name] for name in graph}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=DEFAULT_STAGES)
+    parser.add_argument("--force", action="store_true", help="Run stages even when they are up to date")
+    parser.add_argument("--workers", type=int, default=2, help="Stages that may run at the same time")
+    parser.add_argument("--dry-run", action="store_true", help="Only show which stages are up to date")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="Database the stages read and write")
+    parser.add_argument("--report", type=Path, default=None, help="Write an instrumentation report (JSON) here")
+    parser.add_argument("--profile", action="store_true", help="Profile the stages with cProfile (needs --report)")
+    args = parser.parse_args()
+
+    if args.dry_run:
+        conn = get_connection(args.db)
+        initialize_schema(conn)
+        for name, deps in stage_graph(args.stages).items():
+            status = "up to date" if stage_status(conn, name)["up_to_date"] else "out of date"
+            print(f"{name:<22} {status:<12} after: {', '.join(deps) or '-'}")
+        conn.close()
+    else:
+        if args.report:
+            enable(profile=args.profile)
+        results = run_pipeline(args.stages, args.force, args.workers, db_path=args.db)
+        if args.report:
+            write_report(args.report)
+        for name, result in results.items():
+            print(f"{name:<22} {result['status']:<12} {result.get('seconds', 0):>8.1f}s "
+                  f"{result.get('rows', 0):>10} rows")
@@ -0,0 +1,201 @@
+"""Downsampling of long series before plotting.
+
+A chart cannot show more points than its axes are wide in pixels, but
+matplotlib still draws (and the PNG still encodes) every point it is
+given. Series longer than ``PLOT_DOWNSAMPLE_THRESHOLD`` are reduced to
+about one point per pixel column first:
+
+- ``lttb_indices``: Largest-Triangle-Three-Buckets, which keeps the
+  visual shape of a line (peaks, troughs, trend changes).
+- ``minmax_indices``: the lowest and highest point of every bucket, fully
+  vectorized; it never hides an extreme, at two points per bucket.
+- ``downsample_frame``: the same for a wide frame of aligned columns.
+- ``aggregate_signals``: one marker per bucket for prediction signals,
+  with the bucket's majority direction.
+
+Both index functions return sorted positions into the original arrays and
+always keep the first and last point.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import PLOT_DOWNSAMPLE_THRESHOLD
+
+METHODS = ["lttb", "minmax"]
+SIGNAL_BUCKET_PIXELS = 8
+# Target points for browser-rendered charts, whose pixel width is unknown.
+APP_CHART_POINTS = 1000
+
+
+def _as_float(x) -> np.ndarray:
+    """Numeric view of an x axis; datetimes become nanoseconds."""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").astype(np.int64).astype(float)
+    return x.astype(float)
+
+
+def lttb_indices(x, y, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets selection of ``n_out`` points.
+
+    The interior points are split into ``n_out - 2`` buckets. From each
+    bucket the point forming the largest triangle with the point picked
+    from the previous bucket and the mean of the next bucket is kept. The
+    bucket means come from one cumulative sum; only the picks themselves,
+    which depend on each other, loop over buckets.
+
+    Args:
+        x: Monotonic x values (numbers or datetimes)
+        y: y values; NaNs are never picked unless a bucket has nothing else
+        n_out: Number of points to keep (at least 3)
+
+    Returns:
+        Sorted indices of the kept points
+    """
+    x, y = _as_float(x), np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    starts, ends = edges[:-1], edges[1:]
+
+    # Mean point of every bucket, plus the last point as the bucket after the last.
+    cum_x = np.concatenate([[0.0], np.cumsum(x)])
+    cum_y = np.concatenate([[0.0], np.nancumsum(y)])
+    counts = ends - starts
+    mean_x = np.append((cum_x[ends] - cum_x[starts]) / counts, x[-1])
+    mean_y = np.append((cum_y[ends] - cum_y[starts]) / counts, y[-1])
+
+    picked = np.empty(n_out, dtype=np.int64)
+    picked[0], picked[-1] = 0, n - 1
+    previous = 0
+    for bucket, (start, end) in enumerate(zip(starts, ends)):
+        ax, ay = x[previous], y[previous]
+        cx, cy = mean_x[bucket + 1], mean_y[bucket + 1]
+        area = np.abs((ax - cx) * (y[start:end] - ay) - (ax - x[start:end]) * (cy - ay))
+        previous = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        picked[bucket + 1] = previous
+    return picked
+
+
+def minmax_indices(y, n_buckets: int) -> np.ndarray:
+    """
+    Indices of the minimum and maximum of ``n_buckets`` equal buckets.
+
+    Returns:
+        Sorted unique indices, including the first and last point; at most
+        ``2 * n_buckets + 2`` of them
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if 2 * n_buckets + 2 >= n or n_buckets < 1:
+        return np.arange(n)
+
+    size = -(-n // n_buckets)
+    padded = np.full(size * n_buckets, np.nan)
+    padded[:n] = y
+    buckets = padded.reshape(n_buckets, size)
+    offsets = np.arange(n_buckets) * size
+
+    lows = np.argmin(np.where(np.isnan(buckets), np.inf, buckets), axis=1) + offsets
+    highs = np.argmax(np.where(np.isnan(buckets), -np.inf, buckets), axis=1) + offsets
+    indices = np.concatenate([[0, n - 1], lows, highs])
+    return np.unique(indices[indices < n])
+
+
+def downsample(
+    x,
+    y,
+    n_out: int,
+    method: str = "lttb",
+    threshold: int = PLOT_DOWNSAMPLE_THRESHOLD
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a series to about ``n_out`` points if it is longer than ``threshold``.
+
+    Args:
+        x: x values (numbers or datetimes)
+        y: y values
+        n_out: Target number of points, usually the axes width in pixels
+        method: One of ``METHODS``; ``minmax`` uses ``n_out // 2`` buckets
+        threshold: Series up to this length are returned unchanged
+
+    Returns:
+        The kept ``(x, y)`` values as arrays
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    if len(y) <= threshold or n_out >= len(y):
+        return x, y
+    if method == "lttb":
+        indices = lttb_indices(x, y, n_out)
+    elif method == "minmax":
+        indices = minmax_indices(y, max(1, n_out // 2))
+    else:
+        raise ValueError(f"Unknown method: {method}. Use one of {METHODS}")
+    return x[indices], y[indices]
+
+
+def downsample_frame(df: pd.DataFrame, n_out: int, threshold: int = PLOT_DOWNSAMPLE_THRESHOLD) -> pd.DataFrame:
+    """
+    Keep the rows holding any column's per-bucket minimum or maximum.
+
+    For charts that draw every column of ``df`` against its index; all
+    columns keep the same rows, so they stay aligned.
+    """
+    if len(df) <= threshold or n_out >= len(df):
+        return df
+    n_buckets = max(1, n_out // 2)
+    keep = np.unique(np.concatenate([minmax_indices(df[column].to_numpy(dtype=float), n_buckets)
+                                     for column in df.columns]))
+    return df.iloc[keep]
+
+
+def aggregate_signals(x, y, directions, n_buckets: int) -> pd.DataFrame:
+    """
+    One signal per bucket of consecutive predictions.
+
+    Each bucket is placed at its middle row's ``x`` and ``y`` and gets the
+    direction predicted most often in it (ties go to the higher direction).
+
+    Returns:
+        DataFrame with ``x``, ``y``, ``direction`` and ``n_signals`` (the
+        bucket's size), one row per non-empty bucket
+    """
+    x, y = np.asarray(x), np.asarray(y, dtype=float)
+    directions = np.asarray(directions)
+    n = len(directions)
+    n_buckets = max(1, min(n_buckets, n))
+
+    bucket = np.arange(n) * n_buckets // max(n, 1)
+    starts = np.searchsorted(bucket, np.arange(n_buckets))
+    sizes = np.diff(np.append(starts, n))
+    middle = starts + sizes // 2
+
+    # Counts of -1 / 0 / 1 per bucket; argmax from the top so ties go up.
+    votes = np.zeros((n_buckets, 3), dtype=np.int64)
+    np.add.at(votes, (bucket, np.clip(directions.astype(int), -1, 1) + 1), 1)
+    direction = 1 - np.argmax(votes[:, ::-1], axis=1)
+
+    return pd.DataFrame({
+        "x": x[middle],
+        "y": y[middle],
+        "direction": direction,
+        "n_signals": sizes,
+    })
+
+
+def axes_pixel_width(ax, minimum: int = 100) -> int:
+    """Width of ``ax`` in display pixels at the figure's dpi."""
+    return max(minimum, int(ax.get_window_extent().width))
+
+
+def downsample_for_axes(ax, x, y, method: str = "lttb",
+                        threshold: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """``downsample`` to the pixel width of ``ax``."""
+    return downsample(x, y, axes_pixel_width(ax), method,
+                      PLOT_DOWNSAMPLE_THRESHOLD if threshold is None else threshold)
@@ -11,22 +11,12 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def plot_backtest_performance(
-    backtest_results: Dict,
-    save_path: Optional[str] = None
-):
-    """Plot cumulative returns comparison."""
-    if not backtest_results:
-        logger.warning("No backtest results to plot")
-        return
-    
+def draw_backtest_performance(ax, backtest_results: Dict):
+    """Draw strategy and buy-and-hold values on a pixel-styled axes."""
     dates = pd.to_datetime(backtest_results["dates"])
     strategy_value = backtest_results["portfolio_value"]
     buy_hold_value = backtest_results["buy_hold_value"]
     
-    fig, ax = plt.subplots(figsize=(14, 8))
-    apply_pixel_style(fig, ax)
-    
     plot_pixel_line(ax, dates, strategy_value, PIXEL_COLORS["up"], 
                    label=f"Strategy ({backtest_results['model_name']})")
     plot_pixel_line(ax, dates, buy_hold_value, PIXEL_COLORS["price"], 
@@ -38,6 +28,20 @@ def plot_backtest_performance(
                 fontsize=14, fontweight="bold")
     ax.legend(loc="upper left", facecolor=PIXEL_COLORS["background"], 
              edgecolor=PIXEL_COLORS["grid"])
+
+
+def plot_backtest_performance(
+    backtest_results: Dict,
+    save_path: Optional[str] = None
+):
+    """Plot cumulative returns comparison."""
+    if not backtest_results:
+        logger.warning("No backtest results to plot")
+        return
+    
+    fig, ax = plt.subplots(figsize=(14, 8))
+    apply_pixel_style(fig, ax)
+    draw_backtest_performance(ax, backtest_results)
     
     plt.tight_layout()
     
@@ -5,13 +5,46 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from typing import Optional
 
+from src.config import PLOT_DOWNSAMPLE_THRESHOLD
 from src.database.db_utils import get_connection
+from src.visualization.downsampling import SIGNAL_BUCKET_PIXELS, aggregate_signals, axes_pixel_width
 from src.visualization.style_pixel_theme import apply_pixel_style, plot_pixel_line, PIXEL_COLORS
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def draw_price_with_signals(ax, df: pd.DataFrame, ticker: str, model_name: str):
+    """
+    Draw the price line and prediction signals on a pixel-styled axes.
+    
+    Args:
+        ax: Axes already styled with ``apply_pixel_style``
+        df: Rows sorted by date with ``date``, ``adjusted_close`` and ``predicted_direction``
+        ticker: Ticker shown in the title
+        model_name: Model shown in the title
+    """
+    plot_pixel_line(ax, df["date"], df["adjusted_close"], PIXEL_COLORS["price"], label="Price")
+    
+    signals = pd.DataFrame({
+        "x": df["date"], "y": df["adjusted_close"], "direction": df["predicted_direction"], "n_signals": 1
+    })
+    if len(df) > PLOT_DOWNSAMPLE_THRESHOLD:
+        n_buckets = axes_pixel_width(ax) // SIGNAL_BUCKET_PIXELS
+        signals = aggregate_signals(df["date"], df["adjusted_close"], df["predicted_direction"], n_buckets)
+    
+    for direction, name in [(1, "up"), (-1, "down"), (0, "flat")]:
+        mask = signals["direction"] == direction
+        if mask.any():
+            ax.scatter(signals.loc[mask, "x"], signals.loc[mask, "y"],
+                      color=PIXEL_COLORS[name], marker="s", s=50, label=name.capitalize(), zorder=5)
+    
+    ax.set_xlabel("Date", fontsize=12, fontweight="bold")
+    ax.set_ylabel("Price", fontsize=12, fontweight="bold")
+    ax.set_title(f"{ticker} - Price with {model_name} Signals", fontsize=14, fontweight="bold")
+    ax.legend(loc="upper left", facecolor=PIXEL_COLORS["background"], edgecolor=PIXEL_COLORS["grid"])
+
+
 def plot_price_with_signals(
     ticker: str,
     model_name: str,
@@ -56,27 +89,7 @@ def plot_price_with_signals(
     
     fig, ax = plt.subplots(figsize=(14, 8))
     apply_pixel_style(fig, ax)
-    
-    plot_pixel_line(ax, df["date"], df["adjusted_close"], PIXEL_COLORS["price"], label="Price")
-    
-    up_mask = df["predicted_direction"] == 1
-    down_mask = df["predicted_direction"] == -1
-    flat_mask = df["predicted_direction"] == 0
-    
-    if up_mask.any():
-        ax.scatter(df.loc[up_mask, "date"], df.loc[up_mask, "adjusted_close"],
-                  color=PIXEL_COLORS["up"], marker="s", s=50, label="Up", zorder=5)
-    if down_mask.any():
-        ax.scatter(df.loc[down_mask, "date"], df.loc[down_mask, "adjusted_close"],
-                  color=PIXEL_COLORS["down"], marker="s", s=50, label="Down", zorder=5)
-    if flat_mask.any():
-        ax.scatter(df.loc[flat_mask, "date"], df.loc[flat_mask, "adjusted_close"],
-                  color=PIXEL_COLORS["flat"], marker="s", s=50, label="Flat", zorder=5)
-    
-    ax.set_xlabel("Date", fontsize=12, fontweight="bold")
-    ax.set_ylabel("Price", fontsize=12, fontweight="bold")
-    ax.set_title(f"{ticker} - Price with {model_name} Signals", fontsize=14, fontweight="bold")
-    ax.legend(loc="upper left", facecolor=PIXEL_COLORS["background"], edgecolor=PIXEL_COLORS["grid"])
+    draw_price_with_signals(ax, df, ticker, model_name)
     
     plt.tight_layout()
     
@@ -0,0 +1,292 @@
+"""Render price/signal and performance charts for every (ticker, model) pair.
+
+Instead of calling ``plot_price_with_signals`` and
+``plot_backtest_performance`` once per pair (two queries and a fresh
+figure each), the report:
+
+1. loads prices and signals of all pairs with one query and backtests all
+   pairs at once with ``backtest_matrix``;
+2. renders the pairs in a process pool on the Agg backend. Every worker
+   builds one styled figure per chart kind and reuses it, clearing only the
+   data artists between charts, so figure creation and
+   ``apply_pixel_style`` run once per worker instead of once per chart;
+3. writes the PNGs and an ``index.html`` with the metrics table into
+   ``REPORTS_DIR``.
+
+The run logs and returns the render throughput in charts per second.
+"""
+
+import html
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from src.config import REPORTS_DIR
+from src.database.db_utils import get_connection
+from src.models.matrix_backtest import backtest_matrix, load_backtest_panel
+from src.models.worker_pool import limit_worker_threads
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CHART_KINDS = ["signals", "performance"]
+FIGURE_SIZE = (14, 8)
+FIGURE_DPI = 150
+# Fixed margins replace a tight_layout pass per chart.
+FIGURE_MARGINS = {"left": 0.07, "right": 0.98, "bottom": 0.08, "top": 0.93}
+
+_templates: Dict[str, tuple] = {}
+
+
+def load_report_data(
+    tickers: Optional[List[str]] = None,
+    model_names: Optional[List[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    conn: Optional[sqlite3.Connection] = None
+) -> List[Dict]:
+    """
+    Load everything the charts need for all (ticker, model) pairs.
+
+    Returns:
+        One dictionary per pair with ``ticker``, ``model_name``, the
+        ``signals`` frame (date, adjusted_close, predicted_direction) and
+        the ``backtest`` results (dates, values and summary metrics)
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+
+    query = """
+        SELECT s.ticker, p.model_name, p.date, pr.adjusted_close, p.predicted_direction
+        FROM predictions p
+        JOIN prices pr ON p.symbol_id = pr.symbol_id AND p.date = pr.date
+        JOIN symbols s ON p.symbol_id = s.id
+        WHERE 1 = 1
+    """
+    params = []
+    if tickers:
+        query += f" AND s.ticker IN ({','.join('?' * len(tickers))})"
+        params.extend(tickers)
+    if model_names:
+        query += f" AND p.model_name IN ({','.join('?' * len(model_names))})"
+        params.extend(model_names)
+    if start_date:
+        query += " AND p.date >= ?"
+        params.append(start_date)
+    if end_date:
+        query += " AND p.date <= ?"
+        params.append(end_date)
+    query += " ORDER BY s.ticker, p.model_name, p.date"
+
+    signals = pd.read_sql_query(query, conn, params=params)
+    panel = load_backtest_panel(tickers, model_names, start_date, end_date, conn=conn)
+    if own_conn:
+        conn.close()
+
+    signals["date"] = pd.to_datetime(signals["date"])
+    backtests = {}
+    if not panel["columns"].empty:
+        results = backtest_matrix(panel["positions"], panel["returns"], panel["mask"])
+        for j, (ticker, model_name) in enumerate(panel["columns"][["ticker", "model_name"]].itertuples(index=False)):
+            mask = panel["mask"][:, j]
+            backtests[(ticker, model_name)] = {
+                "ticker": ticker,
+                "model_name": model_name,
+                "dates": panel["dates"][mask],
+                "portfolio_value": results["portfolio_value"][mask, j],
+                "buy_hold_value": results["buy_hold_value"][mask, j],
+                **{metric: float(results[metric][j])
+                   for metric in ["total_return", "buy_hold_return", "sharpe_ratio", "max_drawdown"]},
+            }
+
+    pairs = []
+    for (ticker, model_name), group in signals.groupby(["ticker", "model_name"], sort=True):
+        pairs.append({
+            "ticker": ticker,
+            "model_name": model_name,
+            "signals": group.drop(columns=["ticker", "model_name"]).reset_index(drop=True),
+            "backtest": backtests.get((ticker, model_name)),
+        })
+    return pairs
+
+
+def _init_renderer() -> None:
+    """Process-pool initializer: one BLAS thread and the non-interactive backend."""
+    limit_worker_threads(1)
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def _template(kind: str):
+    """The worker's reusable styled figure for ``kind``."""
+    if kind not in _templates:
+        import matplotlib.pyplot as plt
+
+        from src.visualization.style_pixel_theme import apply_pixel_style
+
+        fig, ax = plt.subplots(figsize=FIGURE_SIZE)
+        apply_pixel_style(fig, ax)
+        fig.subplots_adjust(**FIGURE_MARGINS)
+        _templates[kind] = (fig, ax)
+    return _templates[kind]
+
+
+def _clear_data(ax) -> None:
+    """Remove the previous chart's lines, markers and legend, keeping the styling."""
+    for artist in list(ax.lines) + list(ax.collections):
+        artist.remove()
+    if ax.get_legend() is not None:
+        ax.get_legend().remove()
+
+
+def _save(kind: str, draw, path: Path) -> None:
+    from src.visualization.style_pixel_theme import PIXEL_COLORS
+
+    fig, ax = _template(kind)
+    _clear_data(ax)
+    draw(ax)
+    ax.relim()
+    ax.autoscale_view()
+    fig.savefig(path, facecolor=PIXEL_COLORS["background"], dpi=FIGURE_DPI)
+
+
+def render_pair(pair: Dict, output_dir: Path) -> List[str]:
+    """
+    Render the charts of one pair into ``output_dir``.
+
+    Returns:
+        File names of the written PNGs
+    """
+    from src.visualization.plot_performance import draw_backtest_performance
+    from src.visualization.plot_price_and_signals import draw_price_with_signals
+
+    stem = f"{pair['ticker']}_{pair['model_name']}"
+    written = []
+    if not pair["signals"].empty:
+        name = f"{stem}_signals.png"
+        _save("signals", lambda ax: draw_price_with_signals(ax, pair["signals"], pair["ticker"], pair["model_name"]),
+              output_dir / name)
+        written.append(name)
+    if pair["backtest"] is not None:
+        name = f"{stem}_performance.png"
+        _save("performance", lambda ax: draw_backtest_performance(ax, pair["backtest"]), output_dir / name)
+        written.append(name)
+    return written
+
+
+def write_index(pairs: List[Dict], files: List[List[str]], output_dir: Path) -> Path:
+    """Write ``index.html`` with one row of metrics and charts per pair."""
+    rows = []
+    for pair, names in zip(pairs, files):
+        backtest = pair["backtest"] or {}
+        cells = [html.escape(pair["ticker"]), html.escape(pair["model_name"])]
+        cells += [f"{backtest[metric]:.2f}" if metric in backtest else ""
+                  for metric in ["total_return", "buy_hold_return", "sharpe_ratio", "max_drawdown"]]
+        cells += [f'<a href="{html.escape(name)}"><img src="{html.escape(name)}" width="360"></a>' for name in names]
+        rows.append("<tr>" + "".join(f"<td>{cell}</td>" for cell in cells) + "</tr>")
+
+    header = ["ticker", "model", "total return %", "buy &amp; hold %", "sharpe", "max drawdown %", "charts"]
+    page = f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>stockly report</title>
+<style>
+  body {{ background: #000000; color: #FFFFFF; font-family: monospace; }}
+  td, th {{ border: 2px solid #333333; padding: 4px 8px; text-align: right; }}
+  table {{ border-collapse: collapse; }}
+</style>
+</head>
+<body>
+<h1>stockly report</h1>
+<p>generated {time.strftime("%Y-%m-%d %H:%M")}, {len(pairs)} pairs</p>
+<table>
+<tr>{"".join(f"<th>{column}</th>" for column in header[:-1])}<th colspan="2">{header[-1]}</th></tr>
+{chr(10).join(rows)}
+</table>
+</body>
+</html>
+"""
+    path = output_dir / "index.html"
+    path.write_text(page)
+    return path
+
+
+def render_reports(
+    tickers: Optional[List[str]] = None,
+    model_names: Optional[List[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    output_dir: Path = REPORTS_DIR,
+    max_workers: Optional[int] = None
+) -> Dict:
+    """
+    Render the charts of every (ticker, model) pair and an index page.
+
+    Args:
+        tickers: Restrict to these tickers (default: all)
+        model_names: Restrict to these models (default: all)
+        start_date: First prediction date (inclusive)
+        end_date: Last prediction date (inclusive)
+        output_dir: Directory for the PNGs and ``index.html``
+        max_workers: Render processes (default: CPU count)
+
+    Returns:
+        Dictionary with ``index`` path, ``n_pairs``, ``n_charts``,
+        ``load_seconds``, ``render_seconds`` and ``charts_per_second``
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    pairs = load_report_data(tickers, model_names, start_date, end_date)
+    load_seconds = time.perf_counter() - start
+    logger.info(f"Loaded {len(pairs)} pairs in {load_seconds:.2f}s")
+
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(pairs)))
+    chunksize = max(1, len(pairs) // (max_workers * 4))
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_renderer) as pool:
+        files = list(pool.map(render_pair, pairs, [output_dir] * len(pairs), chunksize=chunksize))
+    render_seconds = time.perf_counter() - start
+
+    n_charts = sum(len(names) for names in files)
+    index = write_index(pairs, files, output_dir)
+    throughput = n_charts / render_seconds if render_seconds > 0 else float(n_charts)
+    logger.info(f"Rendered {n_charts} charts with {max_workers} workers in {render_seconds:.2f}s "
+                f"({throughput:.1f} charts/s)")
+    logger.info(f"Report written to {index}")
+
+    return {
+        "index": index,
+        "n_pairs": len(pairs),
+        "n_charts": n_charts,
+        "load_seconds": load_seconds,
+        "render_seconds": render_seconds,
+        "charts_per_second": throughput,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", nargs="*", default=None)
+    parser.add_argument("--models", nargs="*", default=None)
+    parser.add_argument("--start", default=None)
+    parser.add_argument("--end", default=None)
+    parser.add_argument("--output-dir", type=Path, default=REPORTS_DIR)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    summary = render_reports(args.tickers, args.models, args.start, args.end, args.output_dir, args.workers)
+    for key, value in summary.items():
+        print(f"{key}: {value}")
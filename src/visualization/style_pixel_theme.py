@@ -3,6 +3,8 @@
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 
+from src.visualization.downsampling import downsample_for_axes
+
 
 PIXEL_COLORS = {
     "up": "#00FF00",
@@ -38,7 +40,8 @@ def apply_pixel_style(fig, ax):
 
 
 def plot_pixel_line(ax, x, y, color, label=None, linewidth=3):
-    """Plot line with pixel-style appearance."""
+    """Plot line with pixel-style appearance, downsampled to the axes width if long."""
+    x, y = downsample_for_axes(ax, x, y)
     ax.plot(x, y, color=color, linewidth=linewidth, marker="s", markersize=4, 
             markevery=max(1, len(x)//50), label=label, drawstyle="steps-mid")
 
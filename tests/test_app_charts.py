@@ -0,0 +1,30 @@
+"""Tests for the app's client-side Vega-Lite charts."""
+
+import numpy as np
+import pandas as pd
+
+from src.app.charts import performance_chart, rolling_chart
+from src.visualization.downsampling import APP_CHART_POINTS
+from src.visualization.style_pixel_theme import PIXEL_COLORS
+
+
+def test_charts_are_downsampled_and_use_the_pixel_palette():
+    """Test long series are reduced per series and colored from PIXEL_COLORS."""
+    dates = pd.date_range("2000-01-03", periods=20000)
+    strategy = np.cumprod(1 + np.random.default_rng(0).normal(0, 0.01, 20000))
+
+    data, spec = performance_chart(dates, strategy, np.linspace(1, 2, 20000))
+    counts = data["series"].value_counts()
+    assert counts["strategy"] == APP_CHART_POINTS and counts["buy & hold"] == APP_CHART_POINTS
+    assert data["value"].dtype == np.float32
+    assert spec["encoding"]["color"]["scale"]["range"] == [PIXEL_COLORS["up"], PIXEL_COLORS["price"]]
+    assert spec["params"][0]["bind"] == "scales"
+
+    rolling = pd.DataFrame({
+        "date": np.tile(dates[:50], 2),
+        "window_days": np.repeat([20, 60], 50),
+        "rolling_sharpe": np.arange(100, dtype=float),
+    })
+    data, spec = rolling_chart(rolling)
+    assert data["series"].unique().tolist() == ["20d", "60d"]
+    assert len(data) == 100
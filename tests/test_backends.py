@@ -0,0 +1,49 @@
+"""Tests for model backend plugins."""
+
+import tempfile
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from src.models.backends import get_backend, load_model, resolve_backend
+
+
+def test_sklearn_model_resolves_and_scores():
+    """Test a pickled sklearn model is found and scored through the sklearn backend."""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(60, 4))
+    y = np.repeat([-1, 0, 1], 20)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        models_dir = Path(tmp)
+        joblib.dump(LogisticRegression(max_iter=200).fit(X, y), models_dir / "toy.pkl")
+
+        assert resolve_backend("toy", models_dir=models_dir).name == "sklearn"
+        assert resolve_backend("missing", models_dir=models_dir) is None
+
+        model = load_model("toy", models_dir=models_dir)
+        assert model.predict_proba(X).shape == (60, 3)
+        assert set(model.predict(X)) <= {-1, 0, 1}
+
+
+def test_unknown_backend_raises():
+    """Test unknown backend names are rejected."""
+    with pytest.raises(ValueError):
+        get_backend("does_not_exist")
+
+
+def test_incomplete_backend_cannot_be_instantiated():
+    """Test a backend without ``predict_proba`` fails when created, not when first used."""
+    from src.models.backends import ModelBackend
+
+    class LoadOnly(ModelBackend):
+        name = "load_only"
+
+        def load(self, path):
+            return None
+
+    with pytest.raises(TypeError):
+        LoadOnly()
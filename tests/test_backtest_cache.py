@@ -0,0 +1,98 @@
+"""Tests for the persisted backtest cache."""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.database.db_utils import get_connection, initialize_schema, get_or_create_symbol, insert_predictions, insert_targets
+from src.models.backtest_cache import (
+    cached_backtest_model, fill_backtest_cache, missing_summaries, query_backtest_summaries
+)
+
+
+def test_cache_hit_and_invalidation_on_rewrite():
+    """Test repeated queries are served from the table until predictions change."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        db_path = Path(tmp.name)
+
+    try:
+        conn = get_connection(db_path)
+        initialize_schema(conn)
+        symbol_id = get_or_create_symbol(conn, "TEST")
+
+        rng = np.random.default_rng(0)
+        dates = pd.date_range("2022-01-03", periods=30)
+        returns = rng.normal(0, 0.01, 30)
+        insert_targets(conn, symbol_id, pd.DataFrame({
+            "date": dates, "next_day_return": returns, "direction_label": np.sign(returns).astype(int)
+        }))
+        predictions = pd.DataFrame({"date": dates, "predicted_direction": rng.integers(-1, 2, 30)})
+        insert_predictions(conn, symbol_id, predictions, "test_model")
+
+        first = cached_backtest_model("TEST", "test_model", conn=conn)
+        second = cached_backtest_model("TEST", "test_model", conn=conn)
+        assert not first["cached"] and second["cached"]
+        assert second["sharpe_ratio"] == first["sharpe_ratio"]
+        np.testing.assert_allclose(second["portfolio_value"], first["portfolio_value"], rtol=1e-6)
+
+        insert_predictions(conn, symbol_id, predictions.assign(predicted_direction=1), "test_model")
+        rewritten = cached_backtest_model("TEST", "test_model", conn=conn)
+        assert not rewritten["cached"]
+        np.testing.assert_allclose(rewritten["buy_hold_return"], rewritten["total_return"])
+
+        conn.close()
+    finally:
+        if db_path.exists():
+            db_path.unlink()
+
+
+def test_fill_and_page_summaries():
+    """Test missing full-range backtests are stored in bulk and paged in SQL order."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        db_path = Path(tmp.name)
+
+    try:
+        conn = get_connection(db_path)
+        initialize_schema(conn)
+
+        rng = np.random.default_rng(1)
+        dates = pd.date_range("2022-01-03", periods=30)
+        for ticker in ["AAA", "BBB", "CCC"]:
+            symbol_id = get_or_create_symbol(conn, ticker)
+            returns = rng.normal(0, 0.01, 30)
+            insert_targets(conn, symbol_id, pd.DataFrame({
+                "date": dates, "next_day_return": returns, "direction_label": np.sign(returns).astype(int)
+            }))
+            for model_name in ["model_a", "model_b"]:
+                insert_predictions(conn, symbol_id, pd.DataFrame({
+                    "date": dates, "predicted_direction": rng.integers(-1, 2, 30)
+                }), model_name)
+
+        assert len(missing_summaries(conn)) == 6
+        assert fill_backtest_cache(conn=conn) == 6
+        assert len(missing_summaries(conn)) == 0
+
+        total, first = query_backtest_summaries(conn, limit=4)
+        _, rest = query_backtest_summaries(conn, limit=4, offset=4)
+        sharpe = pd.concat([first, rest])["sharpe_ratio"].tolist()
+        assert total == 6 and len(first) == 4 and len(rest) == 2
+        assert sharpe == sorted(sharpe, reverse=True)
+
+        stored = first.iloc[0]
+        served = cached_backtest_model(stored["ticker"], stored["model_name"], conn=conn)
+        assert served["cached"]
+        np.testing.assert_allclose(served["sharpe_ratio"], stored["sharpe_ratio"])
+
+        total, page = query_backtest_summaries(conn, search="b", model_names=["model_a"])
+        assert total == 1 and page.iloc[0][["ticker", "model_name"]].tolist() == ["BBB", "model_a"]
+
+        symbol_id = get_or_create_symbol(conn, "BBB")
+        insert_predictions(conn, symbol_id, pd.DataFrame({"date": dates, "predicted_direction": 1}), "model_a")
+        assert missing_summaries(conn)[["ticker", "model_name"]].values.tolist() == [["BBB", "model_a"]]
+
+        conn.close()
+    finally:
+        if db_path.exists():
+            db_path.unlink()
@@ -0,0 +1,29 @@
+"""Tests for the baseline model trainers."""
+
+import tempfile
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.config import HGB_MAX_BINS, MODEL_DTYPE
+from src.models import train_baseline_models
+from src.models.build_datasets import FEATURE_COLS
+
+
+def test_hist_gradient_boosting_trains_on_float32_and_saves(monkeypatch):
+    """Test the HGB baseline fits float32 features, learns a clear signal and is saved."""
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(600, len(FEATURE_COLS))).astype(MODEL_DTYPE), columns=FEATURE_COLS)
+    y = pd.Series(np.digitize(X["return_1d"], [-0.5, 0.5]) - 1, name="direction_label")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        monkeypatch.setattr(train_baseline_models, "MODELS_DIR", Path(tmp))
+        model = train_baseline_models.train_hist_gradient_boosting(X[:500], y[:500], X[500:], y[500:])
+
+        assert model.max_bins == HGB_MAX_BINS
+        assert list(model.classes_) == [-1, 0, 1]
+        assert (model.predict(X[500:]) == y[500:]).mean() > 0.9
+        saved = joblib.load(Path(tmp) / "hist_gradient_boosting.pkl")
+        np.testing.assert_allclose(saved.predict_proba(X[500:]), model.predict_proba(X[500:]))
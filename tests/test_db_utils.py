@@ -52,3 +52,107 @@ def test_symbol_creation():
         if db_path.exists():
             db_path.unlink()
 
+
+
+def test_coverage_tables_track_inserts():
+    """Test coverage summaries follow overlapping inserts and match a full rebuild."""
+    from src.database.db_utils import insert_predictions, rebuild_coverage
+    
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        db_path = Path(tmp.name)
+    
+    try:
+        conn = get_connection(db_path)
+        initialize_schema(conn)
+        symbol_id = get_or_create_symbol(conn, "TEST")
+        
+        dates = pd.date_range("2022-01-03", periods=10)
+        prices = pd.DataFrame({"date": dates, "close": range(10)})
+        insert_prices(conn, symbol_id, prices.iloc[:6])
+        insert_prices(conn, symbol_id, prices.iloc[4:])
+        predictions = pd.DataFrame({"date": dates, "predicted_direction": 1})
+        insert_predictions(conn, symbol_id, predictions.iloc[3:], "m")
+        insert_predictions(conn, symbol_id, predictions.iloc[:5], "m")
+        
+        price_row = tuple(conn.execute("SELECT n_rows, min_date, max_date FROM price_coverage").fetchone())
+        prediction_row = tuple(conn.execute("SELECT n_rows, min_date, max_date FROM prediction_coverage").fetchone())
+        assert price_row == (10, "2022-01-03", "2022-01-12")
+        assert prediction_row == (10, "2022-01-03", "2022-01-12")
+        
+        rebuild_coverage(conn)
+        assert tuple(conn.execute("SELECT n_rows, min_date, max_date FROM price_coverage").fetchone()) == price_row
+        assert tuple(conn.execute("SELECT n_rows, min_date, max_date FROM prediction_coverage").fetchone()) == prediction_row
+        
+        conn.close()
+    finally:
+        if db_path.exists():
+            db_path.unlink()
+
+
+def test_feature_query_dtypes():
+    """Test features are float64 by default, cast on request, and returns always stay float64."""
+    import numpy as np
+    from src.config import MODEL_DTYPE
+    from src.database.db_utils import FEATURE_FLOAT_COLS, insert_features, insert_targets, query_features_and_targets
+    
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        db_path = Path(tmp.name)
+    
+    try:
+        conn = get_connection(db_path)
+        initialize_schema(conn)
+        symbol_id = get_or_create_symbol(conn, "TEST")
+        
+        dates = pd.date_range("2022-01-03", periods=5)
+        insert_features(conn, symbol_id, pd.DataFrame(0.1, index=range(5), columns=FEATURE_FLOAT_COLS).assign(date=dates))
+        insert_targets(conn, symbol_id, pd.DataFrame({
+            "date": dates, "next_day_return": 0.1, "direction_label": 1
+        }))
+        conn.commit()
+        
+        default = query_features_and_targets(conn)
+        assert (default[FEATURE_FLOAT_COLS].dtypes == np.float64).all()
+        assert default["next_day_return"].dtype == np.float64
+        assert default["next_day_return"].iloc[0] == 0.1
+        
+        cast = query_features_and_targets(conn, dtype=MODEL_DTYPE)
+        assert (cast[FEATURE_FLOAT_COLS].dtypes == MODEL_DTYPE).all()
+        assert cast["next_day_return"].dtype == np.float64
+        conn.close()
+    finally:
+        if db_path.exists():
+            db_path.unlink()
+
+
+def test_prediction_values_round_trip():
+    """Test bulk-inserted predictions keep integer directions and store missing values as NULL."""
+    import numpy as np
+    from src.database.db_utils import insert_predictions
+    
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        db_path = Path(tmp.name)
+    
+    try:
+        conn = get_connection(db_path)
+        initialize_schema(conn)
+        symbol_id = get_or_create_symbol(conn, "TEST")
+        
+        insert_predictions(conn, symbol_id, pd.DataFrame({
+            "date": pd.date_range("2022-01-03", periods=3),
+            "predicted_direction": [1.0, np.nan, -1.0],
+            "prob_up": [0.7, 0.2, np.nan],
+        }), "m")
+        
+        rows = conn.execute("""
+            SELECT date, predicted_direction, typeof(predicted_direction), predicted_return, prob_up
+            FROM predictions ORDER BY date
+        """).fetchall()
+        assert [tuple(row) for row in rows] == [
+            ("2022-01-03", 1, "integer", None, 0.7),
+            ("2022-01-04", None, "null", None, 0.2),
+            ("2022-01-05", -1, "integer", None, None),
+        ]
+        conn.close()
+    finally:
+        if db_path.exists():
+            db_path.unlink()
@@ -0,0 +1,58 @@
+"""Tests for plot downsampling."""
+
+import numpy as np
+import pandas as pd
+
+from src.visualization.downsampling import aggregate_signals, downsample, lttb_indices, minmax_indices
+
+
+def reference_lttb(x, y, n_out):
+    """Point-by-point LTTB as in the original description."""
+    n = len(y)
+    every = (n - 2) / (n_out - 2)
+    picked, a = [0], 0
+    for i in range(n_out - 2):
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        next_start, next_end = end, min(int((i + 2) * every) + 1, n)
+        if i == n_out - 3:
+            next_start, next_end = n - 1, n
+        cx, cy = np.mean(x[next_start:next_end]), np.mean(y[next_start:next_end])
+        areas = [abs((x[a] - cx) * (y[j] - y[a]) - (x[a] - x[j]) * (cy - y[a])) for j in range(start, end)]
+        a = start + int(np.argmax(areas))
+        picked.append(a)
+    return np.array(picked + [n - 1])
+
+
+def test_lttb_matches_reference_and_keeps_shape():
+    """Test LTTB picks the same points as a scalar loop and keeps the endpoints."""
+    rng = np.random.default_rng(0)
+    x = np.arange(5000, dtype=float)
+    y = np.cumsum(rng.normal(size=5000))
+
+    indices = lttb_indices(x, y, 300)
+    assert len(indices) == 300
+    assert indices[0] == 0 and indices[-1] == 4999
+    assert np.all(np.diff(indices) > 0)
+    np.testing.assert_array_equal(indices, reference_lttb(x, y, 300))
+
+    dates = pd.date_range("1990-01-01", periods=5000).to_numpy()
+    kept_x, kept_y = downsample(dates, y, 300, threshold=1000)
+    np.testing.assert_array_equal(kept_x, dates[indices])
+    assert len(downsample(dates, y, 300, threshold=10000)[0]) == 5000
+
+
+def test_minmax_keeps_extremes_and_signals_vote():
+    """Test min/max bucketing keeps every bucket's extremes and signals use the majority."""
+    rng = np.random.default_rng(1)
+    y = rng.normal(size=10007)
+    y[123] = np.nan
+
+    indices = minmax_indices(y, 100)
+    assert len(indices) <= 202
+    assert {0, 10006, int(np.nanargmin(y)), int(np.nanargmax(y))} <= set(indices.tolist())
+
+    directions = np.array([1, 1, -1, 0, 0, -1, -1, -1, 1, 0])
+    signals = aggregate_signals(np.arange(10), np.arange(10) * 2.0, directions, 3)
+    assert signals["n_signals"].tolist() == [4, 3, 3]
+    assert signals["direction"].tolist() == [1, -1, 1]
+    assert signals["x"].tolist() == [2, 5, 8]
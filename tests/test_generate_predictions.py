@@ -0,0 +1,47 @@
+"""Tests for storing model predictions."""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.config import MODEL_DTYPE
+from src.database.db_utils import (
+    FEATURE_FLOAT_COLS, get_connection, get_or_create_symbol, initialize_schema, insert_features, insert_targets
+)
+from src.models.generate_predictions import generate_baseline_predictions
+
+
+class _RecordingModel:
+    """Stands in for a loaded model and records the dtypes it is scored on."""
+
+    def __init__(self):
+        self.dtypes = set()
+
+    def predict(self, X):
+        self.dtypes.update(X.dtypes)
+        return np.ones(len(X), dtype=int)
+
+    def predict_proba(self, X):
+        self.dtypes.update(X.dtypes)
+        return np.tile([0.2, 0.3, 0.5], (len(X), 1))
+
+
+def test_baseline_inference_uses_the_model_dtype():
+    """Test stored predictions come from features read as ``MODEL_DTYPE``, like training."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "predictions.db"
+        conn = get_connection(db_path)
+        initialize_schema(conn)
+        symbol_id = get_or_create_symbol(conn, "TEST")
+        dates = pd.date_range("2022-01-03", periods=8)
+        insert_features(conn, symbol_id, pd.DataFrame(0.1, index=range(8), columns=FEATURE_FLOAT_COLS).assign(date=dates))
+        insert_targets(conn, symbol_id, pd.DataFrame({"date": dates, "next_day_return": 0.01, "direction_label": 1}))
+        conn.commit()
+
+        model = _RecordingModel()
+        assert generate_baseline_predictions("TEST", "recording", model=model, db_path=db_path) == 8
+        assert model.dtypes == {np.dtype(MODEL_DTYPE)}
+        assert conn.execute("SELECT COUNT(*) FROM predictions WHERE model_name = 'recording'").fetchone()[0] == 8
+        conn.close()
@@ -0,0 +1,55 @@
+"""Tests for the hyperparameter search helpers."""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from src.database.db_utils import get_connection, initialize_schema
+from src.models.hyperparameter_search import PRUNING_MIN_TRIALS, PRUNING_WARMUP_EPOCHS, _report_epoch
+from src.models.sequence_dataset import sequence_windows
+
+
+def test_sequence_windows_stay_within_segments():
+    """Test windows are cut per segment, labelled with the next row and split by ``is_train``."""
+    features = np.arange(25, dtype=np.float32).reshape(25, 1)
+    arrays = {
+        "features": features,
+        "labels": np.arange(25),
+        "is_train": np.arange(25) % 10 < 7,
+        "offsets": np.array([0, 10, 12, 25]),
+    }
+    X_train, y_train, X_val, y_val = sequence_windows(arrays, lookback=3)
+
+    # Segments of 10, 2 (too short) and 13 rows give 7 + 0 + 10 windows.
+    assert len(X_train) + len(X_val) == 17
+    assert X_train.shape[1:] == (3, 1)
+    windows = np.concatenate([X_train, X_val])[:, :, 0]
+    labels = np.concatenate([y_train, y_val])
+    assert (np.diff(windows, axis=1) == 1).all()
+    np.testing.assert_array_equal(windows[:, -1] + 1, labels)
+    assert not np.isin(labels, [10, 11, 12, 13, 14]).any()
+    assert (y_train % 10 < 7).all() and (y_val % 10 >= 7).all()
+
+
+def test_report_epoch_prunes_against_the_median():
+    """Test a trial is pruned only after warm-up, with enough peers, when worse than their median."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "search.db"
+        conn = get_connection(db_path)
+        initialize_schema(conn)
+        conn.close()
+
+        epoch = PRUNING_WARMUP_EPOCHS
+        for trial in range(PRUNING_MIN_TRIALS - 1):
+            assert not _report_epoch("study", trial, epoch, 1.0 + trial, db_path)
+        assert not _report_epoch("study", 99, epoch, 10.0, db_path)
+
+        assert not _report_epoch("study", PRUNING_MIN_TRIALS, epoch - 1, 10.0, db_path)
+        assert _report_epoch("study", PRUNING_MIN_TRIALS, epoch, 10.0, db_path)
+        assert not _report_epoch("study", PRUNING_MIN_TRIALS + 1, epoch, 0.5, db_path)
+        assert not _report_epoch("other_study", 0, epoch, 10.0, db_path)
+
+        conn = get_connection(db_path)
+        assert conn.execute("SELECT COUNT(*) FROM hyperparameter_trial_epochs").fetchone()[0] == 7
+        conn.close()
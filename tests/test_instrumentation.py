@@ -0,0 +1,62 @@
+"""Tests for the stage instrumentation."""
+
+import json
+import pstats
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src import instrumentation
+from src.instrumentation import compare_reports, enable, instrument, load_report, stage, write_report
+
+
+@instrument(rows="frame")
+def _scale(frame: pd.DataFrame, factor: float = 2.0) -> pd.DataFrame:
+    return frame * factor
+
+
+@instrument()
+def _window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    return np.convolve(values, np.ones(window), mode="valid")
+
+
+def test_stages_are_recorded_reported_and_compared():
+    """Test calls, rows and nesting are recorded only while enabled, and reports compare."""
+    try:
+        instrumentation.disable()
+        _scale(pd.DataFrame({"a": range(10)}))
+        assert instrumentation.report()["stages"] == {}
+
+        enable(profile=True)
+        with stage("outer") as record:
+            for _ in range(3):
+                record.rows += len(_scale(pd.DataFrame({"a": range(100)})))
+            _window_sums(np.arange(1000.0), 10)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            base = write_report(Path(tmp) / "base.json")
+            assert base.with_suffix(".prof").exists()
+            report = load_report(base)
+
+            stages = report["stages"]
+            assert list(stages)[0] == "outer"
+            assert stages["outer"]["calls"] == 1 and stages["outer"]["rows"] == 300
+            assert stages["test_instrumentation._scale"]["calls"] == 3
+            assert stages["test_instrumentation._scale"]["rows"] == 300
+            assert stages["test_instrumentation._window_sums"]["rows"] == 991
+            assert stages["outer"]["wall_seconds"] >= stages["test_instrumentation._scale"]["wall_seconds"]
+            assert stages["outer"]["peak_rss_mb"] > 0
+            assert 0 < len(report["profile"]) <= instrumentation.PROFILE_TOP_FUNCTIONS
+            profiled = pstats.Stats(str(base.with_suffix(".prof"))).stats
+            assert any(function == "_window_sums" for _, _, function in profiled)
+
+            slower = json.loads(json.dumps(report))
+            slower["stages"]["outer"]["wall_seconds"] *= 2
+            del slower["stages"]["test_instrumentation._window_sums"]
+            rows = {row["stage"]: row for row in compare_reports(report, slower)}
+            assert round(rows["outer"]["wall_change_pct"]) == 100
+            assert rows["test_instrumentation._window_sums"]["new_wall_seconds"] is None
+    finally:
+        instrumentation.disable()
@@ -0,0 +1,68 @@
+"""Tests for the background pipeline job runner."""
+
+import tempfile
+from pathlib import Path
+
+from src.app import job_runner
+from src.database.db_utils import get_connection, initialize_schema
+
+
+def test_run_job_reports_progress_and_failures(monkeypatch):
+    """Test stage progress and rows reach the jobs table and errors fail the job."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        db_path = Path(tmp.name)
+
+    def counting_stage(reporter, db_path):
+        reporter.update(progress=0.5, rows=40, epoch=3, message="halfway")
+        return 100
+
+    def failing_stage(reporter, db_path):
+        raise RuntimeError("stage broke")
+
+    monkeypatch.setitem(job_runner.PIPELINE_STAGES, "sample_data", ("Counting", counting_stage))
+    monkeypatch.setitem(job_runner.PIPELINE_STAGES, "train_lstm", ("Failing", failing_stage))
+
+    try:
+        conn = get_connection(db_path)
+        initialize_schema(conn)
+
+        job_id = job_runner.create_job(conn, ["sample_data"])
+        assert job_runner.get_job(conn, job_id)["status"] == "queued"
+        assert job_runner.run_job(job_id, db_path) == "succeeded"
+        job = job_runner.get_job(conn, job_id)
+        assert job["progress"] == 1.0
+        assert job["rows_processed"] == 100
+        assert job["epoch"] == 3 and job["message"] == "halfway"
+        assert job["finished_at"] is not None
+
+        failed_id = job_runner.create_job(conn, ["sample_data", "train_lstm"])
+        assert job_runner.run_job(failed_id, db_path) == "failed"
+        failed = job_runner.get_job(conn)
+        assert failed["id"] == failed_id
+        assert failed["stage"] == "train_lstm" and failed["progress"] == 0.5
+        assert failed["rows_processed"] == 100
+        assert "stage broke" in failed["error"]
+
+        interrupted_id = job_runner.create_job(conn, ["sample_data"])
+        assert job_runner.fail_interrupted_jobs(conn) == 1
+        assert job_runner.get_job(conn, interrupted_id)["status"] == "failed"
+
+        conn.close()
+    finally:
+        if db_path.exists():
+            db_path.unlink()
+
+
+def test_stages_use_the_job_database():
+    """Test a real stage writes to the job's database, not the default one."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "job.db"
+        conn = get_connection(db_path)
+        initialize_schema(conn)
+
+        job_id = job_runner.create_job(conn, ["sample_data"])
+        assert job_runner.run_job(job_id, db_path) == "succeeded"
+        counts = [conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in ["prices", "features", "targets"]]
+        assert counts[0] == 3000 and counts[1] == 3000 and counts[2] > 0
+        assert job_runner.get_job(conn, job_id)["rows_processed"] == 3000
+        conn.close()
@@ -0,0 +1,28 @@
+"""Tests for the NumPy LSTM inference engine."""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+pytest.importorskip("tensorflow")
+
+from src.models.lstm_numpy import NumpyLSTMModel, export_lstm_npz
+from src.models.train_lstm import build_lstm_model
+
+
+def test_numpy_engine_matches_keras():
+    """Test exported weights reproduce Keras predictions."""
+    model = build_lstm_model((10, 14))
+    X = np.random.default_rng(0).normal(size=(33, 10, 14)).astype(np.float32)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = export_lstm_npz(model, Path(tmp) / "lstm_model.npz")
+        numpy_model = NumpyLSTMModel.load(path)
+
+    expected = model.predict(X, verbose=0)
+    actual = numpy_model.predict(X, batch_size=8)
+
+    assert actual.shape == expected.shape
+    np.testing.assert_allclose(actual, expected, atol=1e-5)
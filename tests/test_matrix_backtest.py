@@ -0,0 +1,39 @@
+"""Tests for the vectorized matrix backtest."""
+
+import numpy as np
+import pandas as pd
+
+from src.models.matrix_backtest import backtest_matrix, build_panel
+from src.models.time_series_backtest import backtest_strategy
+
+
+def test_matrix_backtest_matches_single_pair_backtest():
+    """Test every column matches backtest_strategy run on that pair alone."""
+    rng = np.random.default_rng(0)
+    rows = []
+    for ticker, model_name, start, periods in [("AAA", "m1", 0, 40), ("AAA", "m2", 5, 30), ("BBB", "m1", 10, 25)]:
+        dates = pd.date_range("2022-01-03", periods=60)[start:start + periods]
+        returns = rng.normal(0, 0.02, periods)
+        returns[-1] = np.nan
+        rows.append(pd.DataFrame({
+            "ticker": ticker,
+            "model_name": model_name,
+            "date": dates.strftime("%Y-%m-%d"),
+            "predicted_direction": rng.integers(-1, 2, periods),
+            "next_day_return": returns,
+        }))
+    df = pd.concat(rows, ignore_index=True)
+
+    panel = build_panel(df)
+    results = backtest_matrix(panel["positions"], panel["returns"], panel["mask"])
+
+    for col, (ticker, model_name) in enumerate(panel["columns"].itertuples(index=False)):
+        pair = df[(df["ticker"] == ticker) & (df["model_name"] == model_name)]
+        expected = backtest_strategy(pair["predicted_direction"].reset_index(drop=True), pair["next_day_return"].reset_index(drop=True))
+        for metric in ["total_return", "buy_hold_return", "sharpe_ratio", "max_drawdown"]:
+            np.testing.assert_allclose(results[metric][col], expected[metric], equal_nan=True)
+        np.testing.assert_allclose(
+            results["cumulative_returns"][panel["mask"][:, col], col],
+            expected["cumulative_returns"].to_numpy(),
+            equal_nan=True
+        )
@@ -0,0 +1,102 @@
+"""Tests for the per-group model zoo."""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.config import LSTM_LOOKBACK_WINDOW
+from src.database.db_utils import get_connection, get_or_create_symbol, initialize_schema, insert_features, insert_targets
+from src.models import model_zoo
+from src.models.build_datasets import FEATURE_COLS
+from src.models.model_zoo import _lstm_windows, _sort_groups, artifact_name, load_routing, load_zoo_model, train_zoo
+
+
+def _insert_ticker(conn, ticker: str, start: str, periods: int, labels=None) -> None:
+    rng = np.random.default_rng(len(ticker) + periods)
+    dates = pd.bdate_range(start, periods=periods)
+    symbol_id = get_or_create_symbol(conn, ticker)
+    insert_features(conn, symbol_id, pd.DataFrame(
+        rng.normal(size=(periods, len(FEATURE_COLS))), columns=FEATURE_COLS
+    ).assign(date=dates))
+    insert_targets(conn, symbol_id, pd.DataFrame({
+        "date": dates, "next_day_return": 0.0,
+        "direction_label": rng.integers(-1, 2, periods) if labels is None else labels
+    }))
+    conn.commit()
+
+
+def test_cluster_windows_never_span_two_tickers():
+    """Test two tickers in one cluster are kept contiguous and windowed separately."""
+    n_days = LSTM_LOOKBACK_WINDOW + 20
+    dates = pd.bdate_range("2022-01-03", periods=n_days)
+    df = pd.concat([
+        pd.DataFrame({"ticker": ticker, "date": dates, "value": float(i), "direction_label": i})
+        for i, ticker in enumerate(["AAA", "BBB"])
+    ]).sort_values("date", kind="stable")
+    df = _sort_groups(df, {"AAA": "tech", "BBB": "tech"})
+
+    assert df["group"].eq("tech").all()
+    assert df["ticker"].tolist() == ["AAA"] * n_days + ["BBB"] * n_days
+    assert df.groupby("ticker")["date"].apply(lambda d: d.is_monotonic_increasing).all()
+
+    X = df[["value"]].to_numpy(dtype=np.float32)
+    y = df["direction_label"].to_numpy()
+    is_train = (df["date"] < dates[-10]).to_numpy()
+    X_train, y_train, X_val, y_val = _lstm_windows(X, y, is_train, pd.factorize(df["ticker"])[0])
+
+    assert len(X_train) + len(X_val) == 2 * (n_days - LSTM_LOOKBACK_WINDOW)
+    for windows, labels in [(X_train, y_train), (X_val, y_val)]:
+        assert (windows.min(axis=(1, 2)) == windows.max(axis=(1, 2))).all()
+        np.testing.assert_array_equal(windows[:, 0, 0], labels)
+
+
+def test_artifact_names_are_file_safe_and_distinct():
+    """Test group names with path characters map to distinct, safe file names."""
+    assert artifact_name("AAPL") == "AAPL"
+    assert artifact_name("BRK.B") == "BRK.B"
+    names = [artifact_name(group) for group in ["../etc", "a/b", "a_b", "^GSPC", ""]]
+    assert len(set(names)) == len(names)
+    assert all("/" not in name and not name.startswith(".") and name for name in names)
+
+
+def test_short_lstm_clusters_give_no_windows():
+    """Test a cluster whose tickers are all shorter than the lookback yields empty windows."""
+    n = LSTM_LOOKBACK_WINDOW
+    X = np.zeros((2 * n, 3), dtype=np.float32)
+    X_train, y_train, X_val, y_val = _lstm_windows(X, np.zeros(2 * n), np.ones(2 * n, dtype=bool),
+                                                   np.repeat([0, 1], n))
+    assert X_train.shape == (0, n, 3) and X_val.shape == (0, n, 3)
+    assert len(y_train) == 0 and len(y_val) == 0
+
+
+def test_zoo_skips_untrainable_groups_and_survives_failures(monkeypatch):
+    """Test late-listed or single-class tickers are skipped and a failing fit does not stop the run."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        db_path = tmp / "zoo.db"
+        conn = get_connection(db_path)
+        initialize_schema(conn)
+        _insert_ticker(conn, "OLD", "2022-01-03", 300)
+        _insert_ticker(conn, "NEW", "2023-06-01", 150)
+        _insert_ticker(conn, "FLAT", "2022-01-03", 300, labels=0)
+        conn.close()
+
+        summary = train_zoo("logistic_regression", split_date="2023-01-01", max_workers=1,
+                            zoo_dir=tmp / "zoo", db_path=db_path)
+        assert summary[["group", "status"]].values.tolist() == [["OLD", "trained"]]
+        routing = load_routing("logistic_regression", tmp / "zoo")
+        assert routing == {"OLD": "OLD"}
+        assert load_zoo_model("OLD", "logistic_regression", tmp / "zoo", routing) is not None
+        assert load_zoo_model("NEW", "logistic_regression", tmp / "zoo", routing) is None
+
+        def broken(**params):
+            raise RuntimeError("fit exploded")
+
+        monkeypatch.setitem(model_zoo.BASELINE_MODEL_FACTORIES, "random_forest", broken)
+        summary = train_zoo("random_forest", split_date="2023-01-01", max_workers=1,
+                            zoo_dir=tmp / "zoo", db_path=db_path)
+        assert summary["status"].tolist() == ["failed"]
+        assert "fit exploded" in summary["error"].iloc[0]
+        assert load_routing("random_forest", tmp / "zoo") == {}
@@ -0,0 +1,26 @@
+"""Tests for the strategy parameter sweep."""
+
+import numpy as np
+
+from src.models.parameter_sweep import sweep_series
+
+
+def test_sweep_matches_direct_computation_and_costs_reduce_returns():
+    """Test one configuration against a direct loop and that costs only hurt."""
+    rng = np.random.default_rng(1)
+    probs = rng.dirichlet([1, 1, 1], size=200)
+    prob_down, prob_up = probs[:, 0], probs[:, 2]
+    returns = rng.normal(0, 0.01, 200)
+
+    cube = sweep_series(prob_up, prob_down, returns, thresholds=[0.0, 0.5], costs_bps=[0.0, 10.0],
+                        slippage_bps=[0.0, 5.0], sizing=["full", "edge"])
+    assert cube["total_return"].shape == (2, 2, 2, 2)
+
+    positions = np.where(np.maximum(prob_up, prob_down) >= 0.5, np.sign(prob_up - prob_down), 0.0)
+    turnover = np.abs(np.diff(positions, prepend=0.0))
+    net = positions * returns - turnover * 15 / 1e4
+    np.testing.assert_allclose(cube["total_return"][1, 1, 1, 0], (np.prod(1 + net) - 1) * 100)
+    np.testing.assert_allclose(cube["sharpe_ratio"][1, 1, 1, 0], np.sqrt(252) * net.mean() / net.std(ddof=1))
+
+    assert (cube["total_return"][:, 1] <= cube["total_return"][:, 0]).all()
+    assert (cube["total_return"][:, :, 1] <= cube["total_return"][:, :, 0]).all()
@@ -0,0 +1,127 @@
+"""Tests for the DAG pipeline runner."""
+
+import tempfile
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from src.database.db_utils import get_connection, get_or_create_symbol, initialize_schema, insert_prices
+from src.pipeline import run_pipeline as run_pipeline_module
+from src.pipeline.run_pipeline import run_pipeline, stage_graph
+
+
+def test_pipeline_skips_up_to_date_stages_and_runs_branches_concurrently():
+    """Test stages run once per input change and independent stages overlap."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        db_path = tmp / "test.db"
+        calls = []
+        both_running = threading.Barrier(2, timeout=10)
+
+        def load(reporter, db_path):
+            calls.append("load")
+            conn = get_connection(db_path)
+            symbol_id = get_or_create_symbol(conn, "AAA")
+            insert_prices(conn, symbol_id, pd.DataFrame({
+                "date": pd.date_range("2022-01-03", periods=5), "open": 1.0, "high": 1.0, "low": 1.0,
+                "close": 1.0, "adjusted_close": 1.0, "volume": 100
+            }))
+            conn.close()
+            return 5
+
+        def branch(name):
+            def run(reporter, db_path):
+                calls.append(name)
+                both_running.wait()
+                (tmp / f"{name}.txt").write_text(name)
+                return 1
+            return run
+
+        def join(reporter, db_path):
+            calls.append("join")
+            (tmp / "join.txt").write_text((tmp / "left.txt").read_text() + (tmp / "right.txt").read_text())
+            return 1
+
+        stages = {
+            "join": {"inputs": [tmp / "left.txt", tmp / "right.txt"], "outputs": [tmp / "join.txt"],
+                     "params": {}, "run": join},
+            "left": {"inputs": ["prices"], "outputs": [tmp / "left.txt"], "params": {}, "run": branch("left")},
+            "right": {"inputs": ["prices"], "outputs": [tmp / "right.txt"], "params": {}, "run": branch("right")},
+            "load": {"inputs": [], "outputs": ["prices"], "params": {"n": 5}, "run": load},
+        }
+        assert stage_graph(list(stages), stages) == {
+            "load": [], "left": ["load"], "right": ["load"], "join": ["left", "right"]
+        }
+
+        results = run_pipeline(list(stages), stages=stages, db_path=db_path)
+        assert {name: result["status"] for name, result in results.items()} == dict.fromkeys(stages, "ran")
+        assert calls.index("load") < calls.index("left") < calls.index("join")
+
+        calls.clear()
+        results = run_pipeline(list(stages), stages=stages, db_path=db_path)
+        assert calls == []
+        assert all(result["status"] == "up to date" for result in results.values())
+
+        # Rewriting identical prices is not a change, and a deleted output reruns only
+        # its writer: the rewritten file is identical, so ``join`` stays up to date.
+        load(None, db_path)
+        (tmp / "right.txt").unlink()
+        calls.clear()
+        both_running = threading.Barrier(1)
+        results = run_pipeline(list(stages), stages=stages, db_path=db_path)
+        assert calls == ["right"]
+        assert results["right"]["status"] == "ran" and results["join"]["status"] == "up to date"
+
+        stages["load"]["params"] = {"n": 6}
+        results = run_pipeline(list(stages), stages=stages, db_path=db_path)
+        assert [result["status"] for result in results.values()] == ["ran", "up to date", "up to date", "up to date"]
+
+        stages["left"]["run"] = lambda reporter, db_path: 1 / 0
+        results = run_pipeline(list(stages), force=True, stages=stages, db_path=db_path)
+        assert {name: result["status"] for name, result in results.items()} == {
+            "load": "ran", "left": "failed", "right": "ran", "join": "blocked"
+        }
+        assert "ZeroDivisionError" in results["left"]["error"]
+
+        conn = get_connection(db_path)
+        initialize_schema(conn)
+        assert conn.execute("SELECT COUNT(*) FROM pipeline_stages").fetchone()[0] == 4
+        conn.close()
+
+
+def test_built_in_stages_use_the_pipeline_database():
+    """Test the built-in stages write the database that the runner fingerprints."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "pipeline.db"
+        results = run_pipeline(["sample_data"], db_path=db_path)
+        assert results["sample_data"]["status"] == "ran" and results["sample_data"]["rows"] == 3000
+
+        conn = get_connection(db_path)
+        assert conn.execute("SELECT COUNT(*) FROM prices").fetchone()[0] == 3000
+        conn.close()
+        assert run_pipeline(["sample_data"], db_path=db_path)["sample_data"]["status"] == "up to date"
+
+
+def test_table_fingerprints_are_hashed_once_per_write(monkeypatch):
+    """Test a table read by several stages is hashed once, and again only after its writer ran."""
+    hashed = []
+    monkeypatch.setattr(run_pipeline_module, "table_fingerprint",
+                        lambda conn, table: hashed.append(table) or f"{table}-{len(hashed)}")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        stages = {
+            "load": {"inputs": [], "outputs": ["prices"], "params": {}, "run": lambda reporter, db_path: 1},
+            **{name: {"inputs": ["prices"], "outputs": [tmp / f"{name}.txt"], "params": {},
+                      "run": lambda reporter, db_path: 1}
+               for name in ["left", "right"]},
+        }
+        results = run_pipeline(list(stages), stages=stages, db_path=tmp / "test.db")
+        assert all(result["status"] == "ran" for result in results.values())
+        assert hashed == ["prices"]
+
+        # A new run hashes afresh: load's previous output, then again after load rewrote it.
+        hashed.clear()
+        results = run_pipeline(list(stages), force=True, stages=stages, db_path=tmp / "test.db")
+        assert all(result["status"] == "ran" for result in results.values())
+        assert hashed == ["prices", "prices"]
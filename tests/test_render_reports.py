@@ -0,0 +1,57 @@
+"""Tests for the batch report renderer."""
+
+import tempfile
+from pathlib import Path
+
+import matplotlib
+import numpy as np
+import pandas as pd
+
+from src.database.db_utils import (
+    get_connection, initialize_schema, get_or_create_symbol, insert_predictions, insert_prices, insert_targets
+)
+from src.visualization.render_reports import load_report_data, render_pair, write_index
+
+matplotlib.use("Agg")
+
+
+def test_bulk_load_and_template_rendering():
+    """Test every pair is loaded in bulk and rendered on the reused figures."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        conn = get_connection(tmp / "test.db")
+        initialize_schema(conn)
+
+        rng = np.random.default_rng(0)
+        dates = pd.date_range("2022-01-03", periods=40)
+        for ticker in ["AAA", "BBB"]:
+            symbol_id = get_or_create_symbol(conn, ticker)
+            close = 100 * np.cumprod(1 + rng.normal(0, 0.01, 40))
+            insert_prices(conn, symbol_id, pd.DataFrame({
+                "date": dates, "open": close, "high": close, "low": close, "close": close,
+                "adjusted_close": close, "volume": 1000
+            }))
+            returns = rng.normal(0, 0.01, 40)
+            insert_targets(conn, symbol_id, pd.DataFrame({
+                "date": dates, "next_day_return": returns, "direction_label": np.sign(returns).astype(int)
+            }))
+            for model_name in ["model_a", "model_b"]:
+                insert_predictions(conn, symbol_id, pd.DataFrame({
+                    "date": dates, "predicted_direction": rng.integers(-1, 2, 40)
+                }), model_name)
+
+        pairs = load_report_data(conn=conn)
+        conn.close()
+
+        assert [(p["ticker"], p["model_name"]) for p in pairs] == [
+            ("AAA", "model_a"), ("AAA", "model_b"), ("BBB", "model_a"), ("BBB", "model_b")
+        ]
+        assert all(len(p["signals"]) == 40 and len(p["backtest"]["dates"]) == 40 for p in pairs)
+
+        files = [render_pair(pair, tmp) for pair in pairs]
+        assert files[0] == ["AAA_model_a_signals.png", "AAA_model_a_performance.png"]
+        assert all((tmp / name).stat().st_size > 0 for names in files for name in names)
+
+        index = write_index(pairs, files, tmp).read_text()
+        assert index.count("<tr>") == 5
+        assert "BBB_model_b_performance.png" in index
@@ -0,0 +1,80 @@
+"""Tests for rolling performance metrics."""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.database.db_utils import get_connection, initialize_schema, get_or_create_symbol, insert_predictions, insert_targets
+from src.models.rolling_metrics import compute_rolling_metrics, query_rolling_metrics, update_rolling_metrics
+
+
+def test_prefix_sum_kernel_matches_pandas_rolling():
+    """Test the prefix-sum windows against pandas rolling statistics."""
+    rng = np.random.default_rng(4)
+    positions = rng.integers(-1, 2, (200, 3)).astype(float)
+    returns = positions * rng.normal(0, 0.01, (200, 3))
+    metrics = compute_rolling_metrics(returns, positions, np.ones_like(returns, dtype=bool), windows=[20, 60])
+
+    frame = pd.DataFrame(returns)
+    for w, window in enumerate([20, 60]):
+        rolling = frame.rolling(window)
+        expected_sharpe = np.sqrt(252) * rolling.mean() / rolling.std()
+        np.testing.assert_allclose(metrics["rolling_sharpe"][w], expected_sharpe.to_numpy(), equal_nan=True, rtol=1e-8)
+        np.testing.assert_allclose(metrics["rolling_volatility"][w], (rolling.std() * np.sqrt(252) * 100).to_numpy(),
+                                   equal_nan=True, rtol=1e-8)
+
+
+def test_windows_count_each_strategys_own_observations():
+    """Test a strategy with gaps in the date grid gets windows over its own observations."""
+    rng = np.random.default_rng(6)
+    positions = rng.integers(-1, 2, (120, 2)).astype(float)
+    returns = positions * rng.normal(0, 0.01, (120, 2))
+    mask = np.ones_like(returns, dtype=bool)
+    mask[1::2, 1] = False
+    returns[~mask] = np.nan
+    metrics = compute_rolling_metrics(returns, positions, mask, windows=[20])
+
+    own = pd.Series(returns[mask[:, 1], 1]).rolling(20)
+    expected = (np.sqrt(252) * own.mean() / own.std()).to_numpy()
+    np.testing.assert_allclose(metrics["rolling_sharpe"][0][mask[:, 1], 1], expected, equal_nan=True, rtol=1e-8)
+    assert np.isnan(metrics["rolling_sharpe"][0][~mask[:, 1], 1]).all()
+    assert np.isfinite(metrics["rolling_sharpe"][0][-2:, 0]).all()
+
+
+def test_incremental_update_matches_rebuild():
+    """Test appending new predictions gives the same rows as a full recompute."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        db_path = Path(tmp.name)
+
+    try:
+        conn = get_connection(db_path)
+        initialize_schema(conn)
+        rng = np.random.default_rng(5)
+        dates = pd.bdate_range("2022-01-03", periods=150)
+        predictions = {}
+        for ticker in ["AAA", "BBB"]:
+            symbol_id = get_or_create_symbol(conn, ticker)
+            returns = rng.normal(0, 0.01, len(dates))
+            insert_targets(conn, symbol_id, pd.DataFrame({
+                "date": dates, "next_day_return": returns, "direction_label": np.sign(returns).astype(int)
+            }))
+            predictions[ticker] = pd.DataFrame({"date": dates, "predicted_direction": rng.integers(-1, 2, len(dates))})
+            insert_predictions(conn, symbol_id, predictions[ticker].iloc[:100], "m")
+
+        assert update_rolling_metrics(windows=[10, 30], conn=conn) == 200
+        for ticker in ["AAA", "BBB"]:
+            insert_predictions(conn, get_or_create_symbol(conn, ticker), predictions[ticker].iloc[100:], "m")
+        assert update_rolling_metrics(windows=[10, 30], conn=conn) == 100
+        incremental = query_rolling_metrics("AAA", "m", conn=conn)
+
+        update_rolling_metrics(windows=[10, 30], rebuild=True, conn=conn)
+        rebuilt = query_rolling_metrics("AAA", "m", conn=conn)
+        assert len(incremental) == 300
+        pd.testing.assert_frame_equal(incremental, rebuilt, rtol=1e-9)
+
+        conn.close()
+    finally:
+        if db_path.exists():
+            db_path.unlink()
@@ -0,0 +1,60 @@
+"""Tests for bootstrap and permutation significance."""
+
+import numpy as np
+import pytest
+
+from src.models import significance
+from src.models.significance import block_bootstrap_indices, bootstrap_metrics, permutation_test
+
+
+def test_block_bootstrap_indices_are_contiguous_blocks():
+    """Test every block of a resample is a run of consecutive rows."""
+    idx = block_bootstrap_indices(95, 50, 10, np.random.default_rng(0))
+    assert idx.shape == (50, 95)
+    assert idx.min() >= 0 and idx.max() < 95
+    blocks = idx[:, :90].reshape(50, 9, 10)
+    assert (np.diff(blocks, axis=-1) == 1).all()
+
+
+def test_results_do_not_depend_on_worker_count(monkeypatch):
+    """Test chunked resamples are reproducible whatever the thread count."""
+    rng = np.random.default_rng(2)
+    returns = rng.normal(0.001, 0.01, 300)
+    positions = rng.integers(-1, 2, 300)
+
+    monkeypatch.setattr(significance, "MAX_CHUNK_CELLS", 300 * 50)
+    serial = bootstrap_metrics(returns, n_resamples=400, seed=7, max_workers=1)
+    threaded = bootstrap_metrics(returns, n_resamples=400, seed=7, max_workers=4)
+    assert len(serial["sharpe_ratio"]) == 400
+    np.testing.assert_allclose(serial["sharpe_ratio"], threaded["sharpe_ratio"])
+    np.testing.assert_allclose(serial["max_drawdown"], threaded["max_drawdown"])
+
+    result = permutation_test(positions, returns, n_resamples=400, seed=7)
+    assert len(result["null"]) == 400
+    assert 0 < result["p_value"] <= 1
+
+
+def test_worker_count_is_capped_by_memory_budget(monkeypatch):
+    """Test the pool never runs more chunks at once than ``MAX_TOTAL_CELLS`` allows."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    pool_sizes = []
+
+    class RecordingPool(ThreadPoolExecutor):
+        def __init__(self, max_workers=None):
+            pool_sizes.append(max_workers)
+            super().__init__(max_workers=max_workers)
+
+    monkeypatch.setattr(significance, "ThreadPoolExecutor", RecordingPool)
+    monkeypatch.setattr(significance, "MAX_CHUNK_CELLS", 100 * 10)
+    monkeypatch.setattr(significance, "MAX_TOTAL_CELLS", 100 * 30)
+    bootstrap_metrics(np.random.default_rng(0).normal(size=100), n_resamples=200, max_workers=8)
+    assert pool_sizes == [3]
+
+
+def test_empty_returns_raise():
+    """Test empty or all-NaN returns fail with a clear error."""
+    with pytest.raises(ValueError, match="No non-NaN"):
+        bootstrap_metrics(np.array([np.nan, np.nan]))
+    with pytest.raises(ValueError, match="No non-NaN"):
+        permutation_test(np.array([]), np.array([]))
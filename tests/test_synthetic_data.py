@@ -0,0 +1,56 @@
+"""Tests for the synthetic market data generator."""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_acquisition.synthetic_data import generate_price_chunks, generate_synthetic_data
+from src.database.db_utils import get_connection
+
+
+def test_chunks_are_reproducible_and_consistent():
+    """Test the data depends only on the seed and bars are valid, correlated OHLCV."""
+    small = pd.concat(generate_price_chunks(6, 250, chunk_tickers=2), ignore_index=True)
+    large = pd.concat(generate_price_chunks(6, 250, chunk_tickers=4), ignore_index=True)
+    pd.testing.assert_frame_equal(small, large)
+    assert not small.equals(pd.concat(generate_price_chunks(6, 250, seed=1), ignore_index=True))
+
+    assert len(small) == 6 * 250 and small["ticker"].nunique() == 6
+    assert (small["high"] >= small[["open", "close"]].max(axis=1)).all()
+    assert (small["low"] <= small[["open", "close"]].min(axis=1)).all()
+    assert (small["low"] > 0).all() and (small["volume"] > 0).all()
+
+    returns = small.pivot(index="date", columns="ticker", values="close").pct_change().dropna()
+    assert returns.corr().values[np.triu_indices(6, 1)].mean() > 0.05
+
+    bars = next(generate_price_chunks(1, 2, freq="1h"))
+    assert len(bars) == 14 and bars["date"].iloc[0] == pd.Timestamp("2000-01-03 09:30")
+
+
+def test_database_and_parquet_sinks():
+    """Test the bulk database path fills coverage, features and targets, and Parquet streams bars."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        summary = generate_synthetic_data(5, 120, chunk_tickers=2, db_path=tmp / "bench.db")
+        assert summary["rows"] == 600
+
+        conn = get_connection(tmp / "bench.db")
+        counts = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                  for table in ["prices", "features", "targets"]}
+        coverage = conn.execute("SELECT n_rows, min_date, max_date FROM price_coverage WHERE symbol_id = 1").fetchone()
+        conn.close()
+        assert counts == {"prices": 600, "features": 600, "targets": 595}
+        assert tuple(coverage) == (120, "2000-01-03", "2000-06-16")
+
+        with pytest.raises(ValueError):
+            generate_synthetic_data(1, 5, freq="1h", db_path=tmp / "bench.db")
+
+        pytest.importorskip("pyarrow")
+        path = tmp / "bars.parquet"
+        generate_synthetic_data(3, 5, freq="30min", chunk_tickers=2, parquet_path=path)
+        bars = pd.read_parquet(path)
+        pd.testing.assert_frame_equal(bars, pd.concat(generate_price_chunks(3, 5, freq="30min"), ignore_index=True),
+                                      check_dtype=False)
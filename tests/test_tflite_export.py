@@ -0,0 +1,35 @@
+"""Tests for the quantized TFLite export of the LSTM."""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+pytest.importorskip("tensorflow")
+
+from src.models.backends import load_model
+from src.models.tflite_export import QUANTIZATIONS, export_tflite_models
+from src.models.train_lstm import build_lstm_model
+
+
+TOLERANCES = {"float16": 1e-2, "int8": 0.1}
+
+
+def test_tflite_backends_match_keras():
+    """Test each quantized export loads through its backend and stays close to Keras."""
+    model = build_lstm_model((10, 14))
+    X = np.random.default_rng(0).normal(size=(33, 10, 14)).astype(np.float32)
+    expected = model.predict(X, verbose=0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = export_tflite_models(model, X, models_dir=Path(tmp))
+        assert set(paths) == set(QUANTIZATIONS)
+
+        for quantization in QUANTIZATIONS:
+            loaded = load_model("lstm_model", backend=f"tflite_{quantization}", models_dir=Path(tmp))
+            assert loaded is not None
+            actual = loaded.predict_proba(X)
+
+            assert actual.shape == expected.shape
+            np.testing.assert_allclose(actual, expected, atol=TOLERANCES[quantization])
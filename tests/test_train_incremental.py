@@ -0,0 +1,55 @@
+"""Tests for the incremental model's update path."""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.database.db_utils import get_connection, get_or_create_symbol, initialize_schema, insert_features, insert_targets
+from src.models.build_datasets import FEATURE_COLS
+from src.models.train_incremental import update_incremental_model
+
+
+def _insert_rows(conn, ticker: str, start: str, periods: int, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start, periods=periods)
+    features = pd.DataFrame(rng.normal(size=(periods, len(FEATURE_COLS))), columns=FEATURE_COLS)
+    returns = rng.normal(0, 0.01, periods)
+    symbol_id = get_or_create_symbol(conn, ticker)
+    insert_features(conn, symbol_id, features.assign(date=dates))
+    insert_targets(conn, symbol_id, pd.DataFrame({
+        "date": dates, "next_day_return": returns, "direction_label": np.sign(returns).astype(int)
+    }))
+    conn.commit()
+
+
+def test_updates_consume_rows_per_ticker():
+    """Test a lagging ticker's late rows and a new ticker's history are consumed, and nothing twice."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        db_path, model_path = tmp / "incremental.db", tmp / "model.pkl"
+        conn = get_connection(db_path)
+        initialize_schema(conn)
+        _insert_rows(conn, "AAA", "2022-01-03", 40, seed=0)
+        _insert_rows(conn, "BBB", "2022-01-03", 20, seed=1)
+
+        model = update_incremental_model(model_path=model_path, db_path=db_path)
+        assert model.n_samples_seen == 60
+        assert model.watermarks["AAA"] > model.watermarks["BBB"]
+
+        # BBB catches up with dates before AAA's watermark; CCC is new.
+        _insert_rows(conn, "BBB", "2022-01-31", 20, seed=2)
+        _insert_rows(conn, "CCC", "2022-01-03", 10, seed=3)
+        conn.close()
+
+        model = update_incremental_model(model_path=model_path, db_path=db_path)
+        assert model.n_samples_seen == 90
+        assert model.watermarks["BBB"] == model.watermarks["AAA"]
+        assert set(model.watermarks) == {"AAA", "BBB", "CCC"}
+
+        model = update_incremental_model(model_path=model_path, db_path=db_path)
+        assert model.n_samples_seen == 90
+
+        proba = model.predict_proba(np.zeros((2, len(FEATURE_COLS))))
+        np.testing.assert_allclose(proba.sum(axis=1), 1)
@@ -0,0 +1,21 @@
+"""Tests for walk-forward fold generation."""
+
+import numpy as np
+import pandas as pd
+
+from src.models.walk_forward import generate_folds
+
+
+def test_expanding_and_rolling_folds():
+    """Test folds are contiguous, ordered and never leak test dates into training."""
+    dates = np.repeat(pd.date_range("2021-01-01", periods=100).to_numpy(), 3)
+
+    expanding = generate_folds(dates, n_folds=4, mode="expanding", min_train_days=60, test_days=10)
+    assert len(expanding) == 4
+    assert all(fold["train_start"] == 0 for fold in expanding)
+    assert all(fold["train_stop"] == fold["test_start"] for fold in expanding)
+    assert [fold["test_stop"] - fold["test_start"] for fold in expanding] == [30] * 4
+
+    rolling = generate_folds(dates, n_folds=4, mode="rolling", min_train_days=60, test_days=10)
+    assert all(fold["train_stop"] - fold["train_start"] == 180 for fold in rolling)
+    assert rolling[1]["train_start"] == 30